@@ -0,0 +1,93 @@
+# Imports
+import flet as ft
+from Engine.updates import request_update
+
+class Styles:
+    # Interned style objects are shared between controls; never mutate or theme-bind one
+    _cache = {}
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def intern(cls, kind, **values):
+        key = (kind, tuple((name, value if getattr(value, "__hash__", None) else id(value)) for name, value in sorted(values.items())))
+        style = cls._cache.get(key)
+        if style is None:
+            cls.misses += 1
+            style = cls._cache[key] = kind(**values)
+        else:
+            cls.hits += 1
+        return style
+
+    @classmethod
+    def padding(cls, left=0, top=0, right=0, bottom=0):
+        return cls.intern(ft.Padding, left=left, top=top, right=right, bottom=bottom)
+
+    @classmethod
+    def margin(cls, left=0, top=0, right=0, bottom=0):
+        return cls.intern(ft.Margin, left=left, top=top, right=right, bottom=bottom)
+
+    @classmethod
+    def text(cls, **values):
+        return cls.intern(ft.TextStyle, **values)
+
+    @classmethod
+    def button(cls, **values):
+        return cls.intern(ft.ButtonStyle, **values)
+
+    @classmethod
+    def image(cls, src, fit=ft.ImageFit.COVER):
+        return cls.intern(ft.DecorationImage, src=src, fit=fit)
+
+    @classmethod
+    def stats(cls):
+        return {"styles": len(cls._cache), "hits": cls.hits, "misses": cls.misses}
+
+class Factory:
+    # Padding or margin on the content itself when it is a Container, instead of another wrapper
+    @staticmethod
+    def wrap(content, padding=None, **kwargs):
+        if isinstance(content, ft.Container) and content.margin is None and not kwargs:
+            content.margin = padding
+            return content
+        return ft.Container(content, padding=padding, **kwargs)
+
+    @staticmethod
+    def card(content, **kwargs):
+        return ft.Container(content, padding=10, bgcolor=ft.Colors.GREY_900, border_radius=10, **kwargs)
+
+    @staticmethod
+    def task_card(icon, color, label):
+        return Factory.card(
+            ft.Row(
+                [
+                    ft.Icon(icon, color=color, size=20),
+                    ft.Text(label, color=ft.Colors.WHITE, size=12),
+                ],
+                alignment=ft.MainAxisAlignment.START,
+            )
+        )
+
+    # One Container painting a cached thumbnail behind its label, in place of Stack(Image, Text)
+    @staticmethod
+    def image_tile(images, url, label, width=100, height=75, margin=None):
+        tile = ft.Container(
+            ft.Text(
+                label,
+                size=12,
+                color=ft.Colors.WHITE,
+                weight=ft.FontWeight.BOLD,
+                text_align=ft.TextAlign.CENTER,
+            ),
+            width=width,
+            height=height,
+            margin=margin,
+            border_radius=10,
+        )
+
+        def ready(src):
+            tile.image = Styles.image(src)
+            request_update(tile)
+
+        tile.image = Styles.image(images.resolve(url, width, height, ready) if images is not None else url)
+        return tile
@@ -1,40 +1,116 @@
 # Imports
 import flet as ft
-from Engine.themes import ThemeFactory
+from Engine.themes import ThemeFactory, ThemeBinder
 from Engine.settings import Config as cogs
+from Engine.images import ImageCache
+from Engine.updates import UpdateScheduler
+from User.session import Session
+from Engine.notifications import NotificationCenter
+from Components.factory import Styles
+
+AVATAR_URL = "https://avatars.githubusercontent.com/u/5041459?s=88&v=4"
 
 class Header:
-    def __init__(self, app, current_theme):
+    def __init__(self, app, current_theme, binder=None):
         self.app = app
         self.page = app.page  # Use the app's page instance
-        self.current_theme = ThemeFactory.dark_theme() if current_theme == "dark" else ThemeFactory.light_theme()
+        self.current_theme = ThemeFactory.resolve(current_theme)
+        self.binder = binder or ThemeBinder(self.current_theme)
+        self.images = getattr(app, "images", None) or ImageCache.default()
+        self.updates = UpdateScheduler.of(self.page)
+        self.session = getattr(app, "session", None) or Session.default()
+        self.notifications = getattr(app, "notifications", None) or NotificationCenter.default()
+        self.avatar = None
+        self.account = None
+        self.snack_bar = None
+        self.sheet = None
 
     # Ensure the `view_profile` method navigates to the `/profile` route
     def view_profile(self):
-        self.page.go("/profile")  # Navigate to the profile route
-        self.page.update()
+        self.app.navigate("/profile")  # Navigate to the profile route
+
+    # One snack bar is reused so showing it joins the handler's update instead of sending its own
+    def notify(self, message):
+        if self.snack_bar is None or self.snack_bar.page is None:
+            self.snack_bar = ft.SnackBar(ft.Text(message))
+            self.page.open(self.snack_bar)
+            return
+        self.snack_bar.content.value = message
+        self.snack_bar.open = True
+        self.updates.request(self.snack_bar)
+
+    # Throttled by the notification center, so a burst of posts redraws the badge at most once per interval
+    @staticmethod
+    def show_badge(bell, center):
+        unread = center.unread()
+        bell.badge = Styles.intern(ft.Badge, text=str(unread) if unread < 10 else "9+", bgcolor=ft.Colors.GREEN) if unread else None
+
+    # Unread notifications, most important first; opening the sheet marks them read
+    def show_notifications(self):
+        unread = self.notifications.peek(10)
+        rows = [
+            ft.Text(notification.text(), size=12, weight=ft.FontWeight.BOLD if notification.priority else None)
+            for notification in unread
+        ] or [ft.Text("No new notifications", size=12)]
+        content = ft.Container(ft.Column(rows, spacing=8, tight=True), padding=20)
+        if self.sheet is None or self.sheet.page is None:
+            self.sheet = ft.BottomSheet(content)
+            self.page.open(self.sheet)
+        else:
+            self.sheet.content = content
+            self.sheet.open = True
+            self.updates.request(self.sheet)
+        self.notifications.mark_all_read()
 
     def toggle_theme(self):
-        self.page.snack_bar = ft.SnackBar(ft.Text("Themes: Switching theme."))
-        self.page.snack_bar.open()
-        self.app.page_builder.toggle_theme()  # Call the toggle_theme method from PageBuilder
-        self.page.update()
+        with self.updates.batch():
+            self.notify("Themes: Switching theme.")
+            self.app.toggle_theme()  # Patches bound colours in place
+
+    # Logout keeps the user a guest across restarts, so the same menu item signs them back in
+    def toggle_login(self):
+        with self.updates.batch():
+            if self.session.logged_out:
+                self.session.login()
+                self.notify("Login: Signing you back in.")
+            else:
+                self.session.logout()
+                self.notify("Logout: You have been logged out.")
+            self.show_account(self.account, self.session.profile)
+            self.updates.request(self.account)
 
-    def logout(self):
-        self.page.snack_bar = ft.SnackBar(ft.Text("Logout: You have been logged out."))
-        self.page.snack_bar.open()
-        self.page.update()
+    def show_account(self, item, profile):
+        item.text = "Login" if self.session.logged_out else "Logout"
+
+    # Modify the snack menu to include Profile, Themes, and Login/Logout
+    def set_avatar(self, src):
+        self.avatar.foreground_image_src = src
+        self.updates.request(self.avatar)
+
+    # Runs with the cached profile when the header is built, then on every change
+    def show_avatar(self, avatar, profile):
+        avatar.content.value = profile.name[:1].upper()
+        url = profile.avatar_url or AVATAR_URL
+        if avatar.data != url:
+            avatar.data = url
+            avatar.foreground_image_src = self.images.resolve(url, 40, 40, self.set_avatar)
 
-    # Modify the snack menu to include Profile, Themes, and Logout
     def create_header(self):
-        popup_menu = ft.PopupMenuButton(
-            content=ft.CircleAvatar(
-                foreground_image_src="https://avatars.githubusercontent.com/u/5041459?s=88&v=4",
+        self.avatar = self.session.bind(
+            ft.CircleAvatar(
                 content=ft.Text("U"),
                 radius=30,
                 width=40,
                 height=40,
             ),
+            self.show_avatar,
+        )
+        self.account = self.session.bind(
+            ft.PopupMenuItem(on_click=lambda e: self.toggle_login()),
+            self.show_account,
+        )
+        popup_menu = ft.PopupMenuButton(
+            content=self.avatar,
             items=[
                 ft.PopupMenuItem(
                     text="Profile",
@@ -45,20 +121,24 @@ class Header:
                     icon=ft.Icons.PALETTE,
                     on_click=lambda e: self.toggle_theme(),
                 ),
-                ft.PopupMenuItem(
-                    text="Logout",
-                    on_click=lambda e: self.logout(),
-                ),
+                self.account,
             ],
         )
 
-        username = ft.Text(
-            "Blabber Fatmouth".upper(),
-            size=12,
-            weight=ft.FontWeight.BOLD,
-            color=self.current_theme.accent_color,
+        username = self.binder.bind(
+            self.session.bind(
+                ft.Text(
+                    size=12,
+                    weight=ft.FontWeight.BOLD,
+                ),
+                lambda text, profile: setattr(text, "value", profile.name.upper()),
+            ),
+            color="accent_color",
+        )
+        title = self.binder.bind(
+            self.session.bind(ft.Text(size=10), lambda text, profile: setattr(text, "value", profile.role)),
+            color="text_color",
         )
-        title = ft.Text("Novice", size=10, color=self.current_theme.text_color)
         user_info = ft.Column(
             [
                 username,
@@ -67,11 +147,15 @@ class Header:
             spacing=2,
         )
 
-        notification_bell = ft.Icon(
-            ft.Icons.NOTIFICATIONS,
-            size=30,
-            color=self.current_theme.text_color,
-            badge=ft.Badge(small_size=10, bgcolor=ft.Colors.GREEN),
+        notification_bell = self.binder.bind(
+            self.notifications.bind(
+                ft.Icon(
+                    ft.Icons.NOTIFICATIONS,
+                    size=30,
+                ),
+                self.show_badge,
+            ),
+            color="text_color",
         )
 
         return ft.Container(
@@ -79,7 +163,7 @@ class Header:
                 [
                     popup_menu,
                     ft.Container(user_info, padding=2.5),
-                    ft.Container(notification_bell,expand=True),
+                    ft.Container(notification_bell, expand=True, on_click=lambda e: self.show_notifications()),
                 ],
                 alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                 vertical_alignment=ft.CrossAxisAlignment.CENTER,
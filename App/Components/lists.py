@@ -0,0 +1,140 @@
+# Imports
+import flet as ft
+from Engine.updates import request_update
+
+class VirtualList:
+    # fetch(offset, limit) returns the next items (fewer than limit at the end);
+    # build_row() makes an empty row control and bind_row(row, item) fills it in.
+    # With a loader (LoadScope) fetch runs in the background and skeleton() rows stand in until it lands.
+    def __init__(self, fetch, build_row, bind_row, item_extent, height=None, chunk_size=20, overscan=1, empty=None,
+                 loader=None, skeleton=None, skeleton_rows=8, on_loaded=None):
+        self.fetch = fetch
+        self.build_row = build_row
+        self.bind_row = bind_row
+        self.item_extent = item_extent
+        self.height = height
+        self.chunk_size = chunk_size
+        self.overscan = overscan  # Extra chunks kept built above and below the viewport
+        self.empty = empty
+        self.loader = loader
+        self.skeleton = skeleton
+        self.skeleton_rows = skeleton_rows  # About one screenful; the real rows replace them
+        self.on_loaded = on_loaded
+        self.items = []
+        self.exhausted = False
+        self.loading = False  # A background fetch is in flight
+        self.generation = 0  # Bumped by reset() so late results for old items are ignored
+        self.first_visible = 0
+        self.window = None  # (first, last) chunk indexes currently built
+        self.rows = []  # pooled row controls, rebound as the window moves
+        self.top_spacer = ft.Container(height=0)
+        self.bottom_spacer = ft.Container(height=0)
+        self.list_view = None
+
+    def visible_rows(self):
+        return int(self.height // self.item_extent) + 1 if self.height else self.chunk_size
+
+    # Pull pages from the source until `count` items are loaded or it runs dry
+    def ensure_loaded(self, count):
+        if self.loader is not None:
+            if len(self.items) < count and not self.exhausted:
+                self.load_more()
+            return
+        while len(self.items) < count and not self.exhausted:
+            batch = self.fetch(len(self.items), self.chunk_size)
+            self.items.extend(batch)
+            if len(batch) < self.chunk_size:
+                self.exhausted = True
+
+    # One chunk at a time on the loader pool; the window re-renders when it arrives
+    def load_more(self):
+        if self.loading:
+            return
+        self.loading = True
+        offset, generation = len(self.items), self.generation
+        self.loader.submit(
+            lambda: self.fetch(offset, self.chunk_size),
+            lambda batch: self.loaded(batch, generation),
+            lambda error: self.failed(error, generation),
+        )
+
+    def loaded(self, batch, generation):
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.items.extend(batch)
+        if len(batch) < self.chunk_size:
+            self.exhausted = True
+        if self.on_loaded is not None:
+            self.on_loaded(batch)
+        self.window = None
+        self.render(self.first_visible)
+        request_update(self.list_view)
+
+    def failed(self, error, generation):
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.exhausted = True
+        self.window = None
+        self.render(self.first_visible)
+        request_update(self.list_view)
+
+    def window_for(self, first_visible):
+        first = max(0, first_visible // self.chunk_size - self.overscan)
+        last = (first_visible + self.visible_rows()) // self.chunk_size + self.overscan
+        return first, last
+
+    # Rebind the pooled rows to the items in the chunk window; returns True if anything changed
+    def render(self, first_visible=0):
+        self.first_visible = first_visible
+        window = self.window_for(first_visible)
+        if window == self.window:
+            return False
+        first, last = window
+        self.ensure_loaded((last + 1) * self.chunk_size)
+        start = min(first * self.chunk_size, len(self.items))
+        end = min((last + 1) * self.chunk_size, len(self.items))
+        while len(self.rows) < end - start:
+            self.rows.append(self.build_row())
+        for row, item in zip(self.rows, self.items[start:end]):
+            self.bind_row(row, item)
+        # Spacers stand in for rows outside the window; keep one chunk of slack while more can load
+        self.top_spacer.height = start * self.item_extent
+        remaining = len(self.items) - end + (0 if self.exhausted else self.chunk_size)
+        self.bottom_spacer.height = remaining * self.item_extent
+        self.window = window
+        if self.list_view is not None:
+            rows = self.rows[:end - start] or self.placeholder()
+            self.list_view.controls = [self.top_spacer, *rows, self.bottom_spacer]
+        return True
+
+    def placeholder(self):
+        if self.loading and self.skeleton is not None:
+            return [self.skeleton() for _ in range(min(self.visible_rows(), self.skeleton_rows))]
+        return [self.empty] if self.empty is not None else []
+
+    def on_scroll(self, e):
+        if self.render(int(e.pixels // self.item_extent)):
+            request_update(self.list_view)
+
+    def reset(self):
+        self.generation += 1
+        self.loading = False
+        self.items = []
+        self.exhausted = False
+        self.window = None
+        self.render()
+        request_update(self.list_view)
+
+    def build(self):
+        self.list_view = ft.ListView(
+            spacing=0,
+            height=self.height,
+            expand=self.height is None,
+            on_scroll=self.on_scroll,
+            on_scroll_interval=50,
+        )
+        self.window = None
+        self.render()
+        return self.list_view
@@ -1,20 +1,21 @@
 # Imports
 import flet as ft
-from Engine.themes import ThemeFactory
+from Engine.themes import ThemeFactory, ThemeBinder
 from Engine.settings import Config as cogs
+from Engine.routes import registry
+from Engine.metrics import metrics
 
 class NavigationBar:
-    def __init__(self, app, current_theme):
+    def __init__(self, app, current_theme, binder=None):
         self.app = app
         self.page = app.page  # Use the app's page instance
-        self.current_theme = ThemeFactory.dark_theme() if current_theme == "dark" else ThemeFactory.light_theme()
+        self.current_theme = ThemeFactory.resolve(current_theme)
+        self.binder = binder or ThemeBinder(self.current_theme)
         self.navigation_bar = None
         self.navigation_bar_container = None
 
     def setup_navigation_bar(self):
         self.navigation_bar = ft.NavigationBar(
-            bgcolor=self.current_theme.nav_bgcolor,
-            indicator_color=self.current_theme.indicator_color,
             destinations=[
                 ft.NavigationBarDestination(
                     icon=ft.Icons.HOME_ROUNDED,
@@ -34,31 +35,26 @@ class NavigationBar:
                 ),
             ],
             selected_index=0,  # Default to the first tab
-            on_change=lambda e: self.log_and_navigate(e),  # Handle navigation with logging
+            on_change=self.log_and_navigate,  # Handle navigation with logging
         )
+        self.binder.bind(self.navigation_bar, bgcolor="nav_bgcolor", indicator_color="indicator_color")
 
-        self.navigation_bar_container = ft.Container(
-            content=self.navigation_bar,
-            bgcolor=self.current_theme.nav_bgcolor,  # Match the theme's navigation bar color
-            padding=cogs.PAD_LR,
-            border_radius=10
+        self.navigation_bar_container = self.binder.bind(
+            ft.Container(
+                content=self.navigation_bar,
+                padding=cogs.PAD_LR,
+                border_radius=10
+            ),
+            bgcolor="nav_bgcolor",  # Match the theme's navigation bar color
         )
 
     # Ensure the `navigate_to` method correctly updates the route
     def navigate_to(self, index):
-        print(f"Selected index: {index}")  # Debugging statement to log the selected index
-        if index == 0:
-            self.page.go("/")
-        elif index == 1:
-            self.page.go("/activities")
-        elif index == 2:
-            self.page.go("/focus")
-        elif index == 3:
-            self.page.go("/skills")
-        self.page.update()  # Ensure the page is updated after navigation
+        self.app.navigate(registry.path_for_index(index))
 
-    def log_and_navigate(self, e):
-        print(f"NavigationBar on_change triggered. New selected index: {e.control.selected_index}")
+    # Async so the tap is handled on the event loop; logged by the metrics worker when instrumentation is on
+    async def log_and_navigate(self, e):
+        metrics.event("nav", index=e.control.selected_index)
         self.navigate_to(e.control.selected_index)
 
     def get_navigation_bar_container(self):
@@ -1,20 +1,98 @@
 # Imports
 import flet as ft
+from Engine.search import Debouncer
+from Components.factory import Styles
+from Engine.updates import request_update
+
+KIND_ICONS = {
+    "task": ft.Icons.CHECK_CIRCLE_OUTLINE,
+    "event": ft.Icons.EVENT,
+    "workout": ft.Icons.FITNESS_CENTER,
+    "goal": ft.Icons.FLAG_OUTLINED,
+    "skill": ft.Icons.BAR_CHART_ROUNDED,
+}
 
 class Widgets:
+    SEARCH_DELAY = 0.15  # Seconds of typing pause before a query runs
+    SEARCH_RESULTS = 8
+    BAR_MIN_HEIGHT = 14  # Room for a bar's label
+
     @staticmethod
-    def search_bar():
+    def search_bar(index=None, on_select=None, loop=None):
+        results = ft.Column(spacing=4, visible=False)
+
+        def show(query):
+            hits = index.search(query, k=Widgets.SEARCH_RESULTS) if query.strip() else []
+            results.controls = [
+                ft.Container(
+                    content=ft.Row(
+                        [
+                            ft.Icon(KIND_ICONS.get(hit.kind, ft.Icons.SEARCH), size=14, color=ft.Colors.GREY_400),
+                            ft.Text(hit.title, size=10, color=ft.Colors.WHITE),
+                        ],
+                    ),
+                    padding=Styles.padding(left=10, right=10, top=4, bottom=4),
+                    on_click=(lambda e, key=hit.key: on_select(key)) if on_select else None,
+                )
+                for hit in hits
+            ]
+            results.visible = bool(hits)
+            request_update(results)
+
+        # Results are filled in on the loop, after the typing pause
+        debounced = Debouncer(Widgets.SEARCH_DELAY, show, loop)
         return ft.Container(
-            content=ft.TextField(
-                hint_text="Search Goals, Tasks, Workouts, etc",
-                suffix_icon=ft.Icons.SEARCH,
-                focused_border_color=ft.Colors.GREEN,
-                bgcolor=ft.Colors.GREY_900,
-                cursor_color=ft.Colors.WHITE,
-                color=ft.Colors.WHITE,
-                height=30,
-                text_size=10,
-                border_radius=10,
+            content=ft.Column(
+                [
+                    ft.TextField(
+                        hint_text="Search Goals, Tasks, Workouts, etc",
+                        suffix_icon=ft.Icons.SEARCH,
+                        focused_border_color=ft.Colors.GREEN,
+                        bgcolor=ft.Colors.GREY_900,
+                        cursor_color=ft.Colors.WHITE,
+                        color=ft.Colors.WHITE,
+                        height=30,
+                        text_size=10,
+                        border_radius=10,
+                        on_change=(lambda e: debounced(e.control.value)) if index is not None else None,
+                    ),
+                    results,
+                ],
+                spacing=4,
             ),
             padding=ft.Padding(left=25, right=25, top=0, bottom=20),
         )
+
+    # Bottom-aligned bars with their label inside; show_bars sets the heights (and labels) later
+    @staticmethod
+    def bar_chart(labels, binder, height=60, width=16):
+        return ft.Row(
+            [
+                binder.bind(
+                    ft.Container(
+                        ft.Text(label, size=9, color=ft.Colors.BLACK),
+                        alignment=ft.Alignment(0, 1),
+                        width=width,
+                        height=Widgets.BAR_MIN_HEIGHT,
+                        border_radius=3,
+                    ),
+                    bgcolor="accent_color",
+                )
+                for label in labels
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+            vertical_alignment=ft.CrossAxisAlignment.END,
+            height=height,
+            spacing=8,
+        )
+
+    # Heights relative to the largest value, or to `peak` when that is larger; bars past the values are hidden
+    @staticmethod
+    def show_bars(chart, values, labels=None, peak=0):
+        top = max(max(values, default=0), peak) or 1
+        for i, bar in enumerate(chart.controls):
+            bar.visible = i < len(values)
+            if bar.visible:
+                bar.height = max(Widgets.BAR_MIN_HEIGHT, round(values[i] / top * chart.height))
+                if labels is not None:
+                    bar.content.value = labels[i]
@@ -1,100 +1,61 @@
 import flet as ft
-from Pages.home import HomePage
-from Pages.activities import ActivitiesPage
-from Pages.focus import FocusPage
-from Pages.skills import SkillsPage
-from User.profile import ProfilePage
 from Components.header import Header
 from Components.nav import NavigationBar
-from Engine.themes import ThemeFactory
+from Engine.themes import ThemeFactory, ThemeBinder
 from Engine.page import Page
+from Engine.cache import ViewCache
+from Engine.routes import registry
+from Engine.metrics import metrics
 from Engine.settings import Config as cogs
+from Engine.updates import UpdateScheduler
 
 class Routes:
-    def __init__(self, app, page, current_theme, header, navigation_bar):
+    def __init__(self, app, page, current_theme, header, navigation_bar, themes=None):
         self.app = app
         self.page = page
         self.current_theme = current_theme
+        self.themes = themes or ThemeBinder(current_theme)
+        self.store = getattr(app, "store", None)
+        self.search = getattr(app, "search", None)
+        self.timers = getattr(app, "timers", None)
+        self.progress = getattr(app, "progress", None)
+        self.images = getattr(app, "images", None)
+        self.loader = getattr(app, "loader", None)
+        self.session = getattr(app, "session", None)
+        self.notifications = getattr(app, "notifications", None)
+        self.recommender = getattr(app, "recommender", None)
+        self.sessions = getattr(app, "sessions", None)
+        self.focus = getattr(app, "focus", None)
+        self.rollups = getattr(app, "rollups", None)
+        self.schedule = getattr(app, "schedule", None)
         self.header = header
         self.navigation_bar = navigation_bar
+        self.view_cache = ViewCache(cogs.VIEW_CACHE_SIZE, cogs.VIEW_CACHE_CONTROLS)
 
     def handle_route(self, route):
-        if route == "/profile":
-            from User.profile import ProfilePage
-            return ft.View(
-                route="/profile",
-                controls=[
-                    ProfilePage(self.page).build(),
-                ],
-            )
-        elif route == "/activities":
-            return ft.View(
-                route="/activities",
-                controls=[
-                    ft.Column(
-                        [
-                            self.header.create_header(),
-                            ft.Container(
-                                content=ActivitiesPage(self.current_theme).build(),
-                                expand=True,
-                            ),
-                            self.navigation_bar.get_navigation_bar_container(),
-                        ],
-                        expand=True,
-                    ),
-                ],
-            )
-        elif route == "/focus":
-            return ft.View(
-                route="/focus",
-                controls=[
-                    ft.Column(
-                        [
-                            self.header.create_header(),
-                            ft.Container(
-                                content=FocusPage(self.current_theme).build(),
-                                expand=True,
-                            ),
-                            self.navigation_bar.get_navigation_bar_container(),
-                        ],
-                        expand=True,
-                    ),
-                ],
-            )
-        elif route == "/skills":
-            return ft.View(
-                route="/skills",
-                controls=[
-                    ft.Column(
-                        [
-                            self.header.create_header(),
-                            ft.Container(
-                                content=SkillsPage(self.current_theme).build(),
-                                expand=True,
-                            ),
-                            self.navigation_bar.get_navigation_bar_container(),
-                        ],
-                        expand=True,
-                    ),
-                ],
-            )
-        else:
-            return ft.View(
-                route="/",
-                controls=[
-                    ft.Column(
-                        [
-                            self.header.create_header(),
-                            ft.Container(
-                                content=HomePage(self.page, self.navigation_bar.navigation_bar, self.current_theme).build(),
-                                expand=True,
-                            ),
-                            self.navigation_bar.get_navigation_bar_container(),
-                        ],
-                        expand=True,
-                    ),
-                ],
-            )
+        return self.view_cache.get(route, self.current_theme, lambda: self.build_view(route))
+
+    def build_view(self, route):
+        entry, params = registry.resolve(route)
+        content = entry.build(self, params)
+        if not entry.chrome:
+            return ft.View(route=entry.url(params), controls=[content])
+        return ft.View(
+            route=entry.url(params),
+            controls=[
+                ft.Column(
+                    [
+                        self.header.create_header(),
+                        ft.Container(
+                            content=content,
+                            expand=True,
+                        ),
+                        self.navigation_bar.get_navigation_bar_container(),
+                    ],
+                    expand=True,
+                ),
+            ],
+        )
 
 class PageBuilder:
     def __init__(self, app, page:ft.Page):
@@ -102,21 +63,33 @@ class PageBuilder:
         self.page = page
         super().__init__()
         self.current_theme = ThemeFactory.dark_theme()
-        self.header = Header(app, self.current_theme)
-        self.navigation_bar = NavigationBar(app, self.current_theme)
-        self.routes = Routes(app, page, self.current_theme, self.header, self.navigation_bar)
+        self.themes = ThemeBinder(self.current_theme)
+        self.header = Header(app, self.current_theme, self.themes)
+        self.navigation_bar = NavigationBar(app, self.current_theme, self.themes)
+        self.routes = Routes(app, page, self.current_theme, self.header, self.navigation_bar, self.themes)
 
     def toggle_theme(self):
-        self.current_theme = (
-            ThemeFactory.light_theme() if self.current_theme == ThemeFactory.dark_theme() else ThemeFactory.dark_theme()
-        )
+        previous = self.current_theme
+        self.current_theme = ThemeFactory.toggled(previous)
+        self.routes.current_theme = self.current_theme
+        self.routes.view_cache.retheme(previous, self.current_theme)
         self.apply_theme()
 
+    # Call when a page's data changes so its next visit rebuilds
+    def invalidate_route(self, route=None):
+        if route is None:
+            self.routes.view_cache.invalidate_all()
+        else:
+            self.routes.view_cache.invalidate(route)
+
+    # Patch bound colours on the mounted views instead of rebuilding them
     def apply_theme(self):
-        self.page.bgcolor = self.current_theme.bgcolor
-        self.page.views.clear()
-        self.page.views.append(self.build_page(self.page.route))
-        self.page.update()
+        with metrics.timer("theme"):
+            self.themes.switch(self.current_theme)
+            self.page.bgcolor = self.current_theme.bgcolor
+            if not self.page.views:
+                self.page.views.append(self.build_page(self.page.route))
+            UpdateScheduler.of(self.page).request()
 
     def build_page(self, route):
         return self.routes.handle_route(route)
\ No newline at end of file
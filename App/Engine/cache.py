@@ -0,0 +1,102 @@
+# Imports
+from collections import OrderedDict
+import flet as ft
+from Engine.memory import memory
+from Engine.metrics import count_controls
+
+class ViewCache:
+    # Bounded by view count and, when max_controls is set, by the controls those views hold;
+    # on_drop(view) runs for every view that leaves, e.g. to unmount it
+    def __init__(self, capacity=8, max_controls=None, on_drop=None):
+        self.capacity = capacity
+        self.max_controls = max_controls
+        self.on_drop = on_drop
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._views = OrderedDict()
+
+    @staticmethod
+    def key(route, theme):
+        return (route, getattr(theme, "name", theme))
+
+    # Return the cached view for (route, theme), building and storing it on a miss
+    def get(self, route, theme, build):
+        key = self.key(route, theme)
+        view = self._views.get(key)
+        if view is not None:
+            self.hits += 1
+            self._views.move_to_end(key)
+            return view
+
+        self.misses += 1
+        view = build()
+        self._views[key] = view
+        memory.track(route, view)
+        self.trim()
+        return view
+
+    # Evict least recently used views past either bound; the newest view always stays.
+    # Views are counted here rather than on insert, since pages keep filling in after they are built.
+    def trim(self):
+        while len(self._views) > self.capacity:
+            self._drop(next(iter(self._views)))
+            self.evictions += 1
+        if self.max_controls is None:
+            return
+        total = sum(count_controls(view) for view in self._views.values())
+        while total > self.max_controls and len(self._views) > 1:
+            key = next(iter(self._views))
+            total -= count_controls(self._views[key])
+            self._drop(key)
+            self.evictions += 1
+
+    def _drop(self, key):
+        view = self._views.pop(key)
+        memory.release(key[0], view)
+        if self.on_drop is not None:
+            self.on_drop(view)
+
+    def holds(self, view):
+        return any(cached is view for cached in self._views.values())
+
+    # Drop cached views for a route and its sub-routes (every theme), e.g. when that page's data changes
+    def invalidate(self, route):
+        prefix = route.rstrip("/") + "/"
+        for key in [key for key in self._views if key[0] == route or (route != "/" and key[0].startswith(prefix))]:
+            self._drop(key)
+
+    # Re-key views after their bound colours were patched in place for a new theme
+    def retheme(self, old, new):
+        old, new = getattr(old, "name", old), getattr(new, "name", new)
+        for key in [key for key in self._views if key[1] == old]:
+            self._views[(key[0], new)] = self._views.pop(key)
+
+    def invalidate_all(self):
+        for key in list(self._views):
+            self._drop(key)
+
+    def stats(self):
+        return {
+            "size": len(self._views),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __contains__(self, key):
+        return key in self._views
+
+    def __len__(self):
+        return len(self._views)
+
+class ViewFrame(ft.Container):
+    # Keeps a cached view mounted while hidden. Isolated, so a page or parent update diffs only the frame's own
+    # attributes (its visibility) and never walks the view inside; the view's controls are updated directly.
+    def __init__(self, view):
+        super().__init__(view, expand=True)
+        self.view = view
+
+    def is_isolated(self):
+        return True
@@ -0,0 +1,90 @@
+# Imports
+import time
+from Engine.settings import Config as cogs
+from Engine.timer import FocusTimer, TimerScheduler, RUNNING, PAUSED
+from Engine.updates import Bindings
+from Engine.notifications import NotificationCenter, NORMAL, HIGH
+from Storage.sessions import COMPLETED, ABANDONED
+
+class FocusState:
+    HISTORY_DAYS = 7
+
+    # The one focus timer, owned by the app rather than a page: a FocusPage rebuilt after an invalidate
+    # or a cache eviction binds to the timer that is already running instead of starting an idle one
+    def __init__(self, timers=None, notifications=None, sessions=None, loader=None):
+        self.timers = timers or TimerScheduler()
+        self.notifications = notifications or NotificationCenter.default()
+        self.sessions = sessions  # SessionLog; None keeps no history
+        self.loader = loader  # Appends (and their fsync) run on its pool; None writes inline
+        self.skill = None
+        phases = []
+        for _ in range(cogs.FOCUS_ROUNDS):
+            phases += [("Focus", cogs.FOCUS_MINUTES * 60), ("Break", cogs.BREAK_MINUTES * 60)]
+        self.timer = FocusTimer(phases[:-1], on_tick=self.on_tick, on_phase=self.on_phase, on_finish=self.on_finish)
+        self.clock = Bindings()  # render(control, state) on every tick and state change
+        self.history = Bindings()  # render(control, minutes per day, streak) when a session is logged
+
+    @property
+    def action(self):
+        return "Pause" if self.timer.state == RUNNING else "Resume" if self.timer.state == PAUSED else "Start"
+
+    def bind(self, control, render):
+        render(control, self)
+        return self.clock.add(control, render)
+
+    def bind_history(self, control, render):
+        render(control, *self.summary())
+        return self.history.add(control, render)
+
+    # Focused minutes per day for the last HISTORY_DAYS days, and the streak, summed straight from the mapped log
+    def summary(self):
+        return self.sessions.daily(self.HISTORY_DAYS) / 60, self.sessions.streak()
+
+    def on_tick(self, timer):
+        self.clock.render(self)
+
+    # Focus phases that end, or are reset part-way, go into the session log; breaks do not
+    def log_focus(self, index, elapsed, outcome):
+        if self.sessions is None or self.timer.phases[index][0] != "Focus":
+            return
+        if outcome == ABANDONED and elapsed < cogs.FOCUS_MIN_LOG:
+            return
+        start, skill = time.time() - elapsed, self.skill
+        if self.loader is None:
+            self.sessions.append(start, elapsed, skill, outcome)
+            self.history_changed()
+        else:
+            self.loader.submit(lambda: self.sessions.append(start, elapsed, skill, outcome), lambda _: self.history_changed())
+
+    def history_changed(self):
+        self.history.render(*self.summary())
+
+    # Phase changes share one key, so a long session leaves a single "N phase changes" entry
+    def on_phase(self, timer):
+        self.log_focus(timer.phase_index - 1, timer.phases[timer.phase_index - 1][1], COMPLETED)
+        self.notifications.post("focus phase", f"{timer.label} started ({{count}} phase changes)", NORMAL)
+        self.on_tick(timer)
+
+    def on_finish(self, timer):
+        self.log_focus(timer.phase_index, timer.duration, COMPLETED)
+        self.notifications.dismiss("focus phase")
+        self.notifications.post("focus done", "Focus session complete", HIGH)
+        self.on_tick(timer)
+
+    def toggle(self, page=None):
+        if self.timer.state == RUNNING:
+            self.timer.pause()
+        else:
+            self.timer.start(self.timers)
+            if page is not None:
+                self.timers.start(page)
+        self.on_tick(self.timer)
+
+    def reset(self):
+        if self.timer.state in (RUNNING, PAUSED):
+            self.log_focus(self.timer.phase_index, self.timer.elapsed(), ABANDONED)
+        self.timer.reset()
+        self.on_tick(self.timer)
+
+    def select_skill(self, value):
+        self.skill = value or None
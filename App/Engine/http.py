@@ -0,0 +1,79 @@
+# Imports
+import http.client
+import json
+import queue
+import urllib.parse
+import zlib
+
+class HttpError(Exception):
+    def __init__(self, status, message=""):
+        super().__init__(f"{status} {message}".strip())
+        self.status = status
+
+class HttpClient:
+    # Keep-alive connections to one host, reused across requests instead of a handshake per call
+    def __init__(self, base_url, size=4, timeout=10):
+        parts = urllib.parse.urlsplit(base_url)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self.opened = 0  # Connections created; stays low when keep-alive works
+        self.sent = 0  # Request body bytes, after compression
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            self.opened += 1
+            return self.connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, connection):
+        if self._idle.qsize() < self.size:
+            self._idle.put(connection)
+        else:
+            connection.close()
+
+    # JSON in and out; compress=True deflates the body, and deflated responses are inflated
+    def request(self, method, path, body=None, token=None, compress=False):
+        headers = {"Accept": "application/json", "Accept-Encoding": "deflate"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body, separators=(",", ":")).encode()
+            headers["Content-Type"] = "application/json"
+            if compress:
+                payload = zlib.compress(payload)
+                headers["Content-Encoding"] = "deflate"
+            self.sent += len(payload)
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        connection = self._acquire()
+        for attempt in range(2):
+            try:
+                connection.request(method, self.prefix + path, body=payload, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # The server closed an idle pooled connection; retry once on a fresh one
+                connection.close()
+                if attempt:
+                    raise
+                self.opened += 1
+                connection = self.connection_class(self.host, self.port, timeout=self.timeout)
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(connection)
+        if response.getheader("Content-Encoding") == "deflate":
+            data = zlib.decompress(data)
+        if response.status >= 400:
+            raise HttpError(response.status, data.decode(errors="replace"))
+        return json.loads(data) if data else None
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
@@ -0,0 +1,132 @@
+# Imports
+import hashlib
+import os
+import threading
+import time
+import urllib.request
+from io import BytesIO
+from PIL import Image, ImageOps
+from Engine.settings import Config as cogs
+from Engine.loader import Loader
+
+RETRY_AFTER = 60  # Seconds before a failed download is attempted again
+
+class ImageCache:
+    _default = None
+
+    # Files live under the flet assets dir so they are served locally as "/<subdir>/<name>"
+    def __init__(self, assets_dir, subdir="cache", max_bytes=32 * 1024 * 1024, placeholder="/placeholder.png", density=2):
+        self.directory = os.path.join(assets_dir, subdir)
+        self.subdir = subdir
+        self.max_bytes = max_bytes
+        self.placeholder = placeholder
+        self.density = density  # Device pixels per logical pixel the thumbnails are rendered for
+        self.lock = threading.Lock()
+        self.loader = Loader.default()  # Downloads share the app's blocking-I/O pool; on_ready runs on its loop
+        self._files = {}  # key -> file name
+        self._size = 0
+        self._pending = {}  # key -> callbacks waiting on a download
+        self._failed = {}  # key -> time of the last failed download
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if not name.endswith(".part"):
+                self._files[os.path.splitext(name)[0]] = name
+                self._size += os.path.getsize(os.path.join(self.directory, name))
+
+    # Addressed by what is asked for, not by the bytes: a lookup has to hit before anything is downloaded
+    @staticmethod
+    def key(url, width, height):
+        return hashlib.sha256(f"{url}|{width}x{height}".encode()).hexdigest()
+
+    def src(self, name):
+        return f"/{self.subdir}/{name}"
+
+    # Local src for the image at display size; on a miss returns the placeholder and calls on_ready(src) later
+    def resolve(self, url, width, height, on_ready=None):
+        key = self.key(url, width, height)
+        with self.lock:
+            name = self._files.get(key)
+            if name is None:
+                if time.time() - self._failed.get(key, 0) >= RETRY_AFTER:
+                    waiting = self._pending.get(key)
+                    if waiting is None:
+                        self._pending[key] = [on_ready] if on_ready else []
+                        self.loader.submit(lambda: self._download(key, url, width, height), lambda name: self._ready(key, name))
+                    elif on_ready:
+                        waiting.append(on_ready)
+                return self.placeholder
+        path = os.path.join(self.directory, name)
+        try:
+            os.utime(path)  # Recency for LRU eviction
+        except FileNotFoundError:
+            with self.lock:
+                self._files.pop(key, None)
+            return self.resolve(url, width, height, on_ready)
+        return self.src(name)
+
+    def _download(self, key, url, width, height):
+        try:
+            with urllib.request.urlopen(url, timeout=10) as response:
+                data = self._thumbnail(response.read(), width, height)
+            name = key + ".jpg"
+            path = os.path.join(self.directory, name)
+            with open(path + ".part", "wb") as handle:
+                handle.write(data)
+            os.replace(path + ".part", path)
+        except (OSError, ValueError):
+            with self.lock:
+                self._failed[key] = time.time()
+            return None
+        with self.lock:
+            self._files[key] = name
+            self._size += len(data)
+            self._failed.pop(key, None)
+        self._evict()
+        return name
+
+    # On the loader's loop: hand the new src to everyone who asked for it while it downloaded
+    def _ready(self, key, name):
+        with self.lock:
+            callbacks = self._pending.pop(key, [])
+        if name is not None:
+            for callback in callbacks:
+                callback(self.src(name))
+
+    # Crop-and-scale to exactly the displayed box (like ImageFit.COVER)
+    def _thumbnail(self, data, width, height):
+        with Image.open(BytesIO(data)) as image:
+            fitted = ImageOps.fit(image.convert("RGB"), (width * self.density, height * self.density))
+            output = BytesIO()
+            fitted.save(output, "JPEG", quality=85, optimize=True)
+        return output.getvalue()
+
+    # Drop least recently used files until the cache fits in max_bytes
+    def _evict(self):
+        with self.lock:
+            if self._size <= self.max_bytes:
+                return
+            entries = []
+            for key, name in self._files.items():
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, key, path))
+            entries.sort()
+            self._size = sum(entry[1] for entry in entries)
+            for mtime, size, key, path in entries:
+                if self._size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                del self._files[key]
+                self._size -= size
+
+    @classmethod
+    def default(cls):
+        if cls._default is None:
+            cls._default = cls(cogs.ASSETS_DIR, max_bytes=cogs.IMAGE_CACHE_BYTES)
+        return cls._default
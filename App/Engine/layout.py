@@ -0,0 +1,95 @@
+# Imports
+import bisect
+import flet as ft
+from Engine.settings import Config as cogs
+from Engine.updates import Bindings, UpdateScheduler
+from Engine.timer import Throttle
+
+class Layout:
+    __slots__ = ("name", "device", "max_width", "alignment")
+
+    def __init__(self, name, device, max_width, alignment):
+        self.name = name
+        self.device = device  # The Device profile for this breakpoint
+        self.max_width = max_width  # Content column width; None fills the window
+        self.alignment = alignment  # Page cross-axis alignment of the content column
+
+class LayoutEngine:
+    DESKTOP_PLATFORMS = (ft.PagePlatform.WINDOWS, ft.PagePlatform.MACOS, ft.PagePlatform.LINUX)
+
+    # breakpoints are (device name, min width) in ascending order
+    def __init__(self, page, breakpoints=cogs.BREAKPOINTS, interval=cogs.RESIZE_INTERVAL):
+        self.page = page
+        self.names = [name for name, _ in breakpoints]
+        self.widths = [width for _, width in breakpoints]
+        self._layouts = {}  # name -> Layout, computed once per breakpoint
+        self.width = None
+        self.current = None
+        self.bindings = Bindings()
+        self.resizes = 0  # on_resized events received
+        self.changes = 0  # Breakpoint crossings pushed to the client
+        self.throttle = Throttle(interval, self.refresh, page.loop)
+
+    def breakpoint(self, width):
+        return self.names[max(0, bisect.bisect_right(self.widths, width) - 1)]
+
+    def layout(self, name):
+        layout = self._layouts.get(name)
+        if layout is None:
+            device = cogs.get_device_dimensions(name)
+            wide = name != self.names[0]
+            layout = self._layouts[name] = Layout(
+                name,
+                device,
+                min(device["app_width"], cogs.CONTENT_MAX_WIDTH) if wide else None,
+                ft.CrossAxisAlignment.CENTER if wide else ft.CrossAxisAlignment.START,
+            )
+        return layout
+
+    def native(self):
+        try:
+            return not self.page.web and self.page.platform in self.DESKTOP_PLATFORMS
+        except ValueError:
+            return False  # No client has reported its platform, e.g. in the bench
+
+    # The client's real size: the window on desktop, the browser or screen elsewhere
+    def measure(self):
+        width = self.page.window.width if self.native() else self.page.width
+        return width or cogs.APP_WIDTH
+
+    # Size a desktop window from the configured device, then follow whatever size the client really has
+    def attach(self):
+        if self.native():
+            self.page.window.width = cogs.APP_WIDTH
+            self.page.window.height = cogs.APP_HEIGHT
+            self.page.window.resizable = cogs.APP_RESIZABLE
+            self.page.window.maximizable = cogs.APP_MAXIMIZE
+        self.page.on_resized = self.on_resized
+        self.width = self.measure()
+        self.current = self.layout(self.breakpoint(self.width))
+        self.page.horizontal_alignment = self.current.alignment
+
+    # Resize events arrive per pixel while dragging; only the latest size is checked, at most once per interval
+    def on_resized(self, e):
+        self.resizes += 1
+        self.width = e.width
+        self.throttle()
+
+    def refresh(self):
+        layout = self.layout(self.breakpoint(self.width))
+        if layout is self.current:
+            return
+        self.changes += 1
+        self.current = layout
+        self.page.horizontal_alignment = layout.alignment
+        with UpdateScheduler.of(self.page).batch():
+            self.bindings.render(layout)
+            UpdateScheduler.of(self.page).request()
+
+    # render(control, layout) runs now and again each time a breakpoint is crossed
+    def bind(self, control, render):
+        render(control, self.current or self.layout(self.names[0]))
+        return self.bindings.add(control, render)
+
+    def stats(self):
+        return {"layout": self.current.name if self.current else None, "resizes": self.resizes, "changes": self.changes}
@@ -0,0 +1,114 @@
+# Imports
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from Engine.settings import Config as cogs
+
+logger = logging.getLogger("momentum.loader")
+
+class LoadTask:
+    __slots__ = ("scope", "future", "on_done", "on_error", "cancelled")
+
+    def __init__(self, scope, on_done, on_error):
+        self.scope = scope
+        self.future = None
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = False
+
+class LoadScope:
+    # Loads submitted here are dropped together, e.g. when the user leaves the page that started them
+    def __init__(self, loader, key):
+        self.loader = loader
+        self.key = key
+
+    def submit(self, work, on_done=None, on_error=None):
+        return self.loader.submit(work, on_done, on_error, scope=self.key)
+
+class Loader:
+    _default = None
+
+    # One pool for blocking work (store queries, downloads, sync) so none of it runs on the flet event loop
+    def __init__(self, workers=4):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="loader")
+        self.lock = threading.Lock()
+        self.loop = None  # Results are handed back on this loop; inline when it is not running
+        self._scopes = {}  # scope -> set of LoadTask
+        self._pending = set()  # Every task not yet delivered or cancelled
+
+    def attach(self, loop):
+        self.loop = loop
+
+    def scope(self, key):
+        return LoadScope(self, key)
+
+    # Run work(); on_done(result) or on_error(exc) then runs on the event loop unless the load was cancelled
+    def submit(self, work, on_done=None, on_error=None, scope=None):
+        task = LoadTask(scope, on_done, on_error)
+        with self.lock:
+            self._pending.add(task)
+            if scope is not None:
+                self._scopes.setdefault(scope, set()).add(task)
+        task.future = self.pool.submit(work)
+        task.future.add_done_callback(lambda future: self._finished(task))
+        return task
+
+    def _finished(self, task):
+        if task.cancelled or task.future.cancelled():
+            self._forget(task)
+            return
+        loop = self.loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._deliver, task)
+        else:
+            self._deliver(task)
+
+    def _forget(self, task):
+        with self.lock:
+            self._pending.discard(task)
+            tasks = self._scopes.get(task.scope)
+            if tasks is not None:
+                tasks.discard(task)
+                if not tasks:
+                    del self._scopes[task.scope]
+
+    # A task counts as pending until it is handed back here, so pending() == 0 means everything landed
+    def _deliver(self, task):
+        self._forget(task)
+        if task.cancelled:
+            return
+        error = task.future.exception()
+        if error is None:
+            if task.on_done is not None:
+                task.on_done(task.future.result())
+        elif task.on_error is not None:
+            task.on_error(error)
+        else:
+            logger.error("Background load failed", exc_info=error)
+
+    # Cancel every pending load in a scope; returns how many were still outstanding
+    def cancel(self, scope):
+        with self.lock:
+            tasks = self._scopes.pop(scope, ())
+            self._pending.difference_update(tasks)
+        for task in tasks:
+            task.cancelled = True
+            task.future.cancel()
+        return len(tasks)
+
+    def pending(self, scope=None):
+        with self.lock:
+            if scope is not None:
+                return len(self._scopes.get(scope, ()))
+            return len(self._pending)
+
+    # Await blocking work from an async handler without tying up the loop
+    async def run(self, work, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, work, *args)
+
+    @classmethod
+    def default(cls):
+        if cls._default is None:
+            cls._default = cls(cogs.LOADER_WORKERS)
+        return cls._default
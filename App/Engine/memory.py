@@ -0,0 +1,146 @@
+# Imports
+import gc
+import logging
+import threading
+import time
+import weakref
+from collections import deque
+from Engine.settings import Config as cogs
+from Engine.metrics import count_controls
+
+try:
+    import resource
+except ImportError:  # Windows has no getrusage; stats leave the RSS out
+    resource = None
+
+logger = logging.getLogger("momentum.memory")
+
+class MemoryTracker:
+    # Live views and page objects by route, held by weakref so tracking never keeps one alive.
+    # Disabled by default: every hook is a flag check and returns immediately.
+    def __init__(self, enabled=False, grace=cogs.MEMORY_LEAK_GRACE):
+        self.enabled = enabled
+        self.grace = grace  # Seconds a released view may stay reachable before it counts as leaked
+        self.lock = threading.Lock()
+        self._views = {}  # id -> (weakref, route)
+        self._pages = {}  # id -> (weakref, route)
+        self._released = {}  # id -> monotonic time the view left its cache
+        self._reported = set()  # ids already logged as leaked
+        self._dead = deque()  # (table, id) queued by weakref callbacks, which can fire inside any allocation
+        self.leaked = 0
+        self._worker = None
+        self._stop = threading.Event()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def _ref(self, table, route, obj):
+        key = id(obj)
+        table[key] = (weakref.ref(obj, lambda ref, key=key: self._dead.append((table, key))), route)
+
+    # Drop entries for collected objects; an id already reused by a newer object keeps its entry
+    def _purge(self):
+        while self._dead:
+            table, key = self._dead.popleft()
+            entry = table.get(key)
+            if entry is not None and entry[0]() is None:
+                del table[key]
+                if table is self._views:
+                    self._released.pop(key, None)
+                    self._reported.discard(key)
+
+    # A view a cache now holds for `route`
+    def track(self, route, view):
+        if not self.enabled:
+            return
+        with self.lock:
+            self._purge()
+            self._ref(self._views, route, view)
+            self._released.pop(id(view), None)
+
+    # The page object (HomePage, ...) that built a view; it should go when its view does
+    def track_page(self, route, page_object):
+        if not self.enabled:
+            return
+        with self.lock:
+            self._purge()
+            self._ref(self._pages, route, page_object)
+
+    # The view's cache dropped it; once it is unmounted it should be collected within the grace period
+    def release(self, route, view):
+        if not self.enabled:
+            return
+        with self.lock:
+            if id(view) in self._views:
+                self._released[id(view)] = time.monotonic()
+
+    # {route: {"views": n, "pages": n, "controls": n}} for everything still alive
+    def live(self):
+        with self.lock:
+            self._purge()
+            views = [(ref(), route) for ref, route in self._views.values()]
+            pages = [route for ref, route in self._pages.values() if ref() is not None]
+        counts = {}
+        for view, route in views:
+            if view is not None:
+                entry = counts.setdefault(route, {"views": 0, "pages": 0, "controls": 0})
+                entry["views"] += 1
+                entry["controls"] += count_controls(view)
+        for route in pages:
+            counts.setdefault(route, {"views": 0, "pages": 0, "controls": 0})["pages"] += 1
+        return counts
+
+    # Released views that survived a full collection, are off screen and are past the grace period
+    def leaks(self, now=None):
+        gc.collect()
+        now = now if now is not None else time.monotonic()
+        found = []
+        with self.lock:
+            self._purge()
+            released = [(key, self._views[key], at) for key, at in self._released.items() if key in self._views]
+        for key, (ref, route), at in released:
+            view = ref()
+            if view is None or getattr(view, "page", None) is not None or now - at < self.grace:
+                continue
+            found.append((route, now - at))
+            if key not in self._reported:
+                self._reported.add(key)
+                self.leaked += 1
+                holders = sorted({type(holder).__name__ for holder in gc.get_referrers(view)})
+                logger.warning("View for %s still reachable %.0fs after release, held by %s", route, now - at, ", ".join(holders))
+            del view
+        return found
+
+    def stats(self):
+        with self.lock:
+            self._purge()
+            stats = {
+                "views": sum(ref() is not None for ref, _ in self._views.values()),
+                "pages": sum(ref() is not None for ref, _ in self._pages.values()),
+                "released": len(self._released),
+                "leaked": self.leaked,
+            }
+        if resource is not None:
+            stats["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return stats
+
+    # Check for leaks on a daemon thread every `interval` seconds
+    def start(self, interval=cogs.MEMORY_CHECK_INTERVAL):
+        if self._worker is not None:
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, args=(interval,), name="memory", daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        if self._worker is not None:
+            self._stop.set()
+            self._worker.join()
+            self._worker = None
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            self.leaks()
+            logger.info("Memory %s", self.stats())
+
+memory = MemoryTracker(cogs.MEMORY_TRACKING)
@@ -0,0 +1,217 @@
+# Imports
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from Engine.settings import Config as cogs
+
+logger = logging.getLogger("momentum.metrics")
+
+DISABLED = nullcontext()
+
+class RingBuffer:
+    __slots__ = ("capacity", "samples", "index", "size", "total")
+
+    # Keeps the last `capacity` samples in a preallocated list; old samples are overwritten
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.samples = [0.0] * capacity
+        self.index = 0
+        self.size = 0
+        self.total = 0  # Samples ever recorded, including overwritten ones
+
+    def add(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+        self.total += 1
+
+    def values(self):
+        return self.samples[:self.size]
+
+    # Nearest-rank percentile over the retained samples
+    def percentile(self, p, ordered=None):
+        ordered = ordered or sorted(self.values())
+        if not ordered:
+            return 0.0
+        rank = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+    def summary(self):
+        ordered = sorted(self.values())
+        if not ordered:
+            return {"count": self.total}
+        return {
+            "count": self.total,
+            "mean": sum(ordered) / len(ordered),
+            "p50": self.percentile(50, ordered),
+            "p90": self.percentile(90, ordered),
+            "p99": self.percentile(99, ordered),
+            "max": ordered[-1],
+        }
+
+class Span:
+    __slots__ = ("metrics", "name", "fields", "start")
+
+    def __init__(self, metrics, name, fields):
+        self.metrics = metrics
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.name, time.perf_counter() - self.start, **self.fields)
+        return False
+
+class Metrics:
+    # Disabled by default: every hook is a flag check and returns immediately
+    def __init__(self, enabled=False, capacity=256):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self._series = {}  # name -> RingBuffer
+        self._counters = {}  # name -> int
+        self._queue = None
+        self._worker = None
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def timer(self, name, **fields):
+        if not self.enabled:
+            return DISABLED
+        return Span(self, name, fields)
+
+    # Wrap a callable so every call is timed under `name`
+    def timed(self, name, function):
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return function(*args, **kwargs)
+            with Span(self, name, {}):
+                return function(*args, **kwargs)
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    def record(self, name, value, **fields):
+        if not self.enabled:
+            return
+        with self.lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = RingBuffer(self.capacity)
+            series.add(value)
+        if self._queue is not None:
+            self._queue.put({"ts": time.time(), "metric": name, "value": value, **fields})
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    # Counted and, when logging runs, handed to the worker thread instead of printed from the handler
+    def event(self, name, **fields):
+        if not self.enabled:
+            return
+        self.count(name)
+        if self._queue is not None:
+            self._queue.put({"ts": time.time(), "event": name, **fields})
+
+    # Number of controls in a built tree, recorded per view
+    def record_controls(self, name, control, **fields):
+        if self.enabled:
+            self.record(name, count_controls(control), **fields)
+
+    # Time every page.update(), full or partial
+    def instrument_page(self, page):
+        if getattr(page.update, "__wrapped__", None) is None:
+            page.update = self.timed("update", page.update)
+        return page
+
+    def snapshot(self):
+        with self.lock:
+            series = {name: buffer.summary() for name, buffer in self._series.items()}
+            counters = dict(self._counters)
+        return {"series": series, "counters": counters}
+
+    def report(self):
+        snapshot = self.snapshot()
+        lines = [f"{'metric':<32}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}"]
+        for name, summary in sorted(snapshot["series"].items()):
+            if "p50" not in summary:
+                continue
+            scale, unit = (1, "") if name.startswith("controls") else (1000, "ms")
+            lines.append(
+                f"{name:<32}{summary['count']:>8}"
+                + "".join(f"{summary[key] * scale:>8.2f}{unit:<2}" for key in ("p50", "p90", "p99", "max"))
+            )
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"{name:<32}{value:>8}")
+        return "\n".join(lines)
+
+    def reset(self):
+        with self.lock:
+            self._series.clear()
+            self._counters.clear()
+
+    # Structured JSON lines on a daemon thread; every `interval` seconds a summary is logged as well
+    def start_logging(self, interval=None):
+        if self._worker is not None:
+            return
+        if not logger.handlers:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+        self._queue = queue.SimpleQueue()
+        self._worker = threading.Thread(target=self._drain, args=(interval,), name="metrics", daemon=True)
+        self._worker.start()
+
+    def stop_logging(self):
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+            self._queue = None
+
+    def _drain(self, interval):
+        next_summary = time.monotonic() + interval if interval else None
+        while True:
+            timeout = max(0.0, next_summary - time.monotonic()) if next_summary else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = {}
+            if item is None:
+                return
+            if item:
+                logger.info(json.dumps(item, default=str))
+            if next_summary and time.monotonic() >= next_summary:
+                logger.info(json.dumps({"ts": time.time(), "summary": self.snapshot()}))
+                next_summary = time.monotonic() + interval
+
+def count_controls(control):
+    count = 0
+    stack = [control]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        count += 1
+        children = getattr(node, "_get_children", None)
+        if children is not None:
+            stack.extend(children())
+        else:
+            stack.extend(getattr(node, "controls", None) or ())
+            stack.append(getattr(node, "content", None))
+    return count
+
+metrics = Metrics(cogs.METRICS_ENABLED, cogs.METRICS_SAMPLES)
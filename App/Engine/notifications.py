@@ -0,0 +1,138 @@
+# Imports
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from Engine.settings import Config as cogs
+from Engine.updates import Bindings
+from Engine.timer import Throttle
+
+LOW, NORMAL, HIGH, URGENT = 0, 1, 2, 3
+
+class Notification:
+    __slots__ = ("key", "title", "priority", "count", "created", "updated", "sequence")
+
+    # title may use {count}, e.g. "{count} reminders due"
+    def __init__(self, key, title, priority, now, count=1):
+        self.key = key
+        self.title = title
+        self.priority = priority
+        self.count = count
+        self.created = now
+        self.updated = now
+        self.sequence = None
+
+    def text(self):
+        return self.title.format(count=self.count)
+
+class NotificationCenter:
+    _default = None
+
+    def __init__(self, history=cogs.NOTIFICATION_HISTORY, interval=cogs.BADGE_INTERVAL):
+        self.lock = threading.Lock()
+        self._heap = []  # (-priority, -sequence, sequence, key); newest first within a priority
+        self._unread = {}  # key -> Notification; an entry is live while its sequence matches
+        self._counter = itertools.count()
+        self.history = deque(maxlen=history)  # Read notifications, newest last
+        self.posted = 0
+        self.coalesced = 0
+        self.bindings = Bindings()
+        self.changed = Throttle(interval, self._notify)
+
+    @classmethod
+    def default(cls):
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    # Badge redraws run on this loop (the page's) from then on
+    def attach(self, loop):
+        self.changed.loop = loop
+
+    # Posting an unread key again bumps its count and priority instead of adding a second entry;
+    # count folds several events posted at once, e.g. a batch of reminders
+    def post(self, key, title, priority=NORMAL, count=1):
+        now = time.time()
+        with self.lock:
+            self.posted += 1
+            notification = self._unread.get(key)
+            if notification is None:
+                notification = self._unread[key] = Notification(key, title, priority, now, count)
+            else:
+                self.coalesced += 1
+                notification.count += count
+                notification.title = title
+                notification.priority = max(notification.priority, priority)
+                notification.updated = now
+            notification.sequence = next(self._counter)
+            heapq.heappush(self._heap, (-notification.priority, -notification.sequence, notification.sequence, key))
+            self._compact()
+        self.changed()
+        return notification
+
+    # Superseded heap entries are skipped lazily; rebuild once they outnumber the live ones
+    def _compact(self):
+        if len(self._heap) > 2 * len(self._unread) + 32:
+            self._heap = [(-n.priority, -n.sequence, n.sequence, n.key) for n in self._unread.values()]
+            heapq.heapify(self._heap)
+
+    def _live(self, entry):
+        notification = self._unread.get(entry[3])
+        return notification is not None and notification.sequence == entry[2]
+
+    # Highest priority first, then newest
+    def peek(self, limit=10):
+        with self.lock:
+            entries = heapq.nsmallest(limit + len(self._heap) - len(self._unread), self._heap)
+            return [self._unread[entry[3]] for entry in entries if self._live(entry)][:limit]
+
+    def pop(self):
+        with self.lock:
+            while self._heap:
+                entry = heapq.heappop(self._heap)
+                if self._live(entry):
+                    notification = self._unread.pop(entry[3])
+                    self.history.append(notification)
+                    break
+            else:
+                return None
+        self.changed()
+        return notification
+
+    def dismiss(self, key):
+        with self.lock:
+            notification = self._unread.pop(key, None)
+            if notification is None:
+                return
+            self.history.append(notification)
+        self.changed()
+
+    def mark_all_read(self):
+        with self.lock:
+            if not self._unread:
+                return
+            self.history.extend(sorted(self._unread.values(), key=lambda n: n.sequence))
+            self._unread.clear()
+            self._heap = []
+        self.changed()
+
+    def unread(self):
+        return len(self._unread)
+
+    # render(control, center) runs now and then on a throttled schedule, so a burst of posts redraws a badge once or twice
+    def bind(self, control, render):
+        render(control, self)
+        return self.bindings.add(control, render)
+
+    def _notify(self):
+        self.bindings.render(self)
+
+    def stats(self):
+        return {
+            "unread": len(self._unread),
+            "posted": self.posted,
+            "coalesced": self.coalesced,
+            "badge_redraws": self.changed.runs,
+            "history": len(self.history),
+        }
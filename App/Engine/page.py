@@ -1,6 +1,7 @@
 # Imports
 import flet as ft
-from Engine.settings import Config as cogs, Device as viewport
+from Engine.settings import Config as cogs
+from Engine.layout import LayoutEngine
 
 class Page:
 	def __init__(self, page: ft.Page):
@@ -11,12 +12,9 @@ class Page:
 		self.page.vertical_alignment = ft.MainAxisAlignment.START
 		self.page.padding = cogs.APP_PADDING
 		
-		# Call the device check method directly
-		device_dimensions = viewport.mobile()
-		self.page.window.height = device_dimensions["app_height"]
-		self.page.window.width = device_dimensions["app_width"]
-		self.page.window.resizable = device_dimensions["app_resizable"]
-		self.page.window.maximizable = device_dimensions.get("app_maximize", True)
+		# Picks the Device profile from the client's real size and follows it on resize
+		self.layout_engine = LayoutEngine(self.page)
+		self.layout_engine.attach()
 
 	def get_page(self):
 		return self.page
@@ -0,0 +1,134 @@
+# Imports
+import threading
+from datetime import date, datetime
+import numpy as np
+from Engine.settings import Config as cogs
+from Engine.updates import Bindings
+from Storage.skills import SKILLS, TASKS
+
+class Recommendation:
+    __slots__ = ("title", "skill", "kind", "score")
+
+    def __init__(self, title, skill, kind, score=0.0):
+        self.title = title
+        self.skill = skill
+        self.kind = kind
+        self.score = score
+
+class Recommender:
+    # Weights for: past success with the task, neglected skill, the task's usual hour, the user's hours for its skill
+    WEIGHTS = np.array([1.0, 0.8, 0.6, 0.4])
+
+    def __init__(self, tasks=TASKS, skills=SKILLS, k=cogs.RECOMMENDATIONS):
+        self.tasks = list(tasks)
+        self.k = k
+        self.lock = threading.Lock()
+        self.skill_index = {name: i for i, (name, _) in enumerate(skills)}
+        self.task_index = {title: i for i, (title, *_) in enumerate(self.tasks)}
+        # Static features, one row per candidate
+        self.onehot = np.zeros((len(self.tasks), len(skills)))
+        for i, (_, skill, _, _) in enumerate(self.tasks):
+            self.onehot[i, self.skill_index[skill]] = 1.0
+        self.best_hour = np.array([hour for *_, hour in self.tasks], dtype=float)
+        # History counters, kept current by apply()
+        self.task_total = np.zeros(len(self.tasks))
+        self.task_done = np.zeros(len(self.tasks))
+        self.last_done = np.full(len(self.tasks), -1, dtype=np.int64)  # date ordinal
+        self.skill_done = np.zeros(len(skills))
+        self.hours = np.zeros((len(skills), 24))  # completions per skill and hour of day
+        self.ready = False
+        self._scored_at = None  # (day, hour) the cached ranking was computed for
+        self._top = []
+        self.bindings = Bindings()
+
+    # Seed the counters from the store's GROUP BY totals
+    def load(self, store):
+        with self.lock:
+            for title, total, done in store.totals("title"):
+                i = self.task_index.get(title)
+                if i is not None:
+                    self.task_total[i] = total
+                    self.task_done[i] = done or 0
+            for skill, total, done in store.totals("skill"):
+                s = self.skill_index.get(skill)
+                if s is not None:
+                    self.skill_done[s] = done or 0
+            for skill, hour, count in store.done_hours():
+                s = self.skill_index.get(skill)
+                if s is not None:
+                    self.hours[s, hour] = count
+            for title, day in store.last_done():
+                i = self.task_index.get(title)
+                if i is not None:
+                    self.last_done[i] = date.fromisoformat(day).toordinal()
+            self.ready = True
+            self._scored_at = None
+        self._publish()
+
+    # On the given executor (e.g. the app loader's pool), like SearchIndex.rebuild_async
+    def load_async(self, store, executor):
+        return executor.submit(self.load, store)
+
+    def _count(self, activity, sign):
+        done = activity.status == "done"
+        i = self.task_index.get(activity.title)
+        if i is not None:
+            self.task_total[i] += sign
+            if done:
+                self.task_done[i] += sign
+                if sign > 0:
+                    self.last_done[i] = max(self.last_done[i], date.fromisoformat(activity.day).toordinal())
+        s = self.skill_index.get(activity.skill)
+        if done and s is not None:
+            self.skill_done[s] += sign
+            self.hours[s, datetime.fromtimestamp(activity.updated).hour] += sign
+
+    # ActivityStore listener: O(1) counter deltas, then one vectorized rescore
+    def apply(self, event, old, new):
+        with self.lock:
+            if old is not None:
+                self._count(old, -1)
+            if new is not None:
+                self._count(new, 1)
+            self._scored_at = None
+        self._publish()
+
+    # Every candidate scored in one pass over the feature matrix
+    def scores(self, now=None):
+        now = now or datetime.now()
+        success = (self.task_done + 1) / (self.task_total + 2)
+        share = self.skill_done / max(self.skill_done.sum(), 1.0)
+        balance = self.onehot @ (1.0 - share)
+        usual_hour = 0.5 * (1.0 + np.cos(2 * np.pi * (now.hour - self.best_hour) / 24))
+        # The skill's completions in this hour against a uniform day, capped at twice as likely
+        profile = (self.hours[:, now.hour] + 1) / (self.hours.sum(axis=1) + 24) * 24
+        user_hour = self.onehot @ np.minimum(profile, 2.0) / 2.0
+        scores = np.column_stack((success, balance, usual_hour, user_hour)) @ self.WEIGHTS
+        scores[self.last_done == now.date().toordinal()] = -np.inf  # Already done today
+        return scores
+
+    # The cached top-k; rescored only after new activity or when the hour changes
+    def top(self, now=None):
+        now = now or datetime.now()
+        key = (now.date(), now.hour)
+        with self.lock:
+            if self._scored_at != key:
+                scores = self.scores(now)
+                k = min(self.k, len(scores))
+                best = np.argpartition(-scores, k - 1)[:k]
+                best = best[np.argsort(-scores[best], kind="stable")]
+                self._top = [Recommendation(*self.tasks[i][:3], float(scores[i])) for i in best if np.isfinite(scores[i])]
+                self._scored_at = key
+            return self._top
+
+    # render(control, recommendations) runs now and whenever the ranking changes
+    def bind(self, control, render):
+        render(control, self.top())
+        return self.bindings.add(control, render)
+
+    def _publish(self):
+        previous = [r.title for r in self._top]
+        top = self.top()
+        if [r.title for r in top] == previous:
+            return
+        self.bindings.render(top)
@@ -0,0 +1,101 @@
+# Imports
+import asyncio
+import threading
+import time
+from Engine.settings import Config as cogs
+from Engine.timer import TimerWheel
+from Engine.notifications import NotificationCenter, NORMAL
+from Storage.activities import reminder_change
+
+class Reminders:
+    # Every activity reminder in one timer wheel, driven by one task that sleeps until the next one is due.
+    # Rows live in the store (kept in step with edits there), so reminders missed while closed fire together on launch.
+    def __init__(self, store, notifications=None, loader=None, resolution=cogs.REMINDER_RESOLUTION):
+        self.store = store
+        self.notifications = notifications or NotificationCenter.default()
+        self.loader = loader  # Fired rows are cleared on its pool, off the page loop; None clears inline
+        self.lock = threading.Lock()
+        self.wheel = TimerWheel(resolution)
+        self.fired = 0
+        self._loop = None
+        self._wake = None
+        self.running = False
+
+    def load(self):
+        rows = self.store.reminders()
+        with self.lock:
+            for activity_id, due, title in rows:
+                self.wheel.add(activity_id, due, title)
+        self._notify()
+
+    # On the given executor (e.g. the app loader's pool); the wheel task wakes when the rows are in
+    def load_async(self, executor):
+        return executor.submit(self.load)
+
+    # ActivityStore listener; the store has already written the same change to its reminders table
+    def apply(self, event, old, new):
+        change = reminder_change(old, new)
+        if change is None:
+            return
+        with self.lock:
+            if change[0] == "set":
+                self.wheel.add(change[1], change[2], change[3])
+            elif change[0] == "title":
+                pending = self.wheel.get(change[1])
+                if pending is not None:
+                    self.wheel.add(change[1], pending[0], change[2])
+            else:
+                self.wheel.cancel(change[1])
+        self._notify()
+
+    def _notify(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    # Everything due goes out as one coalesced notification, however many reminders that is
+    def fire(self, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            due = self.wheel.expire(now)
+        if not due:
+            return 0
+        # Anything due by the end of this tick has fired; a reminder moved later meanwhile keeps its row
+        fired, before = [activity_id for activity_id, _ in due], now + self.wheel.resolution
+        if self.loader is None:
+            self.store.clear_reminders(fired, before)
+        else:
+            self.loader.submit(lambda: self.store.clear_reminders(fired, before))
+        self.fired += len(due)
+        self.notifications.post("reminders", "{count} reminders due", NORMAL, count=len(due))
+        return len(due)
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self.running = True
+        try:
+            while True:
+                self._wake.clear()
+                self.fire()
+                with self.lock:
+                    deadline = self.wheel.next_due()
+                if deadline is None:
+                    await self._wake.wait()
+                    continue
+                # A wake-up at a cascade point only moves entries down the wheel
+                try:
+                    await asyncio.wait_for(self._wake.wait(), max(0.0, deadline - time.time()))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.running = False
+            self._loop = None
+
+    # Start on the flet page's event loop
+    def start(self, page):
+        if not self.running:
+            self.running = True
+            page.run_task(self.run)
+
+    def stats(self):
+        return {"pending": len(self.wheel), "fired": self.fired, "next_due": self.wheel.next_due()}
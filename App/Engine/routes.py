@@ -1,51 +1,176 @@
 # Imports
-import flet as ft
-from Engine.page import Page
-from Pages.home import HomePage
-from Pages.activities import ActivitiesPage
-from Pages.focus import FocusPage
-from Pages.skills import SkillsPage
-from User.profile import ProfilePage
-from Components.nav import NavigationBar
-from Engine.themes import ThemeFactory
-
-class Routes(Page):
-    def __init__(self, page, current_theme=None):
-        self.page = page
-        self.current_theme = current_theme or ThemeFactory.dark_theme()
-        self.navigation_bar = NavigationBar(page, "dark")  # or use self.current_theme if you want dynamic
-
-    def path(self):
-        context = {
-            '/': ft.View(
-                route='/',
-                controls=[
-                    HomePage(self.page).build()
-                ]
-            ),
-            '/activities': ft.View(
-                route='/activities',
-                controls=[
-                    ActivitiesPage(self.page).build()
-                ]
-            ),
-            '/focus': ft.View(
-                route='/focus',
-                controls=[
-                    FocusPage(self.page).build()
-                ]
-            ),
-            '/skills': ft.View(
-                route='/skills',
-                controls=[
-                    SkillsPage(self.page).build()
-                ]
-            ),
-            '/profile': ft.View(
-                route='/profile',
-                controls=[
-                    ProfilePage(self.page).build()
-                ]
-            ),
-        }
-        return context
\ No newline at end of file
+import importlib
+import time
+from Engine.metrics import metrics
+from Engine.memory import memory
+
+class Route:
+    def __init__(self, path, module, attr, factory, nav_index=None, chrome=True):
+        self.path = path
+        self.module = module
+        self.attr = attr
+        self.factory = factory
+        self.nav_index = nav_index
+        self.chrome = chrome  # Wrap the page with the header and navigation bar
+        self.segments = split_path(path)
+        self.params = [s[1:-1] for s in self.segments if s.startswith("{") and s.endswith("}")]
+        self.page_class = None
+        self.import_time = None
+
+    # Import the page module the first time the route is visited
+    def load(self):
+        if self.page_class is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.module)
+            self.import_time = time.perf_counter() - start
+            self.page_class = getattr(module, self.attr)
+        return self.page_class
+
+    def match(self, segments):
+        params = {}
+        for pattern, segment in zip(self.segments, segments):
+            if pattern.startswith("{"):
+                params[pattern[1:-1]] = segment
+            elif pattern != segment:
+                return None
+        return params
+
+    def url(self, params=None):
+        return self.path.format(**params) if params else self.path
+
+    def create(self, ctx, params=None):
+        return self.factory(self.load(), ctx, **(params or {}))
+
+    def build(self, ctx, params=None):
+        with metrics.timer(f"build {self.path}"):
+            page_object = self.create(ctx, params)
+            content = page_object.build()
+        metrics.record_controls(f"controls {self.path}", content)
+        memory.track_page(self.path, page_object)
+        return content
+
+def split_path(path):
+    path = (path or "/").split("?", 1)[0].strip("/")
+    return path.split("/") if path else []
+
+class RouteRegistry:
+    def __init__(self, default="/"):
+        self.default = default
+        self._static = {}  # path -> Route
+        self._dynamic = {}  # (segment count, first segment) -> [Route]
+        self._by_index = {}  # nav index -> Route
+
+    def register(self, path, module, attr, factory, nav_index=None, chrome=True):
+        route = Route(path, module, attr, factory, nav_index, chrome)
+        if route.params:
+            if route.segments[0].startswith("{"):
+                raise ValueError("Parameterized routes need a static first segment")
+            self._dynamic.setdefault((len(route.segments), route.segments[0]), []).append(route)
+        else:
+            self._static["/" + "/".join(route.segments)] = route
+        if nav_index is not None:
+            self._by_index[nav_index] = route
+        return route
+
+    # Returns (route, params); unknown paths fall back to the default route
+    def resolve(self, path):
+        segments = split_path(path)
+        route = self._static.get("/" + "/".join(segments))
+        if route is not None:
+            return route, {}
+        if segments:
+            for route in self._dynamic.get((len(segments), segments[0]), ()):
+                params = route.match(segments)
+                if params is not None:
+                    return route, params
+        return self._static[self.default], {}
+
+    def build(self, path, ctx):
+        route, params = self.resolve(path)
+        return route.build(ctx, params)
+
+    def path_for_index(self, index):
+        route = self._by_index.get(index)
+        return route.path if route else self.default
+
+    def index_for_path(self, path):
+        return self.resolve(path)[0].nav_index
+
+    def routes(self):
+        yield from self._static.values()
+        for group in self._dynamic.values():
+            yield from group
+
+    def load_all(self):
+        for route in self.routes():
+            route.load()
+
+    def import_report(self):
+        lines = ["Route import times:"]
+        routes = sorted(self.routes(), key=lambda r: r.import_time or 0, reverse=True)
+        total = 0.0
+        for route in routes:
+            if route.import_time is None:
+                lines.append(f"  {route.path:<28} {route.module:<20} not loaded")
+            else:
+                total += route.import_time
+                lines.append(f"  {route.path:<28} {route.module:<20} {route.import_time * 1000:8.2f} ms")
+        lines.append(f"  {'total':<49} {total * 1000:8.2f} ms")
+        return "\n".join(lines)
+
+# Page factories; ctx is the app (or builder Routes) exposing page, current_theme, themes and navigation_bar
+def themed_page(cls, ctx, **params):
+    return cls(ctx.current_theme, ctx.themes, **params)
+
+# Store queries go through the app's loader, scoped to the route so leaving it cancels them
+def activities_page(cls, ctx, **params):
+    loader = getattr(ctx, "loader", None)
+    loads = loader.scope(ctx.page.route) if loader is not None else None
+    return cls(
+        ctx.current_theme,
+        ctx.themes,
+        store=getattr(ctx, "store", None),
+        loads=loads,
+        schedule=getattr(ctx, "schedule", None),
+        **params,
+    )
+
+def focus_page(cls, ctx):
+    return cls(
+        ctx.current_theme,
+        ctx.themes,
+        focus=getattr(ctx, "focus", None),
+    )
+
+def home_page(cls, ctx):
+    return cls(
+        ctx.page,
+        ctx.navigation_bar.navigation_bar,
+        ctx.current_theme,
+        ctx.themes,
+        search=getattr(ctx, "search", None),
+        progress=getattr(ctx, "progress", None),
+        images=getattr(ctx, "images", None),
+        session=getattr(ctx, "session", None),
+        recommender=getattr(ctx, "recommender", None),
+        app=getattr(ctx, "app", ctx),
+    )
+
+def skills_page(cls, ctx):
+    return cls(ctx.current_theme, ctx.themes, rollups=getattr(ctx, "rollups", None))
+
+def profile_page(cls, ctx):
+    return cls(ctx.current_theme, ctx.themes, session=getattr(ctx, "session", None))
+
+registry = RouteRegistry()
+registry.register("/", "Pages.home", "HomePage", home_page, nav_index=0)
+registry.register("/activities", "Pages.activities", "ActivitiesPage", activities_page, nav_index=1)
+registry.register("/activities/{activity_id}", "Pages.activities", "ActivitiesPage", activities_page)
+registry.register("/focus", "Pages.focus", "FocusPage", focus_page, nav_index=2)
+registry.register("/skills", "Pages.skills", "SkillsPage", skills_page, nav_index=3)
+registry.register("/profile", "User.profile", "ProfilePage", profile_page, chrome=False)
+
+# Import time of every page module: python -m Engine.routes, run from App/
+if __name__ == "__main__":
+    registry.load_all()
+    print(registry.import_report())
@@ -0,0 +1,291 @@
+# Imports
+import heapq
+import itertools
+import re
+import threading
+from bisect import bisect_left, insort
+from Storage.skills import SKILLS
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+MAX_EXPANSIONS = 64  # Vocabulary tokens considered per prefix / typo lookup
+EXACT, PREFIX, FUZZY = 3.0, 2.0, 1.0
+TITLE = 1.5  # A match in the title counts this much more than one in the description
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+# Between PREFIX and EXACT, higher the more of the token is typed, so a prefix always beats a typo match
+def prefix_score(term, token):
+    return PREFIX + (EXACT - PREFIX) * len(term) / len(token)
+
+def deletions(token):
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+# Damerau-Levenshtein distance <= 1 without building the full matrix
+def within_one_edit(a, b):
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:] or (a[i:i + 2] == b[i:i + 2][::-1] and a[i + 2:] == b[i + 2:])
+    return a[i:] == b[i + 1:]
+
+class SearchResult:
+    __slots__ = ("key", "kind", "title", "score")
+
+    def __init__(self, key, kind, title, score):
+        self.key = key
+        self.kind = kind
+        self.title = title
+        self.score = score
+
+    def __repr__(self):
+        return f"SearchResult({self.key!r}, {self.title!r}, {self.score:.2f})"
+
+class SearchIndex:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.ready = False
+        self._docs = {}  # key -> (kind, title, tokens, title tokens, seq)
+        self._keys = {}  # seq -> key
+        self._seq = itertools.count()
+        self._postings = {}  # token -> set of keys
+        self._ranked = {}  # token -> [(-weight, len(title), seq)] sorted best first; built on first use, then kept in step
+        self._vocabulary = []  # sorted tokens, for prefix range scans
+        self._deletes = {}  # single-character deletion -> tokens, for typo matches
+
+    # Where a document sits in a token's ranked postings: title matches first, then shorter titles
+    @staticmethod
+    def _entry(doc, token):
+        return (-TITLE if token in doc[3] else -1.0, len(doc[1]), doc[4])
+
+    # Add or re-index a document; only the tokens that changed (or moved in their ranking) touch the index
+    def add(self, key, kind, title, text=""):
+        title_tokens = frozenset(tokenize(title))
+        tokens = title_tokens | frozenset(tokenize(text))
+        with self.lock:
+            old = self._docs.get(key)
+            doc = (kind, title, tokens, title_tokens, old[4] if old else next(self._seq))
+            moved = set()
+            if old:
+                for token in old[2]:
+                    if token not in tokens or self._entry(old, token) != self._entry(doc, token):
+                        self._unlink(key, token, self._entry(old, token))
+                        moved.add(token)
+            for token in tokens:
+                if old is None or token in moved or token not in old[2]:
+                    self._link(key, token, self._entry(doc, token))
+            self._docs[key] = doc
+            self._keys[doc[4]] = key
+
+    def remove(self, key):
+        with self.lock:
+            doc = self._docs.pop(key, None)
+            if doc:
+                del self._keys[doc[4]]
+                for token in doc[2]:
+                    self._unlink(key, token, self._entry(doc, token))
+
+    def _link(self, key, token, entry):
+        keys = self._postings.get(token)
+        if keys is None:
+            keys = self._postings[token] = set()
+            insort(self._vocabulary, token)
+            for variant in deletions(token):
+                self._deletes.setdefault(variant, set()).add(token)
+        keys.add(key)
+        ranked = self._ranked.get(token)
+        if ranked is not None:
+            insort(ranked, entry)
+
+    def _unlink(self, key, token, entry):
+        keys = self._postings.get(token)
+        if keys is None:
+            return
+        keys.discard(key)
+        ranked = self._ranked.get(token)
+        if ranked is not None:
+            i = bisect_left(ranked, entry)
+            if i < len(ranked) and ranked[i] == entry:
+                del ranked[i]
+        if not keys:
+            del self._postings[token]
+            self._ranked.pop(token, None)
+            del self._vocabulary[bisect_left(self._vocabulary, token)]
+            for variant in deletions(token):
+                tokens = self._deletes.get(variant)
+                if tokens:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._deletes[variant]
+
+    def _rank(self, token):
+        ranked = self._ranked.get(token)
+        if ranked is None:
+            ranked = self._ranked[token] = sorted(self._entry(self._docs[key], token) for key in self._postings[token])
+        return ranked
+
+    # Sort every token's postings now (e.g. on the loader after a rebuild) rather than on a first query on the loop
+    def rank_all(self):
+        for token in list(self._postings):
+            with self.lock:
+                if token in self._postings:
+                    self._rank(token)
+
+    # Vocabulary tokens matching a query term, with their match score; limit=None takes every prefix match
+    def _expand(self, term, prefix, limit=MAX_EXPANSIONS):
+        matches = {}
+        if term in self._postings:
+            matches[term] = EXACT
+        if prefix and (len(term) >= 2 or limit is None):
+            start = bisect_left(self._vocabulary, term)
+            for token in self._vocabulary[start:start + limit if limit else None]:
+                if not token.startswith(term):
+                    break
+                matches.setdefault(token, prefix_score(term, token))
+        if len(term) >= 4:
+            candidates = set(self._deletes.get(term, ()))
+            for variant in deletions(term):
+                if variant in self._postings:
+                    candidates.add(variant)
+                candidates.update(self._deletes.get(variant, ()))
+            for token in list(candidates)[:MAX_EXPANSIONS]:
+                if token not in matches and within_one_edit(term, token):
+                    matches[token] = FUZZY
+        return matches
+
+    # A term's best match among one document's tokens, title matches weighted up
+    @staticmethod
+    def _score(doc, matches):
+        best = 0.0
+        for token in doc[2]:
+            score = matches.get(token)
+            if score and score * TITLE > best:
+                best = score * TITLE if token in doc[3] else max(best, score)
+        return best
+
+    # One term's matching documents, best first, as (score for this term, seq).
+    # Title and description matches are two best-first runs merged lazily, so reading the head costs little
+    def _stream(self, matches):
+        tokens = sorted(matches.items(), key=lambda match: match[1], reverse=True)
+        return heapq.merge(self._run(tokens, True), self._run(tokens, False), key=lambda item: item[0], reverse=True)
+
+    def _run(self, tokens, title):
+        for token, score in tokens:
+            ranked = self._rank(token)
+            split = bisect_left(ranked, (-1.0,))
+            value = score * TITLE if title else score
+            for i in range(0, split) if title else range(split, len(ranked)):
+                yield value, ranked[i][2]
+
+    # Ranked top-k; every query term must match (the last one as a prefix).
+    # Each term's documents are read best first, in turn, and the scan stops once nothing unread can beat
+    # the k-th result, so a common term costs about k documents rather than its whole posting list.
+    def search(self, query, k=10, kinds=None):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self.lock:
+            # A lone character would match half the vocabulary; after other words it is read only as far as they need
+            expanded = [
+                self._expand(term, position == len(terms) - 1, None if position and len(term) < 2 else MAX_EXPANSIONS)
+                for position, term in enumerate(terms)
+            ]
+            if not all(expanded):
+                return []
+            streams = [self._stream(matches) for matches in expanded]
+            heads = [next(stream) for stream in streams]
+            docs, keys = self._docs, self._keys
+            top = []  # heap of (score, -len(title), seq), worst first
+            seen = set()
+            # A term whose stream has run out has shown every document it matches, so nothing unseen can match all terms
+            while all(heads):
+                if len(top) == k and top[0][0] >= sum(head[0] for head in heads):
+                    break
+                for i, stream in enumerate(streams):
+                    seq = heads[i][1]
+                    heads[i] = next(stream, None)
+                    if seq in seen:
+                        continue
+                    seen.add(seq)
+                    doc = docs[keys[seq]]
+                    if kinds and doc[0] not in kinds:
+                        continue
+                    score = 0.0
+                    for matches in expanded:
+                        term_score = self._score(doc, matches)
+                        if not term_score:
+                            break
+                        score += term_score
+                    else:
+                        # Within one term's stream titles come shortest first, so equal scores keep the shorter
+                        item = (score, -len(doc[1]), seq)
+                        if len(top) < k:
+                            heapq.heappush(top, item)
+                        elif item > top[0]:
+                            heapq.heapreplace(top, item)
+            return [SearchResult(keys[seq], docs[keys[seq]][0], docs[keys[seq]][1], score) for score, _, seq in sorted(top, reverse=True)]
+
+    def index_activity(self, activity):
+        self.add(("activity", activity.id), activity.kind, activity.title, f"{activity.skill or ''} {activity.notes}")
+
+    # Keep the index in step with ActivityStore change events
+    def on_store_change(self, event, old, new):
+        if event == "delete":
+            self.remove(("activity", old.id))
+        else:
+            self.index_activity(new)
+
+    def rebuild(self, store):
+        for name, description in SKILLS:
+            self.add(("skill", name), "skill", name, description)
+        for activity in store.iter_all():
+            self.index_activity(activity)
+        self.rank_all()
+        self.ready = True
+
+    # Build from the store on a daemon thread so the first paint isn't blocked
+    # On the given executor (e.g. the app loader's pool), otherwise on a thread of its own
+    def rebuild_async(self, store, executor=None):
+        if executor is not None:
+            return executor.submit(self.rebuild, store)
+        thread = threading.Thread(target=self.rebuild, args=(store,), name="search-rebuild", daemon=True)
+        thread.start()
+        return thread
+
+class Debouncer:
+    # Runs on the given event loop (e.g. page.loop); with no running loop every call runs straight away
+    def __init__(self, delay, callback, loop=None):
+        self.delay = delay
+        self.callback = callback
+        self.loop = loop
+        self._handle = None
+
+    # Restart the countdown; only the last call within `delay` seconds runs. Safe to call from any thread
+    def __call__(self, *args):
+        if self.loop is None or not self.loop.is_running():
+            self.callback(*args)
+            return
+        self.loop.call_soon_threadsafe(self._restart, args)
+
+    def _restart(self, args):
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = self.loop.call_later(self.delay, self.callback, *args)
+
+    def cancel(self):
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self._cancel)
+        else:
+            self._cancel()
+
+    def _cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
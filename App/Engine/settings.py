@@ -1,6 +1,7 @@
 # App Configuration File
 
 # Imports
+import os
 import flet as ft
 
 class Device:
@@ -27,6 +28,49 @@ class Config:
 	APP_SPACING = ft.Padding(left=25, right=25, top=0, bottom=0)
 	PAD_25L = ft.Padding(left=25, right=0, top=0, bottom=0)
 	PAD_LR =ft.Padding(left=10, right=10, top=0, bottom=0)
+	VIEW_CACHE_SIZE = 8  # Max built route views kept alive for reuse
+	VIEW_CACHE_CONTROLS = 3000  # Max controls across those views; the least recent are dropped first
+	DATA_DIR = os.getenv("FLET_APP_STORAGE_DATA") or os.path.join(os.path.expanduser("~"), ".momentum")  # Local databases
+	PAGE_SIZE = 50  # Rows fetched per store query
+	RECURRENCE_CACHE = 16  # Expanded date ranges of recurring activities kept for reuse
+	FOCUS_MINUTES = 25  # Focus timer intervals
+	BREAK_MINUTES = 5
+	FOCUS_ROUNDS = 4
+	FOCUS_MIN_LOG = 60  # Seconds of focus before an abandoned session is logged
+	SESSION_SYNC_BATCH = 8  # Focus sessions appended between fsyncs of the session log
+	SESSION_INDEX_STRIDE = 256  # Records per sparse time-index entry
+	LEVEL_SIZE = 20  # Completed activities per level
+	ROLLUP_BUCKETS = {"day": 14, "week": 12, "month": 12, "year": 5}  # Buckets per skills chart
+	ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+	IMAGE_CACHE_BYTES = 32 * 1024 * 1024  # Disk budget for downloaded thumbnails
+	METRICS_ENABLED = os.getenv("MOMENTUM_METRICS") == "1"  # Opt-in render/update timing
+	METRICS_SAMPLES = 256  # Samples kept per metric
+	METRICS_LOG_INTERVAL = 30  # Seconds between logged summaries
+	MEMORY_TRACKING = os.getenv("MOMENTUM_MEMORY") == "1"  # Opt-in live view accounting and leak checks
+	MEMORY_LEAK_GRACE = 60  # Seconds a dropped view may stay reachable before it is reported
+	MEMORY_CHECK_INTERVAL = 300  # Seconds between leak checks
+	LOADER_WORKERS = 4  # Threads for store queries, downloads and other blocking work
+	AUTH_URL = os.getenv("MOMENTUM_AUTH_URL")  # Auth server; unset uses the in-process local backend
+	AUTH_USER = os.getenv("MOMENTUM_AUTH_USER")  # Credentials for the dev auth server
+	AUTH_PASSWORD = os.getenv("MOMENTUM_AUTH_PASSWORD", "")
+	AUTH_DEV_PORT = 8765  # Port for python -m User.devserver
+	PROFILE_TTL = 15 * 60  # Seconds a cached profile is shown before it is refetched
+	HTTP_POOL_SIZE = 4  # Idle keep-alive connections kept per host
+	NOTIFICATION_HISTORY = 50  # Read notifications kept for the bell sheet
+	BADGE_INTERVAL = 1.0  # Minimum seconds between notification badge redraws
+	REMINDER_HOUR = 9  # Local hour an open activity's reminder fires on its day
+	REMINDER_RESOLUTION = 1.0  # Seconds per reminder timer-wheel tick
+	SYNC_URL = os.getenv("MOMENTUM_SYNC_URL")  # Sync server; unset keeps changes in the local log only
+	SYNC_DEV_PORT = 8766  # Port for python -m Storage.syncserver
+	SYNC_BATCH = 200  # Changes pushed per request
+	SYNC_DELAY = 2.0  # Seconds to gather edits into one batch before pushing
+	SYNC_INTERVAL = 60  # Seconds between pulls when idle
+	SYNC_BACKOFF_MAX = 300  # Longest wait between retries while offline
+	SYNC_COMPACT = 1000  # Pending log entries before they are folded to one per activity
+	RECOMMENDATIONS = 3  # Recommended tasks shown on the home page
+	BREAKPOINTS = (("mobile", 0), ("tablet", 600), ("web", 1024), ("desktop", 1600))  # Device profile by min client width
+	RESIZE_INTERVAL = 0.25  # Minimum seconds between breakpoint checks while resizing
+	CONTENT_MAX_WIDTH = 960  # Content column width cap on wider layouts
 
 	@staticmethod
 	def get_device_dimensions(device_type):
@@ -41,8 +85,8 @@ class Config:
 		else:
 			raise ValueError("Invalid device type")
 
-	# Initialize DEVICE after defining the method
-	DEVICE = get_device_dimensions("mobile")
+	# Initial desktop window; the layout engine follows the real size from there
+	DEVICE = get_device_dimensions(os.getenv("MOMENTUM_DEVICE", "mobile"))
 	APP_WIDTH = DEVICE["app_width"]
 	APP_HEIGHT = DEVICE["app_height"]
 	APP_RESIZABLE = DEVICE["app_resizable"]
@@ -1,30 +1,105 @@
 # Themes Setting File
+import weakref
 
 class Theme:
-    def __init__(self, bgcolor, text_color, indicator_color, nav_bgcolor, accent_color):
-        self.bgcolor = bgcolor
-        self.text_color = text_color
-        self.indicator_color = indicator_color
-        self.nav_bgcolor = nav_bgcolor
-        self.accent_color = accent_color
+    # Themes are interned and immutable, so `is`/`==` on them is an identity check
+    __slots__ = ("name", "bgcolor", "text_color", "indicator_color", "nav_bgcolor", "accent_color")
+    TOKENS = ("bgcolor", "text_color", "indicator_color", "nav_bgcolor", "accent_color")
+
+    def __init__(self, name, bgcolor, text_color, indicator_color, nav_bgcolor, accent_color):
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "bgcolor", bgcolor)
+        object.__setattr__(self, "text_color", text_color)
+        object.__setattr__(self, "indicator_color", indicator_color)
+        object.__setattr__(self, "nav_bgcolor", nav_bgcolor)
+        object.__setattr__(self, "accent_color", accent_color)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Theme objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Theme objects are immutable")
+
+    def __repr__(self):
+        return f"Theme({self.name!r})"
 
 class ThemeFactory:
-    @staticmethod
-    def light_theme():
-        return Theme(
+    _themes = {
+        "light": Theme(
+            name="light",
             bgcolor="#FFFFFF",  # White background
             text_color="#000000",  # Black text
             accent_color="#008000",  # Green accent color
             indicator_color="#000000",  # Black indicator
             nav_bgcolor="#000000",  # White BG
-        )
-
-    @staticmethod
-    def dark_theme():
-        return Theme(
+        ),
+        "dark": Theme(
+            name="dark",
             bgcolor="#121212",  # Dark background
             text_color="#FFFFFF",  # White text
             accent_color="#00FF00",  # Bright green accent color for dark theme
             indicator_color="#4D4D4D",  # Dark gray indicator
             nav_bgcolor="#1a1a1a",  # Dark navigation bar
-        )
\ No newline at end of file
+        ),
+    }
+
+    @staticmethod
+    def light_theme():
+        return ThemeFactory._themes["light"]
+
+    @staticmethod
+    def dark_theme():
+        return ThemeFactory._themes["dark"]
+
+    # Accepts a Theme or a theme name; unknown names fall back to the light theme
+    @staticmethod
+    def resolve(theme):
+        if isinstance(theme, Theme):
+            return theme
+        return ThemeFactory._themes.get(theme, ThemeFactory._themes["light"])
+
+    @staticmethod
+    def toggled(theme):
+        return ThemeFactory.light_theme() if ThemeFactory.resolve(theme) is ThemeFactory.dark_theme() else ThemeFactory.dark_theme()
+
+class ThemeBinder:
+    def __init__(self, theme):
+        self.theme = ThemeFactory.resolve(theme)
+        self._bindings = []  # (weakref to control, {attr: token})
+        self._limit = 256  # Dead entries are swept when the list reaches this, not only on a theme switch
+
+    # Set control attributes from theme tokens and remember them for later switches
+    def bind(self, control, **tokens):
+        for attr, token in tokens.items():
+            setattr(control, attr, getattr(self.theme, token))
+        self._bindings.append((weakref.ref(control), tokens))
+        if len(self._bindings) >= self._limit:
+            self.prune()
+        return control
+
+    def prune(self):
+        self._bindings = [(ref, tokens) for ref, tokens in self._bindings if ref() is not None]
+        self._limit = max(256, 2 * len(self._bindings))
+
+    # Patch only the bound attributes whose token value differs; returns the patched controls
+    def switch(self, theme):
+        old, self.theme = self.theme, ThemeFactory.resolve(theme)
+        if self.theme is old:
+            return []
+        changed = {token for token in Theme.TOKENS if getattr(old, token) != getattr(self.theme, token)}
+        patched = []
+        alive = []
+        for ref, tokens in self._bindings:
+            control = ref()
+            if control is None:
+                continue
+            alive.append((ref, tokens))
+            touched = False
+            for attr, token in tokens.items():
+                if token in changed:
+                    setattr(control, attr, getattr(self.theme, token))
+                    touched = True
+            if touched:
+                patched.append(control)
+        self._bindings = alive
+        return patched
@@ -0,0 +1,320 @@
+# Imports
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+import time
+
+IDLE, RUNNING, PAUSED, FINISHED = "idle", "running", "paused", "finished"
+
+class FocusTimer:
+    # phases is a list of (label, seconds), e.g. [("Focus", 1500), ("Break", 300)]
+    def __init__(self, phases, on_tick=None, on_phase=None, on_finish=None, tick=1.0):
+        self.phases = list(phases)
+        self.on_tick = on_tick
+        self.on_phase = on_phase
+        self.on_finish = on_finish
+        self.tick = tick
+        self.scheduler = None
+        self.reset()
+
+    def reset(self):
+        if self.scheduler is not None:
+            self.scheduler.cancel(self)
+        self.state = IDLE
+        self.phase_index = 0
+        self.phase_start = None  # monotonic time the current phase began (shifted on resume)
+        self.paused_elapsed = 0.0
+
+    @property
+    def label(self):
+        return self.phases[min(self.phase_index, len(self.phases) - 1)][0]
+
+    @property
+    def duration(self):
+        return self.phases[min(self.phase_index, len(self.phases) - 1)][1]
+
+    def elapsed(self, now=None):
+        if self.state == RUNNING:
+            return (now or time.monotonic()) - self.phase_start
+        if self.state == FINISHED:
+            return self.duration
+        return self.paused_elapsed
+
+    def remaining(self, now=None):
+        return max(0.0, self.duration - self.elapsed(now))
+
+    def progress(self, now=None):
+        return min(1.0, self.elapsed(now) / self.duration) if self.duration else 1.0
+
+    def start(self, scheduler):
+        if self.state == FINISHED:
+            self.reset()
+        if self.state == IDLE:
+            self.scheduler = scheduler
+            self.paused_elapsed = 0.0
+        self.resume()
+
+    def pause(self):
+        if self.state != RUNNING:
+            return
+        self.paused_elapsed = time.monotonic() - self.phase_start
+        self.state = PAUSED
+        self.scheduler.cancel(self)
+
+    def resume(self):
+        if self.state not in (IDLE, PAUSED):
+            return
+        self.phase_start = time.monotonic() - self.paused_elapsed
+        self.state = RUNNING
+        self.scheduler.schedule(self, self.next_deadline(time.monotonic()))
+
+    # Ticks land on phase_start + n * tick, so late wake-ups never accumulate drift
+    def next_deadline(self, now):
+        elapsed = now - self.phase_start
+        boundary = self.phase_start + (math.floor(elapsed / self.tick) + 1) * self.tick
+        return min(boundary, self.phase_start + self.duration)
+
+    # Called by the scheduler; returns the next deadline or None when done
+    def fire(self, now):
+        while self.state == RUNNING and now - self.phase_start >= self.duration:
+            self.phase_start += self.duration
+            self.phase_index += 1
+            if self.phase_index >= len(self.phases):
+                self.phase_index = len(self.phases) - 1
+                self.state = FINISHED
+                if self.on_finish:
+                    self.on_finish(self)
+                return None
+            if self.on_phase:
+                self.on_phase(self)
+        if self.on_tick:
+            self.on_tick(self)
+        return self.next_deadline(now)
+
+class TimerScheduler:
+    def __init__(self):
+        self._heap = []  # (deadline, sequence, timer)
+        self._active = {}  # timer -> sequence of its live heap entry; older entries are skipped
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._wake = None
+        self.running = False
+
+    def schedule(self, timer, deadline):
+        with self._lock:
+            sequence = next(self._counter)
+            self._active[timer] = sequence
+            heapq.heappush(self._heap, (deadline, sequence, timer))
+        self._notify()
+
+    def cancel(self, timer):
+        with self._lock:
+            self._active.pop(timer, None)
+
+    def _notify(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def _next_deadline(self):
+        with self._lock:
+            while self._heap and self._active.get(self._heap[0][2]) != self._heap[0][1]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def _pop_due(self, now):
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, sequence, timer = heapq.heappop(self._heap)
+                if self._active.get(timer) == sequence:
+                    del self._active[timer]
+                    due.append(timer)
+        return due
+
+    # One task drives every timer; with nothing scheduled it just awaits the wake event
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self.running = True
+        try:
+            while True:
+                self._wake.clear()
+                deadline = self._next_deadline()
+                if deadline is None:
+                    await self._wake.wait()
+                    continue
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), delay)
+                        continue
+                    except asyncio.TimeoutError:
+                        pass
+                now = time.monotonic()
+                for timer in self._pop_due(now):
+                    following = timer.fire(now)
+                    if following is not None:
+                        self.schedule(timer, following)
+        finally:
+            self.running = False
+            self._loop = None
+
+    # Start the scheduler on the flet page's event loop
+    def start(self, page):
+        if not self.running:
+            self.running = True
+            page.run_task(self.run)
+
+class TimerWheel:
+    # Hierarchical timing wheel: level k has SLOTS slots of SLOTS**k ticks, so add and cancel are O(1) at any size.
+    # An entry sits on the lowest level whose span it shares with the current tick and moves down when that span starts;
+    # entries past the top level wait in an overflow list until the top span they fall in comes around.
+    SLOTS = 64
+    LEVELS = 4  # With one-second ticks the levels cover about 194 days
+
+    def __init__(self, resolution=1.0, now=None):
+        self.resolution = resolution
+        self.current = self._tick(time.time() if now is None else now)
+        self.slots = [[{} for _ in range(self.SLOTS)] for _ in range(self.LEVELS)] + [[{}]]
+        self.occupied = [0] * self.LEVELS  # Bit s set while slot s of a level holds entries
+        self.where = {}  # key -> (level, slot, tick)
+        self.bits = self.SLOTS.bit_length() - 1
+
+    def _tick(self, when):
+        return math.ceil(when / self.resolution)
+
+    def __len__(self):
+        return len(self.where)
+
+    def __contains__(self, key):
+        return key in self.where
+
+    # Adding an existing key moves it; anything already due fires on the next expire
+    def add(self, key, when, item=None):
+        self.cancel(key)
+        self._place(key, max(self._tick(when), self.current), item)
+
+    def _place(self, key, tick, item):
+        level = 0
+        while level < self.LEVELS and tick >> (self.bits * (level + 1)) != self.current >> (self.bits * (level + 1)):
+            level += 1
+        slot = (tick >> (self.bits * level)) & (self.SLOTS - 1) if level < self.LEVELS else 0
+        self.slots[level][slot][key] = (tick, item)
+        if level < self.LEVELS:
+            self.occupied[level] |= 1 << slot
+        self.where[key] = (level, slot, tick)
+
+    def cancel(self, key):
+        place = self.where.pop(key, None)
+        if place is None:
+            return False
+        level, slot, _ = place
+        entries = self.slots[level][slot]
+        del entries[key]
+        if not entries and level < self.LEVELS:
+            self.occupied[level] &= ~(1 << slot)
+        return True
+
+    def get(self, key):
+        place = self.where.get(key)
+        if place is None:
+            return None
+        level, slot, tick = place
+        return tick * self.resolution, self.slots[level][slot][key][1]
+
+    # The next tick something happens: the earliest entry on level 0, otherwise the start of the span to cascade
+    def _next_tick(self):
+        for level, mask in enumerate(self.occupied):
+            if mask:
+                slot = (mask & -mask).bit_length() - 1
+                span = self.bits * (level + 1)
+                return (self.current >> span << span) + (slot << (self.bits * level))
+        if self.slots[self.LEVELS][0]:
+            span = self.bits * self.LEVELS
+            return ((self.current >> span) + 1) << span
+        return None
+
+    # Wall time to wake up at, or None while empty; a wake-up may only move entries down a level
+    def next_due(self):
+        tick = self._next_tick()
+        return None if tick is None else tick * self.resolution
+
+    # Pop every (key, item) due by `now` in due order, skipping empty stretches of time in one step
+    def expire(self, now=None):
+        target = math.floor((time.time() if now is None else now) / self.resolution)
+        due = []
+        while True:
+            tick = self._next_tick()
+            if tick is None or tick > target:
+                self.current = max(self.current, target)
+                return due
+            self.current = tick
+            level = next((level for level, mask in enumerate(self.occupied) if mask), self.LEVELS)
+            slot = (tick >> (self.bits * level)) & (self.SLOTS - 1) if level < self.LEVELS else 0
+            entries, self.slots[level][slot] = self.slots[level][slot], {}
+            if level < self.LEVELS:
+                self.occupied[level] &= ~(1 << slot)
+            for key, (entry_tick, item) in entries.items():
+                del self.where[key]
+                if level == 0:
+                    due.append((key, item))
+                else:
+                    self._place(key, entry_tick, item)
+
+class Throttle:
+    # Runs callback at most once per interval; calls in between fold into one trailing run.
+    # Runs happen on the given event loop (e.g. page.loop); with no running loop each call runs straight away
+    def __init__(self, interval, callback, loop=None):
+        self.interval = interval
+        self.callback = callback
+        self.loop = loop
+        self.last = 0.0
+        self.runs = 0
+        self.skipped = 0
+        self._pending = False
+        self._handle = None
+        self._lock = threading.Lock()
+
+    # Safe to call from any thread
+    def __call__(self):
+        with self._lock:
+            if self._pending:
+                self.skipped += 1
+                return
+            self._pending = True
+        if self.loop is None or not self.loop.is_running():
+            self._fire()
+        else:
+            self.loop.call_soon_threadsafe(self._arm)
+
+    # On the loop: run now, or once the interval since the last run is up
+    def _arm(self):
+        wait = self.last + self.interval - time.monotonic()
+        if wait > 0:
+            self._handle = self.loop.call_later(wait, self._fire)
+        else:
+            self._fire()
+
+    def _fire(self):
+        with self._lock:
+            self._pending = False
+            self._handle = None
+            self.last = time.monotonic()
+        self.runs += 1
+        self.callback()
+
+    def cancel(self):
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self._cancel)
+        else:
+            self._cancel()
+
+    def _cancel(self):
+        with self._lock:
+            if self._handle is not None:
+                self._handle.cancel()
+                self._handle = None
+                self._pending = False
@@ -0,0 +1,147 @@
+# Imports
+import threading
+import weakref
+from contextlib import contextmanager
+from Engine.metrics import metrics
+
+class UpdateScheduler:
+    _pages = weakref.WeakKeyDictionary()
+
+    def __init__(self, page):
+        self.page = page
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self._dirty = {}  # id -> control, in request order
+        self._full = False
+        self._scheduled = False
+        self.requests = 0
+        self.flushes = 0
+        self.dropped = 0  # Requests folded into another flush
+        self.controls_dropped = 0  # Controls already covered by a full update or a dirty ancestor
+
+    # One scheduler per page, created on first use
+    @classmethod
+    def of(cls, page):
+        scheduler = cls._pages.get(page)
+        if scheduler is None:
+            scheduler = cls._pages[page] = cls(page)
+        return scheduler
+
+    # Mark controls dirty (no controls = the whole page); the diff is sent once per handler or loop tick
+    def request(self, *controls):
+        with self.lock:
+            self.requests += 1
+            if controls:
+                for control in controls:
+                    self._dirty[id(control)] = control
+            else:
+                self._full = True
+            if self._scheduled:
+                self.dropped += 1
+                metrics.count("updates dropped")
+                return
+            self._scheduled = True
+        if getattr(self.local, "depth", 0):
+            return  # The enclosing batch flushes on exit
+        loop = getattr(self.page, "loop", None)
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self.flush)
+        else:
+            self.flush()
+
+    # Send everything pending now; also the escape hatch for updates that cannot wait
+    def flush(self):
+        with self.lock:
+            dirty, full = self._dirty, self._full
+            self._dirty, self._full, self._scheduled = {}, False, False
+        if not dirty and not full:
+            return
+        self.flushes += 1
+        controls = self._roots(dirty, full)
+        self.controls_dropped += len(dirty) - len(controls)
+        if full:
+            controls.insert(0, self.page)
+        if controls:
+            self.page.update(*controls)
+
+    # Drop unmounted controls and those a dirty ancestor's diff already covers (the page's, when full).
+    # A diff stops at isolated controls (see ViewFrame), so nothing above one covers what is inside it.
+    @staticmethod
+    def _roots(dirty, full=False):
+        roots = []
+        for control in dirty.values():
+            if control.page is None:
+                continue
+            node, covered = control, False
+            while not covered and not node.is_isolated() and node.parent is not None:
+                node = node.parent
+                covered = id(node) in dirty
+            if not covered and not (full and node.parent is None and not node.is_isolated()):
+                roots.append(control)
+        return roots
+
+    # Requests inside the block are sent as one diff when the outermost block exits
+    @contextmanager
+    def batch(self):
+        self.local.depth = getattr(self.local, "depth", 0) + 1
+        try:
+            yield self
+        finally:
+            self.local.depth -= 1
+            if not self.local.depth:
+                self.flush()
+
+    # Wrap an event handler so everything it touches goes out in one update
+    def handler(self, function):
+        def wrapper(*args, **kwargs):
+            with self.batch():
+                return function(*args, **kwargs)
+        return wrapper
+
+    def pending(self):
+        return self._scheduled
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "flushes": self.flushes,
+            "dropped": self.dropped,
+            "controls_dropped": self.controls_dropped,
+        }
+
+class Bindings:
+    # (weakref to control, render) pairs, like ThemeBinder, so views dropped from the caches stop being rendered
+    def __init__(self):
+        self._bindings = []
+        self._limit = 64  # Dead entries are swept when the list reaches this, so it stays bounded between renders
+
+    def add(self, control, render):
+        self._bindings.append((weakref.ref(control), render))
+        if len(self._bindings) >= self._limit:
+            self.prune()
+        return control
+
+    def prune(self):
+        self._bindings = [(ref, render) for ref, render in self._bindings if ref() is not None]
+        self._limit = max(64, 2 * len(self._bindings))
+
+    # render(control, *args) for every live control, then one coalesced update for all of them
+    def render(self, *args):
+        rendered = []
+        alive = []
+        for ref, render in self._bindings:
+            control = ref()
+            if control is None:
+                continue
+            alive.append((ref, render))
+            render(control, *args)
+            rendered.append(control)
+        self._bindings = alive
+        request_update(*rendered)
+
+# Queue an update for controls on whichever page they are mounted on
+def request_update(*controls):
+    for control in controls:
+        if control.page is not None:
+            UpdateScheduler.of(control.page).request(*controls)
+            return
@@ -1,19 +1,143 @@
+import heapq
 import flet as ft
-from Engine.themes import ThemeFactory
+from datetime import date, timedelta
+from Engine.themes import ThemeFactory, ThemeBinder
+from Engine.settings import Config as cogs
+from Storage.activities import ActivityStore
+from Components.lists import VirtualList
+from Components.factory import Styles
+from Engine.updates import request_update
+
+KIND_ICONS = {
+    "task": ft.Icons.CHECK_CIRCLE_OUTLINE,
+    "event": ft.Icons.EVENT,
+    "workout": ft.Icons.FITNESS_CENTER,
+}
+ROW_HEIGHT = 50
+ROW_GAP = 10
 
 class ActivitiesPage:
-    def __init__(self, current_theme):
-        self.current_theme = ThemeFactory.dark_theme() if current_theme == "dark" else ThemeFactory.light_theme()
+    # With loads (a LoadScope) every store query runs in the background and skeleton rows show meanwhile
+    def __init__(self, current_theme, binder=None, activity_id=None, store=None, loads=None, schedule=None):
+        self.current_theme = ThemeFactory.resolve(current_theme)
+        self.binder = binder or ThemeBinder(self.current_theme)
+        self.activity_id = activity_id
+        self.store = store or ActivityStore.default()
+        # The week of a requested activity needs a lookup, so the first fetch resolves it
+        self.week_start = None if str(activity_id).isdigit() else self.week_of(date.today())
+        self.week_label = None
+        self.schedule = schedule  # Recurring rules (a Schedule); their occurrences are merged into the stored rows
+        # Items fetched so far -> (store keyset cursor, occurrences of the week not shown yet) to carry on from there
+        self.resume = {0: (None, None)}
+        self.list = VirtualList(
+            self.fetch,
+            self.build_row,
+            self.bind_row,
+            item_extent=ROW_HEIGHT + ROW_GAP,
+            chunk_size=cogs.PAGE_SIZE // 2,
+            empty=ft.Text("Nothing planned this week.", size=12, color=ft.Colors.GREY_400),
+            loader=loads,
+            skeleton=self.build_skeleton,
+            on_loaded=self.show_week,
+        )
+
+    @staticmethod
+    def week_of(day):
+        return day - timedelta(days=day.weekday())
+
+    # Open on the week of the requested activity, otherwise the current week
+    def resolve_week(self):
+        focused = self.store.get(int(self.activity_id))
+        return self.week_of(date.fromisoformat(focused.day) if focused else date.today())
+
+    def week_text(self):
+        if self.week_start is None:
+            return ""
+        return f"{self.week_start:%b %d} - {self.week_start + timedelta(days=6):%b %d}"
+
+    def show_week(self, batch):
+        if self.week_label is not None and self.week_label.value != self.week_text():
+            self.week_label.value = self.week_text()
+            request_update(self.week_label)
+
+    # The store pages by keyset, so each page records where the one after it starts; offset 0, as after
+    # VirtualList.reset(), reads the week from the top again
+    def fetch(self, offset, limit):
+        if self.week_start is None:
+            self.week_start = self.resolve_week()
+        week_end = self.week_start + timedelta(days=6)
+        cursor, repeats = self.resume[offset]
+        result = self.store.range(self.week_start, week_end, limit=limit, after=cursor)
+        items = result.items
+        if self.schedule is not None:
+            if repeats is None:
+                repeats = list(self.schedule.between(self.week_start, week_end))
+            # Repeats past the page's last day wait for the next page, unless the store has nothing more
+            shown = len(repeats)
+            if result.has_more:
+                last = result.items[-1].day
+                shown = next((i for i, repeat in enumerate(repeats) if repeat.day >= last), shown)
+            items = list(heapq.merge(result.items, repeats[:shown], key=lambda activity: activity.day))
+            repeats = repeats[shown:]
+        self.resume[offset + len(items)] = (result.cursor, repeats)
+        return items
+
+    def build_row(self):
+        icon = ft.Icon(ft.Icons.CIRCLE_OUTLINED, size=20)
+        title = self.binder.bind(ft.Text(size=12, max_lines=1), color="text_color")
+        subtitle = ft.Text(size=10, color=ft.Colors.GREY_400)
+        return ft.Container(
+            content=ft.Row(
+                [
+                    icon,
+                    ft.Column([title, subtitle], spacing=2, expand=True),
+                ],
+                alignment=ft.MainAxisAlignment.START,
+            ),
+            data=(icon, title, subtitle),
+            height=ROW_HEIGHT,
+            margin=Styles.margin(bottom=ROW_GAP),
+            padding=Styles.padding(left=10, right=10, top=5, bottom=5),
+            bgcolor=ft.Colors.GREY_900,
+            border_radius=10,
+        )
+
+    def build_skeleton(self):
+        return ft.Container(
+            height=ROW_HEIGHT,
+            margin=Styles.margin(bottom=ROW_GAP),
+            bgcolor=ft.Colors.GREY_900,
+            border_radius=10,
+            opacity=0.5,
+        )
+
+    def bind_row(self, row, activity):
+        icon, title, subtitle = row.data
+        # Occurrences of a recurring rule are not stored rows, so they have no id
+        icon.name = KIND_ICONS.get(activity.kind, ft.Icons.CIRCLE_OUTLINED) if activity.id is not None else ft.Icons.REPEAT
+        icon.color = ft.Colors.GREEN if activity.status == "done" else ft.Colors.GREY_400
+        title.value = activity.title
+        subtitle.value = f"{activity.day}  {activity.skill or ''}"
+        if str(activity.id) == str(self.activity_id):
+            side = ft.BorderSide(1, ft.Colors.GREEN)
+            row.border = ft.Border(top=side, right=side, bottom=side, left=side)
+        else:
+            row.border = None
 
     def build(self):
+        rows = self.list.build()
+        self.week_label = ft.Text(self.week_text(), size=12, color=ft.Colors.GREY_400)
         return ft.Container(
             content=ft.Column(
                 [
-                    ft.Text("Activities Page", size=24, weight=ft.FontWeight.BOLD, color=self.current_theme.text_color),
-                    ft.Text("This is the Activities page of the app.", size=16, color=self.current_theme.text_color),
+                    self.binder.bind(ft.Text("Activities", size=24, weight=ft.FontWeight.BOLD), color="text_color"),
+                    self.week_label,
+                    rows,
                 ],
-                alignment=ft.MainAxisAlignment.CENTER,
+                alignment=ft.MainAxisAlignment.START,
                 spacing=10,
+                expand=True,
             ),
+            padding=cogs.APP_SPACING,
             expand=True,
-        )
\ No newline at end of file
+        )
@@ -1,19 +1,107 @@
+from datetime import date, timedelta
 import flet as ft
-from Engine.themes import ThemeFactory
+from Engine.themes import ThemeFactory, ThemeBinder
+from Engine.settings import Config as cogs
+from Engine.focus import FocusState
+from Storage.skills import SKILLS
+from Components.widgets import Widgets
+
+HISTORY_HEIGHT = 60  # Bar height for the busiest day shown
 
 class FocusPage:
-    def __init__(self, current_theme):
-        self.current_theme = ThemeFactory.dark_theme() if current_theme == "dark" else ThemeFactory.light_theme()
+    # Renders the app's FocusState; the page keeps no timer of its own, so rebuilding it never orphans one
+    def __init__(self, current_theme, binder=None, focus=None):
+        self.current_theme = ThemeFactory.resolve(current_theme)
+        self.binder = binder or ThemeBinder(self.current_theme)
+        self.focus = focus or FocusState()
+
+    @staticmethod
+    def format_clock(seconds):
+        minutes, seconds = divmod(int(round(seconds)), 60)
+        return f"{minutes:02d}:{seconds:02d}"
+
+    # Renders hold no reference to the page, so an evicted page is not kept alive by the app's state
+    @staticmethod
+    def show_clock(text, focus):
+        text.value = FocusPage.format_clock(focus.timer.remaining())
+
+    @staticmethod
+    def show_progress(ring, focus):
+        ring.value = focus.timer.progress()
+
+    @staticmethod
+    def show_phase(text, focus):
+        text.value = focus.timer.label
+
+    @staticmethod
+    def show_action(button, focus):
+        button.text = focus.action
+
+    @staticmethod
+    def show_streak(text, minutes, streak):
+        text.value = f"{streak}-day streak · {round(minutes[-1])} min today" if streak else f"{round(minutes[-1])} min today"
+
+    @staticmethod
+    def show_history(chart, minutes, streak):
+        Widgets.show_bars(chart, minutes, peak=cogs.FOCUS_MINUTES)
+
+    def create_history(self):
+        first = date.today() - timedelta(days=FocusState.HISTORY_DAYS - 1)
+        streak_text = self.focus.bind_history(self.binder.bind(ft.Text(size=12), color="text_color"), self.show_streak)
+        history = self.focus.bind_history(
+            Widgets.bar_chart(
+                [(first + timedelta(days=i)).strftime("%a")[0] for i in range(FocusState.HISTORY_DAYS)], self.binder, HISTORY_HEIGHT
+            ),
+            self.show_history,
+        )
+        return ft.Column(
+            [streak_text, history],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=6,
+        )
 
     def build(self):
+        focus = self.focus
+        clock_text = focus.bind(self.binder.bind(ft.Text(size=40, weight=ft.FontWeight.BOLD), color="text_color"), self.show_clock)
+        progress_ring = focus.bind(
+            self.binder.bind(
+                ft.ProgressRing(width=180, height=180, stroke_width=8, bgcolor=ft.Colors.GREY_800),
+                color="accent_color",
+            ),
+            self.show_progress,
+        )
         return ft.Container(
             content=ft.Column(
                 [
-                    ft.Text("Focus Page", size=24, weight=ft.FontWeight.BOLD, color=self.current_theme.text_color),
-                    ft.Text("This is the Focus page of the app.", size=16, color=self.current_theme.text_color),
+                    self.binder.bind(ft.Text("Focus", size=24, weight=ft.FontWeight.BOLD), color="text_color"),
+                    focus.bind(self.binder.bind(ft.Text(size=16), color="text_color"), self.show_phase),
+                    ft.Stack(
+                        [
+                            progress_ring,
+                            ft.Container(clock_text, alignment=ft.Alignment(0, 0), width=180, height=180),
+                        ],
+                    ),
+                    ft.Row(
+                        [
+                            # The handlers close over the app's state, not this page
+                            focus.bind(ft.TextButton(on_click=lambda e: focus.toggle(e.page)), self.show_action),
+                            ft.TextButton("Reset", on_click=lambda e: focus.reset()),
+                        ],
+                        alignment=ft.MainAxisAlignment.CENTER,
+                    ),
+                    ft.Dropdown(
+                        label="Skill",
+                        value=focus.skill,
+                        options=[ft.DropdownOption(name) for name, _ in SKILLS],
+                        on_change=lambda e: focus.select_skill(e.control.value),
+                        width=180,
+                        dense=True,
+                    ),
+                    *([self.create_history()] if focus.sessions is not None else []),
                 ],
                 alignment=ft.MainAxisAlignment.CENTER,
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                 spacing=10,
             ),
             expand=True,
-        )
\ No newline at end of file
+        )
@@ -1,18 +1,80 @@
 import flet as ft
-from Engine.themes import ThemeFactory
+from Engine.themes import ThemeFactory, ThemeBinder
 from Engine.settings import Config as cogs
-from Components.widgets import Widgets
+from Components.widgets import Widgets, KIND_ICONS
+from Components.factory import Factory, Styles
+from User.session import Session
+from Storage.skills import TASKS
+from Engine.recommend import Recommendation
+
+OVERVIEW_METRICS = [
+    ("tasks", "Tasks", ft.Colors.GREEN),
+    ("goals", "Goals", ft.Colors.BLUE),
+    ("levels", "Levels", ft.Colors.RED),
+]
+
+SKILL_TILES = ["Wellness", "Mental Health", "Career", "Fitness", "Habits"]
+
+SKILL_COLORS = {
+    "Wellness": ft.Colors.GREEN,
+    "Mental Health": ft.Colors.PURPLE,
+    "Career": ft.Colors.YELLOW,
+    "Fitness": ft.Colors.BLUE,
+    "Habits": ft.Colors.ORANGE,
+}
 
 class HomePage:
-    def __init__(self, page: ft.Page, navigation_bar, current_theme):
+    def __init__(self, page: ft.Page, navigation_bar, current_theme, binder=None, search=None, progress=None, images=None, session=None, recommender=None, app=None):
         self.page = page
+        self.app = app  # Navigation goes through app.navigate so the route and the new content go out together
         self.navigation_bar = navigation_bar
-        self.current_theme = ThemeFactory.dark_theme() if current_theme == "dark" else ThemeFactory.light_theme()
+        self.search = search
+        self.progress = progress
+        self.images = images
+        self.session = session or Session.default()
+        self.recommender = recommender
+        self.current_theme = ThemeFactory.resolve(current_theme)
+        self.binder = binder or ThemeBinder(self.current_theme)
 
     def add_widgets(self):
-        return Widgets.search_bar()
+        return Widgets.search_bar(self.search, self.open_search_result, getattr(self.page, "loop", None))
+
+    def open_search_result(self, key):
+        kind, value = key
+        self.app.navigate(f"/activities/{value}" if kind == "activity" else "/skills")
+
+    # Percent text and bar redraw only when the aggregate behind them changes
+    @staticmethod
+    def show_percent(percent, value):
+        percent.value = f"{round(value * 100)}%"
+
+    @staticmethod
+    def show_bar(bar, value):
+        bar.value = value
+
+    @staticmethod
+    def show_greeting(greeting, profile):
+        greeting.value = f"Hi, {profile.name.split()[0]}" if profile.id is not None else ""
 
     def create_daily_overview(self):
+        greeting = self.session.bind(ft.Text(color=ft.Colors.GREY_400, size=10), self.show_greeting)
+        labels = []
+        bars = []
+        for name, label, color in OVERVIEW_METRICS:
+            percent = ft.Text("0%", weight=ft.FontWeight.BOLD, size=8, color=color)
+            bar = ft.ProgressBar(
+                value=0,
+                bgcolor=ft.Colors.GREY_800,
+                color=color,
+                height=10,
+                width=150,
+                border_radius=10,
+            )
+            labels += [ft.Text(label, color=ft.Colors.GREY_400, size=10), percent]
+            bars.append(bar)
+            if self.progress is not None:
+                self.progress.bind(name, percent, self.show_percent)
+                self.progress.bind(name, bar, self.show_bar)
         return ft.Container(
             content=ft.Column(
                 [
@@ -24,50 +86,19 @@ class HomePage:
                                 color=ft.Colors.WHITE,
                                 size=14,
                             ),
+                            greeting,
                         ],
                         alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                     ),
                     ft.Row(
                         [
                             ft.Column(
-                                [
-                                    ft.Text("Tasks", color=ft.Colors.GREY_400, size=10),
-                                    ft.Text("50%", weight=ft.FontWeight.BOLD, size=8, color=ft.Colors.GREEN),
-                                    ft.Text("Goals", color=ft.Colors.GREY_400, size=10),
-                                    ft.Text("15%", weight=ft.FontWeight.BOLD, size=8, color=ft.Colors.BLUE),
-                                    ft.Text("Levels", color=ft.Colors.GREY_400, size=10),
-                                    ft.Text("5%", weight=ft.FontWeight.BOLD, size=8, color=ft.Colors.RED),
-                                ],
+                                labels,
                                 alignment=ft.MainAxisAlignment.START,
                                 spacing=5,
                             ),
                             ft.Column(
-                                [
-                                    ft.ProgressBar(
-                                        value=0.5,
-                                        bgcolor=ft.Colors.GREY_800,
-                                        color=ft.Colors.GREEN,
-                                        height=10,
-                                        width=150,
-                                        border_radius=10,
-                                    ),
-                                    ft.ProgressBar(
-                                        value=0.4,
-                                        bgcolor=ft.Colors.GREY_800,
-                                        color=ft.Colors.BLUE,
-                                        height=10,
-                                        width=150,
-                                        border_radius=10,
-                                    ),
-                                    ft.ProgressBar(
-                                        value=0.1,
-                                        bgcolor=ft.Colors.GREY_800,
-                                        color=ft.Colors.RED,
-                                        height=10,
-                                        width=150,
-                                        border_radius=10,
-                                    ),
-                                ],
+                                bars,
                                 alignment=ft.MainAxisAlignment.START,
                                 spacing=20,
                             ),
@@ -90,22 +121,24 @@ class HomePage:
                 [
                     ft.Row(
                         controls=[
-                            ft.Text(
-                                "Popular Skills",
-                                weight=ft.FontWeight.BOLD,
-                                color=self.current_theme.text_color,
-                                size=14,
+                            self.binder.bind(
+                                ft.Text(
+                                    "Popular Skills",
+                                    weight=ft.FontWeight.BOLD,
+                                    size=14,
+                                ),
+                                color="text_color",
                             ),
                             ft.TextButton(
                                 "View All",
-                                on_click=lambda e: [
-                                    setattr(self.navigation_bar, "selected_index", 3),
-                                    self.page.go("/skills"),
-                                ],
-                                style=ft.ButtonStyle(
-                                    color=self.current_theme.accent_color,
-                                    padding=cogs.PAD_LR,
-                                    text_style=ft.TextStyle(size=10),
+                                # route_change selects the tab
+                                on_click=lambda e: self.app.navigate("/skills"),
+                                style=self.binder.bind(
+                                    ft.ButtonStyle(
+                                        padding=cogs.PAD_LR,
+                                        text_style=Styles.text(size=10),
+                                    ),
+                                    color="accent_color",
                                 ),
                             ),
                         ],
@@ -113,53 +146,13 @@ class HomePage:
                     ),
                     ft.Row(
                         controls=[
-                            ft.Container(
-                                content=ft.Stack(
-                                    controls=[
-                                        ft.Image(
-                                            src=f"https://picsum.photos/200/200?0",
-                                            width=100,
-                                            height=75,
-                                            fit=ft.ImageFit.COVER,
-                                            border_radius=10,
-                                        ),
-                                        ft.Text(
-                                            "Wellness",
-                                            size=12,
-                                            color=ft.Colors.WHITE,
-                                            weight=ft.FontWeight.BOLD,
-                                            text_align=ft.TextAlign.CENTER,
-                                        ),
-                                    ],
-                                ),
-                                padding=cogs.PAD_25L,
-                            ),
-                            *[
-                                ft.Stack(
-                                    controls=[
-                                        ft.Image(
-                                            src=f"https://picsum.photos/200/200?{i}",
-                                            width=100,
-                                            height=75,
-                                            fit=ft.ImageFit.COVER,
-                                            border_radius=10,
-                                        ),
-                                        ft.Text(
-                                            skill_name,
-                                            size=12,
-                                            color=ft.Colors.WHITE,
-                                            weight=ft.FontWeight.BOLD,
-                                            text_align=ft.TextAlign.CENTER,
-                                        ),
-                                    ],
-                                )
-                                for i, skill_name in enumerate([
-                                    "Mental Health",
-                                    "Career",
-                                    "Fitness",
-                                    "Habits",
-                                ], start=1)
-                            ],
+                            Factory.image_tile(
+                                self.images,
+                                f"https://picsum.photos/200/200?{i}",
+                                skill_name,
+                                margin=Styles.margin(left=25) if i == 0 else None,
+                            )
+                            for i, skill_name in enumerate(SKILL_TILES)
                         ],
                         alignment=ft.MainAxisAlignment.START,
                         scroll="always",
@@ -170,83 +163,40 @@ class HomePage:
             padding=cogs.APP_SPACING,
         )
 
+    # Cards after the column's title; re-run by the recommender when its top-k changes
+    @staticmethod
+    def show_recommendations(column, recommendations):
+        column.controls[1:] = [
+            Factory.task_card(KIND_ICONS.get(r.kind, ft.Icons.CHECK_CIRCLE_OUTLINE), SKILL_COLORS.get(r.skill, ft.Colors.GREEN), r.title)
+            for r in recommendations
+        ]
+
     def create_recommended_tasks(self):
+        column = ft.Column(
+            [
+                ft.Text(
+                    "Recommended Tasks",
+                    weight=ft.FontWeight.BOLD,
+                    color=ft.Colors.WHITE,
+                    size=14,
+                ),
+            ],
+            spacing=10,
+        )
+        if self.recommender is not None:
+            self.recommender.bind(column, self.show_recommendations)
+        else:
+            self.show_recommendations(column, [Recommendation(*task[:3]) for task in TASKS[:cogs.RECOMMENDATIONS]])
         return ft.Container(
-            content=ft.Column(
-                [
-                    ft.Text(
-                        "Recommended Tasks",
-                        weight=ft.FontWeight.BOLD,
-                        color=ft.Colors.WHITE,
-                        size=14,
-                    ),
-                    ft.Column(
-                        [
-                            ft.Container(
-                                content=ft.Row(
-                                    [
-                                        ft.Icon(ft.Icons.CHECK_CIRCLE_OUTLINE, color=ft.Colors.GREEN, size=20),
-                                        ft.Text(
-                                            "Complete 5 tasks today",
-                                            color=ft.Colors.WHITE,
-                                            size=12,
-                                        ),
-                                    ],
-                                    alignment=ft.MainAxisAlignment.START,
-                                ),
-                                padding=10,
-                                bgcolor=ft.Colors.GREY_900,
-                                border_radius=10,
-                            ),
-                            ft.Container(
-                                content=ft.Row(
-                                    [
-                                        ft.Icon(ft.Icons.FITNESS_CENTER, color=ft.Colors.BLUE, size=20),
-                                        ft.Text(
-                                            "Do a 30-minute workout",
-                                            color=ft.Colors.WHITE,
-                                            size=12,
-                                        ),
-                                    ],
-                                    alignment=ft.MainAxisAlignment.START,
-                                ),
-                                padding=10,
-                                bgcolor=ft.Colors.GREY_900,
-                                border_radius=10,
-                            ),
-                            ft.Container(
-                                content=ft.Row(
-                                    [
-                                        ft.Icon(ft.Icons.BOOKMARK_OUTLINE, color=ft.Colors.YELLOW, size=20),
-                                        ft.Text(
-                                            "Read 10 pages of a book",
-                                            color=ft.Colors.WHITE,
-                                            size=12,
-                                        ),
-                                    ],
-                                    alignment=ft.MainAxisAlignment.START,
-                                ),
-                                padding=10,
-                                bgcolor=ft.Colors.GREY_900,
-                                border_radius=10,
-                            ),
-                        ],
-                        spacing=10,
-                    ),
-                ],
-                spacing=10,
-            ),
-            padding=ft.Padding(left=25, right=25, top=20, bottom=0),
+            content=column,
+            padding=Styles.padding(left=25, right=25, top=20),
         )
 
     def build(self):
         return ft.Column(
             [
                 self.add_widgets(),
-                ft.Container(
-                    self.create_daily_overview(),
-                    padding=cogs.APP_SPACING,
-                ),
+                Factory.wrap(self.create_daily_overview(), cogs.APP_SPACING),
                 self.create_skills_section(),
                 self.create_recommended_tasks(),
             ],
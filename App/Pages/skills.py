@@ -1,28 +1,110 @@
+import json
 import flet as ft
-from Engine.themes import ThemeFactory
+from Engine.themes import ThemeFactory, ThemeBinder
+from Storage.skills import SKILLS
+from Components.lists import VirtualList
+from Components.widgets import Widgets
+from Engine.updates import request_update
+from Storage.rollups import GRANULARITIES
+
+ROW_HEIGHT = 80
+ROW_GAP = 10
+CHART_HEIGHT = 80
+ALL_SKILLS = "All skills"
+
+# Label inside each bar, from the first day of its bucket
+BUCKET_LABELS = {
+    "day": lambda start: start.strftime("%a")[0],
+    "week": lambda start: str(start.day),
+    "month": lambda start: start.strftime("%b")[0],
+    "year": lambda start: start.strftime("%y"),
+}
 
 class SkillsPage:
-    def __init__(self, current_theme):
-        self.current_theme = ThemeFactory.dark_theme() if current_theme == "dark" else ThemeFactory.light_theme()
+    def __init__(self, current_theme, binder=None, skills=SKILLS, rollups=None):
+        self.current_theme = ThemeFactory.resolve(current_theme)
+        self.binder = binder or ThemeBinder(self.current_theme)
+        self.skills = skills
+        self.rollups = rollups
+        self.list = VirtualList(
+            lambda offset, limit: list(enumerate(self.skills[offset:offset + limit], start=offset + 1)),
+            self.build_row,
+            self.bind_row,
+            item_extent=ROW_HEIGHT + ROW_GAP,
+            chunk_size=20,
+        )
+
+    def build_row(self):
+        return self.binder.bind(
+            ft.Text(size=18, height=ROW_HEIGHT, max_lines=3, overflow=ft.TextOverflow.ELLIPSIS),
+            color="text_color",
+        )
+
+    def bind_row(self, row, entry):
+        number, (name, description) = entry
+        row.value = f"{number}. {name} - {description}"
+
+    # Reads the chart's (granularity, skill) from its data; the rollups re-run it when counts change
+    @staticmethod
+    def show_chart(chart, rollups):
+        granularity, skill = chart.data
+        starts, counts = rollups.series(granularity, skill)
+        caption, bars = chart.controls
+        caption.value = f"{int(counts.sum())} done in the last {len(counts)} {granularity}s"
+        Widgets.show_bars(bars, counts, [BUCKET_LABELS[granularity](start) for start in starts])
+
+    def redraw(self, chart, granularity, skill):
+        chart.data = (granularity, skill)
+        self.show_chart(chart, self.rollups)
+        request_update(chart)
+
+    def create_chart(self):
+        chart = ft.Column(
+            [
+                self.binder.bind(ft.Text(size=12), color="text_color"),
+                Widgets.bar_chart([""] * max(n for _, n in GRANULARITIES.values()), self.binder, CHART_HEIGHT, width=18),
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=6,
+            data=("week", None),
+        )
+        self.rollups.bind(chart, self.show_chart)
+        return ft.Column(
+            [
+                ft.Row(
+                    [
+                        ft.Dropdown(
+                            value=ALL_SKILLS,
+                            options=[ft.DropdownOption(ALL_SKILLS)] + [ft.DropdownOption(name) for name, _ in self.skills],
+                            on_change=lambda e: self.redraw(chart, chart.data[0], None if e.control.value == ALL_SKILLS else e.control.value),
+                            width=150,
+                            dense=True,
+                        ),
+                        ft.SegmentedButton(
+                            selected={"week"},
+                            segments=[ft.Segment(name, label=ft.Text(name[0].upper())) for name in GRANULARITIES],
+                            on_change=lambda e: self.redraw(chart, json.loads(e.data)[0], chart.data[1]),
+                            show_selected_icon=False,
+                        ),
+                    ],
+                    alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                ),
+                chart,
+            ],
+            spacing=10,
+        )
 
     def build(self):
         return ft.Container(
             content=ft.Column(
                 [
-                    ft.Text("Skills Page", size=24, weight=ft.FontWeight.BOLD, color=self.current_theme.text_color),
-                    ft.ListView(
-                        controls=[
-                            ft.Text("1. Wellness - Focus on maintaining physical and mental well-being.", size=18, color=self.current_theme.text_color),
-                            ft.Text("2. Mental Health - Strategies to improve emotional and psychological resilience.", size=18, color=self.current_theme.text_color),
-                            ft.Text("3. Career - Tips and tools for professional growth and success.", size=18, color=self.current_theme.text_color),
-                            ft.Text("4. Fitness - Activities and routines to stay physically active and healthy.", size=18, color=self.current_theme.text_color),
-                            ft.Text("5. Habits - Focused on Home and domestic chores", size=18, color=self.current_theme.text_color),
-                        ],
-                        spacing=10,
-                    ),
+                    self.binder.bind(ft.Text("Skills Page", size=24, weight=ft.FontWeight.BOLD), color="text_color"),
+                    *([self.create_chart()] if self.rollups is not None else []),
+                    self.list.build(),
                 ],
                 alignment=ft.MainAxisAlignment.CENTER,
                 spacing=20,
+                expand=True,
             ),
             expand=True,
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,413 @@
+# Imports
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from Engine.settings import Config as cogs
+
+KINDS = ("task", "event", "workout")
+STATUSES = ("open", "done", "skipped")
+
+# Each entry upgrades the schema by one version (PRAGMA user_version)
+MIGRATIONS = [
+    """
+    CREATE TABLE IF NOT EXISTS activities (
+        id INTEGER PRIMARY KEY,
+        kind TEXT NOT NULL,
+        title TEXT NOT NULL,
+        day TEXT NOT NULL,
+        skill TEXT,
+        status TEXT NOT NULL DEFAULT 'open',
+        notes TEXT NOT NULL DEFAULT '',
+        updated REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_activities_day ON activities(day, id);
+    CREATE INDEX IF NOT EXISTS idx_activities_skill ON activities(skill, day, id);
+    CREATE INDEX IF NOT EXISTS idx_activities_status ON activities(status, day, id);
+    """,
+    """
+    ALTER TABLE activities ADD COLUMN goal TEXT;
+    CREATE INDEX IF NOT EXISTS idx_activities_goal ON activities(goal, day, id);
+    """,
+    # Sync: an append-only change log written in the same transaction as each edit, plus version vectors
+    """
+    CREATE TABLE IF NOT EXISTS changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        activity_id INTEGER NOT NULL,
+        op TEXT NOT NULL,
+        fields TEXT NOT NULL DEFAULT '{}',
+        created REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_changes_activity ON changes(activity_id, seq);
+    CREATE TABLE IF NOT EXISTS versions (
+        activity_id INTEGER PRIMARY KEY,
+        uid TEXT NOT NULL UNIQUE,
+        clock TEXT NOT NULL DEFAULT '{}'
+    );
+    CREATE TABLE IF NOT EXISTS sync_state (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    INSERT INTO changes (activity_id, op, fields, created)
+    SELECT id, 'add', json_object(
+        'kind', kind, 'title', title, 'day', day, 'skill', skill, 'goal', goal,
+        'status', status, 'notes', notes, 'updated', updated
+    ), updated FROM activities;
+    """,
+    # Recurring activities, stored as RRULE-style rules and expanded when a range is viewed
+    """
+    CREATE TABLE IF NOT EXISTS rules (
+        id INTEGER PRIMARY KEY,
+        kind TEXT NOT NULL,
+        title TEXT NOT NULL,
+        skill TEXT,
+        goal TEXT,
+        rrule TEXT NOT NULL,
+        start TEXT NOT NULL,
+        updated REAL NOT NULL
+    );
+    """,
+    # Due-date reminders, one per open activity; fired ones are deleted so a restart only catches up on the rest
+    f"""
+    CREATE TABLE IF NOT EXISTS reminders (
+        activity_id INTEGER PRIMARY KEY,
+        due REAL NOT NULL,
+        title TEXT NOT NULL
+    );
+    INSERT INTO reminders (activity_id, due, title)
+    SELECT id, CAST(strftime('%s', day, '+{cogs.REMINDER_HOUR} hours', 'utc') AS REAL), title
+    FROM activities WHERE status = 'open' AND day >= date('now', 'localtime');
+    """,
+    # Goal hierarchy; activities still name their goal, this only places goals under parent goals
+    """
+    CREATE TABLE IF NOT EXISTS goals (
+        name TEXT PRIMARY KEY,
+        parent TEXT,
+        updated REAL NOT NULL
+    );
+    """,
+]
+
+COLUMNS = ("id", "kind", "title", "day", "skill", "goal", "status", "notes", "updated")
+SELECT = "SELECT " + ", ".join(COLUMNS) + " FROM activities"
+
+# Statements are kept as constants so sqlite3's per-connection statement cache reuses them
+SQL_INSERT = "INSERT INTO activities (kind, title, day, skill, goal, status, notes, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+SQL_GET = SELECT + " WHERE id = ?"
+SQL_DELETE = "DELETE FROM activities WHERE id = ?"
+SQL_RANGE = (
+    SELECT + " WHERE day BETWEEN ? AND ? AND (day, id) > (?, ?) ORDER BY day, id LIMIT ?"
+)
+SQL_RANGE_SKILL = (
+    SELECT + " WHERE skill = ? AND day BETWEEN ? AND ? AND (day, id) > (?, ?) ORDER BY day, id LIMIT ?"
+)
+SQL_RANGE_STATUS = (
+    SELECT + " WHERE status = ? AND day BETWEEN ? AND ? AND (day, id) > (?, ?) ORDER BY day, id LIMIT ?"
+)
+SQL_ALL = SELECT + " WHERE id > ? ORDER BY id LIMIT ?"
+SQL_COUNT = "SELECT COUNT(*) FROM activities WHERE day BETWEEN ? AND ?"
+SQL_DONE_HOURS = (
+    "SELECT skill, CAST(strftime('%H', updated, 'unixepoch', 'localtime') AS INTEGER), COUNT(*) "
+    "FROM activities WHERE status = 'done' GROUP BY 1, 2"
+)
+SQL_LAST_DONE = "SELECT title, MAX(day) FROM activities WHERE status = 'done' GROUP BY title"
+SQL_RULES = "SELECT id, kind, title, skill, goal, rrule, start FROM rules ORDER BY id"
+SQL_INSERT_RULE = "INSERT INTO rules (kind, title, skill, goal, rrule, start, updated) VALUES (?, ?, ?, ?, ?, ?, ?)"
+SQL_REMINDERS = "SELECT activity_id, due, title FROM reminders"
+SQL_SET_REMINDER = "INSERT OR REPLACE INTO reminders (activity_id, due, title) VALUES (?, ?, ?)"
+SQL_RETITLE_REMINDER = "UPDATE reminders SET title = ? WHERE activity_id = ?"
+SQL_CLEAR_REMINDER = "DELETE FROM reminders WHERE activity_id = ?"
+SQL_CLEAR_FIRED = "DELETE FROM reminders WHERE activity_id = ? AND due <= ?"
+SQL_GOALS = "SELECT name, parent FROM goals"
+SQL_SET_GOAL = "INSERT OR REPLACE INTO goals (name, parent, updated) VALUES (?, ?, ?)"
+SQL_DONE_DAYS = "SELECT skill, day, COUNT(*) FROM activities WHERE status = 'done' AND skill IS NOT NULL GROUP BY skill, day"
+
+# Reminders fire at REMINDER_HOUR local time on the activity's day
+def reminder_due(day):
+    return datetime.fromisoformat(day).replace(hour=cogs.REMINDER_HOUR).timestamp()
+
+# What an edit does to the activity's reminder: ("set", id, due, title), ("title", id, title), ("clear", id) or None.
+# Only a new, reopened or moved activity is (re)scheduled, so editing an overdue one never fires it twice.
+def reminder_change(old, new, now=None):
+    if new is not None and new.status == "open":
+        if old is None or old.status != "open" or old.day != new.day:
+            due = reminder_due(new.day)
+            if due > (now or time.time()):
+                return ("set", new.id, due, new.title)
+            return ("clear", new.id) if old is not None else None
+        return ("title", new.id, new.title) if old.title != new.title else None
+    if old is not None and old.status == "open":
+        return ("clear", old.id)
+    return None
+
+class Activity:
+    __slots__ = COLUMNS
+
+    def __init__(self, kind, title, day, skill=None, goal=None, status="open", notes="", updated=None, id=None):
+        self.id = id
+        self.kind = kind
+        self.title = title
+        self.day = day.isoformat() if isinstance(day, date) else day
+        self.skill = skill
+        self.goal = goal
+        self.status = status
+        self.notes = notes
+        self.updated = updated or time.time()
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(**dict(zip(COLUMNS, row)))
+
+    def copy(self, **changes):
+        values = {name: getattr(self, name) for name in COLUMNS}
+        values.update(changes)
+        return Activity(**values)
+
+    def __repr__(self):
+        return f"Activity({self.id}, {self.kind!r}, {self.title!r}, {self.day})"
+
+class ActivityPage:
+    def __init__(self, items, cursor, limit):
+        self.items = items
+        self.cursor = cursor  # (day, id) of the last row; pass back as `after` for the next page
+        self.has_more = len(items) == limit
+
+class ActivityStore:
+    _default = None
+
+    def __init__(self, path):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # One long-lived connection so compiled statements stay cached; writes are serialized by the lock
+        self.conn = sqlite3.connect(path, check_same_thread=False, cached_statements=64, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.lock = threading.RLock()
+        self._depth = 0
+        self._pending = []  # change events held back until the outermost batch commits
+        self._listeners = []
+        self.journal = None  # journal(event, old, new) runs inside the write's transaction, e.g. the sync change log
+        self.migrate()
+
+    @classmethod
+    def default(cls):
+        if cls._default is None:
+            cls._default = cls(os.path.join(cogs.DATA_DIR, "activities.db"))
+        return cls._default
+
+    def migrate(self):
+        with self.lock:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            for number, script in enumerate(MIGRATIONS[version:], start=version + 1):
+                self.conn.executescript(f"BEGIN; {script} PRAGMA user_version = {number}; COMMIT;")
+
+    # Listeners are called as callback(event, old, new) after the write commits
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+        return lambda: self._listeners.remove(callback)
+
+    def _emit(self, event, old, new):
+        if self.journal is not None:
+            self.journal(event, old, new)
+        self._remind(reminder_change(old, new))
+        self._pending.append((event, old, new))
+
+    # Group writes into one transaction; nested batches join the outer one.
+    # The outermost batch's deliver(fan_out, events), if given, decides where listeners run, e.g. on the event loop
+    @contextmanager
+    def batch(self, deliver=None):
+        with self.lock:
+            if self._depth == 0:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.conn.execute("ROLLBACK")
+                    self._pending.clear()
+                raise
+            self._depth -= 1
+            if self._depth:
+                return
+            self.conn.execute("COMMIT")
+            pending, self._pending = self._pending, []
+        if deliver is not None and pending:
+            deliver(self._fan_out, pending)
+        else:
+            self._fan_out(pending)
+
+    def _fan_out(self, events):
+        for event in events:
+            for callback in list(self._listeners):
+                callback(*event)
+
+    def add(self, activity):
+        with self.batch():
+            cursor = self.conn.execute(SQL_INSERT, (
+                activity.kind, activity.title, activity.day, activity.skill,
+                activity.goal, activity.status, activity.notes, activity.updated,
+            ))
+            activity.id = cursor.lastrowid
+            self._emit("add", None, activity)
+        return activity.id
+
+    def add_many(self, activities):
+        with self.batch():
+            for activity in activities:
+                self.add(activity)
+        return activities
+
+    def get(self, activity_id):
+        with self.lock:
+            row = self.conn.execute(SQL_GET, (activity_id,)).fetchone()
+        return Activity.from_row(row) if row else None
+
+    def update(self, activity_id, **changes):
+        unknown = set(changes) - set(COLUMNS[1:-1])
+        if unknown:
+            raise ValueError(f"Unknown activity fields: {', '.join(sorted(unknown))}")
+        with self.batch():
+            old = self.get(activity_id)
+            if old is None:
+                raise KeyError(activity_id)
+            if not changes:
+                return old
+            new = old.copy(updated=time.time(), **changes)
+            assignments = ", ".join(f"{name} = ?" for name in changes) + ", updated = ?"
+            self.conn.execute(
+                f"UPDATE activities SET {assignments} WHERE id = ?",
+                [getattr(new, name) for name in changes] + [new.updated, activity_id],
+            )
+            self._emit("update", old, new)
+        return new
+
+    def set_status(self, activity_id, status):
+        return self.update(activity_id, status=status)
+
+    def delete(self, activity_id):
+        with self.batch():
+            old = self.get(activity_id)
+            if old is None:
+                return None
+            self.conn.execute(SQL_DELETE, (activity_id,))
+            self._emit("delete", old, None)
+        return old
+
+    # Keyset-paged read over [start, end] using the day/skill/status indexes
+    def range(self, start, end, limit=50, after=None, skill=None, status=None):
+        start, end = str(start), str(end)
+        after_day, after_id = after or ("", 0)
+        with self.lock:
+            if skill is not None:
+                rows = self.conn.execute(SQL_RANGE_SKILL, (skill, start, end, after_day, after_id, limit))
+            elif status is not None:
+                rows = self.conn.execute(SQL_RANGE_STATUS, (status, start, end, after_day, after_id, limit))
+            else:
+                rows = self.conn.execute(SQL_RANGE, (start, end, after_day, after_id, limit))
+            items = [Activity.from_row(row) for row in rows]
+        cursor = (items[-1].day, items[-1].id) if items else after
+        return ActivityPage(items, cursor, limit)
+
+    def day(self, day, limit=50, after=None):
+        return self.range(day, day, limit, after)
+
+    def week(self, day, limit=50, after=None):
+        start = day - timedelta(days=day.weekday())
+        return self.range(start, start + timedelta(days=6), limit, after)
+
+    def count(self, start, end):
+        with self.lock:
+            return self.conn.execute(SQL_COUNT, (str(start), str(end))).fetchone()[0]
+
+    # (value, total, done) per day, skill or goal in one indexed GROUP BY
+    def totals(self, column):
+        if column not in ("day", "skill", "goal", "kind", "title"):
+            raise ValueError(f"Cannot group activities by {column!r}")
+        with self.lock:
+            return self.conn.execute(
+                f"SELECT {column}, COUNT(*), SUM(status = 'done') FROM activities GROUP BY {column}"
+            ).fetchall()
+
+    # (skill, local hour, count) of completed activities, by the hour they were marked done
+    def done_hours(self):
+        with self.lock:
+            return self.conn.execute(SQL_DONE_HOURS).fetchall()
+
+    # (title, latest day) for every title completed at least once
+    def last_done(self):
+        with self.lock:
+            return self.conn.execute(SQL_LAST_DONE).fetchall()
+
+    # (skill, day, count) of completed activities; the rollups are seeded from this
+    def done_days(self):
+        with self.lock:
+            return self.conn.execute(SQL_DONE_DAYS).fetchall()
+
+    # Recurrence rules as (id, kind, title, skill, goal, rrule, start) rows; Storage.recurrence expands them
+    def rules(self):
+        with self.lock:
+            return self.conn.execute(SQL_RULES).fetchall()
+
+    def add_rule(self, rule):
+        with self.batch():
+            cursor = self.conn.execute(SQL_INSERT_RULE, (
+                rule.kind, rule.title, rule.skill, rule.goal, rule.rrule, rule.start.isoformat(), time.time(),
+            ))
+        return cursor.lastrowid
+
+    def delete_rule(self, rule_id):
+        with self.batch():
+            return self.conn.execute("DELETE FROM rules WHERE id = ?", (rule_id,)).rowcount > 0
+
+    # (name, parent) for every goal placed in the hierarchy
+    def goals(self):
+        with self.lock:
+            return self.conn.execute(SQL_GOALS).fetchall()
+
+    def set_goal(self, name, parent=None):
+        with self.batch():
+            self.conn.execute(SQL_SET_GOAL, (name, parent, time.time()))
+
+    # Reminder rows change in the same transaction as the edit that caused them
+    def _remind(self, change):
+        if change is None:
+            return
+        if change[0] == "set":
+            self.conn.execute(SQL_SET_REMINDER, change[1:])
+        elif change[0] == "title":
+            self.conn.execute(SQL_RETITLE_REMINDER, (change[2], change[1]))
+        else:
+            self.conn.execute(SQL_CLEAR_REMINDER, (change[1],))
+
+    def reminders(self):
+        with self.lock:
+            return self.conn.execute(SQL_REMINDERS).fetchall()
+
+    # With before, a row moved past it since it fired (the clear ran late, off the loop) is kept
+    def clear_reminders(self, activity_ids, before=None):
+        with self.batch():
+            if before is None:
+                self.conn.executemany(SQL_CLEAR_REMINDER, [(activity_id,) for activity_id in activity_ids])
+            else:
+                self.conn.executemany(SQL_CLEAR_FIRED, [(activity_id, before) for activity_id in activity_ids])
+
+    # Stream every row in id order, a page at a time
+    def iter_all(self, chunk=500):
+        last = 0
+        while True:
+            with self.lock:
+                rows = self.conn.execute(SQL_ALL, (last, chunk)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield Activity.from_row(row)
+            last = rows[-1][0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
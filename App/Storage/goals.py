@@ -0,0 +1,114 @@
+# Goal hierarchy behind the Goals progress figure
+
+class GoalNode:
+    __slots__ = ("name", "parent", "children", "done", "total", "child_sum", "value", "dirty", "stale")
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.children = set()
+        self.done = 0  # Activities linked straight to this goal
+        self.total = 0
+        self.child_sum = 0.0  # Sum of the children's values as of their last recompute
+        self.value = 0.0
+        self.dirty = False
+        self.stale = set()  # Children marked dirty since this node was last recomputed
+
+    # Each linked activity and each sub-goal is one part; a sub-goal counts as far as it is complete
+    def compute(self):
+        parts = self.total + len(self.children)
+        return (self.done + self.child_sum) / parts if parts else 0.0
+
+class GoalTree:
+    # Goals made of sub-goals and activities. A change marks its ancestors dirty; reading a value recomputes
+    # only the dirty nodes under it, so one completion deep in a large tree costs O(depth), not a full pass.
+    def __init__(self):
+        self.root = GoalNode(None)  # Top-level goals hang off this; its value is the overall figure
+        self.nodes = {}
+        self.recomputed = 0
+
+    # Goals seen for the first time (e.g. only named on an activity) start out top-level
+    def node(self, name):
+        node = self.nodes.get(name)
+        if node is None:
+            node = self.nodes[name] = GoalNode(name, self.root)
+            self.root.children.add(node)
+            self._touch(self.root)
+        return node
+
+    # Marking stops at the first node already dirty: everything above it is dirty too
+    def _touch(self, node):
+        while node is not None and not node.dirty:
+            node.dirty = True
+            if node.parent is not None:
+                node.parent.stale.add(node)
+            node = node.parent
+
+    def count(self, name, total, done):
+        node = self.node(name)
+        node.total += total
+        node.done += done
+        self._touch(node)
+
+    # Move a goal under parent (None for top-level), with everything below it
+    def link(self, name, parent=None):
+        node = self.node(name)
+        target = self.node(parent) if parent is not None else self.root
+        ancestor = target
+        while ancestor is not None:
+            if ancestor is node:
+                raise ValueError(f"Goal {name!r} cannot be placed under its own sub-goal {parent!r}")
+            ancestor = ancestor.parent
+        if target is node.parent:
+            return
+        value = self._refresh(node)
+        previous = node.parent
+        previous.children.discard(node)
+        previous.stale.discard(node)
+        previous.child_sum -= value
+        self._touch(previous)
+        node.parent = target
+        target.children.add(node)
+        target.child_sum += value
+        self._touch(target)
+
+    # Recompute the dirty nodes under node, children before parents, without recursion
+    def _refresh(self, node):
+        stack = [node]
+        while stack:
+            top = stack[-1]
+            if not top.dirty:
+                stack.pop()
+                continue
+            pending = [child for child in top.stale if child.dirty]
+            if pending:
+                stack += pending
+                continue
+            stack.pop()
+            top.stale.clear()
+            value = top.compute()
+            if top.parent is not None:
+                top.parent.child_sum += value - top.value
+            top.value = value
+            top.dirty = False
+            self.recomputed += 1
+        return node.value
+
+    # Completion of one goal, or of every top-level goal together when name is None
+    def percent(self, name=None):
+        if name is None:
+            return self._refresh(self.root)
+        node = self.nodes.get(name)
+        return self._refresh(node) if node is not None else 0.0
+
+    # Full recomputation, bottom-up, after loading everything at once
+    def rebuild(self):
+        order = [self.root]
+        for node in order:
+            order.extend(node.children)
+        for node in reversed(order):
+            node.child_sum = sum(child.value for child in node.children)
+            node.value = node.compute()
+            node.dirty = False
+            node.stale.clear()
+        return self.root.value
@@ -0,0 +1,108 @@
+# Imports
+import threading
+from datetime import date
+from Engine.settings import Config as cogs
+from Engine.updates import Bindings
+from Storage.goals import GoalTree
+
+class Counter:
+    __slots__ = ("total", "done")
+
+    def __init__(self, total=0, done=0):
+        self.total = total
+        self.done = done
+
+    def ratio(self):
+        return self.done / self.total if self.total else 0.0
+
+class ProgressAggregates:
+    METRICS = ("tasks", "goals", "levels")
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.days = {}  # day -> Counter
+        self.skills = {}  # skill -> Counter
+        self.goals = GoalTree()  # Per-goal counts, rolled up through sub-goals
+        self.completed = 0
+        self._values = {}
+        self.bindings = {name: Bindings() for name in self.METRICS}
+
+    # Seed the counters once from the store's GROUP BY totals
+    def load(self, store):
+        with self.lock:
+            for day, total, done in store.totals("day"):
+                self.days[day] = Counter(total, done or 0)
+                self.completed += done or 0
+            for skill, total, done in store.totals("skill"):
+                if skill is not None:
+                    self.skills[skill] = Counter(total, done or 0)
+            goals = GoalTree()
+            for name, parent in store.goals():
+                goals.link(name, parent)
+            for goal, total, done in store.totals("goal"):
+                if goal is not None:
+                    goals.count(goal, total, done or 0)
+            goals.rebuild()
+            self.goals = goals
+        self._publish()
+
+    # On the given executor (e.g. the app loader's pool), like SearchIndex.rebuild_async
+    def load_async(self, store, executor):
+        return executor.submit(self.load, store)
+
+    def _count(self, activity, sign):
+        done = sign if activity.status == "done" else 0
+        for table, key in ((self.days, activity.day), (self.skills, activity.skill)):
+            if key is None:
+                continue
+            counter = table.get(key)
+            if counter is None:
+                counter = table[key] = Counter()
+            counter.total += sign
+            counter.done += done
+        if activity.goal is not None:
+            self.goals.count(activity.goal, sign, done)
+        self.completed += done
+
+    # ActivityStore listener: O(1) delta of the old row out and the new row in
+    def apply(self, event, old, new):
+        with self.lock:
+            if old is not None:
+                self._count(old, -1)
+            if new is not None:
+                self._count(new, 1)
+        self._publish()
+
+    def metric(self, name):
+        if name == "tasks":
+            counter = self.days.get(date.today().isoformat())
+            return counter.ratio() if counter else 0.0
+        if name == "goals":
+            with self.lock:
+                return self.goals.percent()
+        if name == "levels":
+            return (self.completed % cogs.LEVEL_SIZE) / cogs.LEVEL_SIZE
+        raise KeyError(name)
+
+    # Place a goal under a parent goal (None for top-level) and keep it there across restarts
+    def link_goal(self, store, name, parent=None):
+        with self.lock:
+            self.goals.link(name, parent)
+        store.set_goal(name, parent)
+        self._publish()
+
+    def level(self):
+        return self.completed // cogs.LEVEL_SIZE + 1
+
+    # render(control, value) runs now and again only when the metric's value changes
+    def bind(self, name, control, render):
+        render(control, self.metric(name))
+        return self.bindings[name].add(control, render)
+
+    def _publish(self):
+        for name in self.METRICS:
+            value = self.metric(name)
+            if self._values.get(name) == value:
+                continue
+            self._values[name] = value
+            self.bindings[name].render(value)
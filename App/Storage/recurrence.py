@@ -0,0 +1,237 @@
+# Imports
+import calendar
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from Engine.settings import Config as cogs
+from Storage.activities import Activity
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+PARTS = ("FREQ", "INTERVAL", "BYDAY", "BYMONTHDAY", "UNTIL", "COUNT")
+
+class Recurrence:
+    __slots__ = ("freq", "interval", "byday", "bymonthday", "until", "count")
+
+    def __init__(self, freq, interval=1, byday=(), bymonthday=(), until=None, count=None):
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unsupported frequency {freq!r}")
+        if interval < 1 or (count is not None and count < 1):
+            raise ValueError("INTERVAL and COUNT must be positive")
+        if any(not 1 <= day <= 31 for day in bymonthday):
+            raise ValueError("BYMONTHDAY must be between 1 and 31")
+        self.freq = freq
+        self.interval = interval
+        self.byday = tuple(sorted(set(byday)))  # Weekday numbers, Monday = 0
+        self.bymonthday = tuple(sorted(set(bymonthday)))
+        self.until = until
+        self.count = count
+
+    # A subset of RFC 5545 RRULE, e.g. "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH;UNTIL=20261231"
+    @classmethod
+    def parse(cls, text):
+        parts = dict(part.split("=", 1) for part in text.upper().replace("RRULE:", "").split(";") if part)
+        unknown = parts.keys() - set(PARTS)
+        if unknown:
+            raise ValueError(f"Unsupported rule parts: {', '.join(sorted(unknown))}")
+        until = parts.get("UNTIL", "").replace("-", "")[:8]
+        return cls(
+            parts.get("FREQ"),
+            int(parts.get("INTERVAL", 1)),
+            [WEEKDAYS.index(day) for day in parts["BYDAY"].split(",")] if "BYDAY" in parts else (),
+            [int(day) for day in parts["BYMONTHDAY"].split(",")] if "BYMONTHDAY" in parts else (),
+            date(int(until[:4]), int(until[4:6]), int(until[6:8])) if until else None,
+            int(parts["COUNT"]) if "COUNT" in parts else None,
+        )
+
+    def __str__(self):
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.byday:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[day] for day in self.byday))
+        if self.bymonthday:
+            parts.append("BYMONTHDAY=" + ",".join(str(day) for day in self.bymonthday))
+        if self.until:
+            parts.append(f"UNTIL={self.until:%Y%m%d}")
+        if self.count:
+            parts.append(f"COUNT={self.count}")
+        return ";".join(parts)
+
+    # Occurrences in [low, high] for a rule anchored at `start`; the walk starts at low, not at start.
+    # COUNT is not applied here, Rule turns it into a last date once.
+    def expand(self, start, low, high):
+        low = max(low, start)
+        if self.until is not None:
+            high = min(high, self.until)
+        if low > high:
+            return
+        if self.freq == "DAILY":
+            day = start + timedelta(days=-(-(low - start).days // self.interval) * self.interval)
+            while day <= high:
+                yield day
+                day += timedelta(days=self.interval)
+        elif self.freq == "WEEKLY":
+            weekdays = self.byday or (start.weekday(),)
+            first_week = start - timedelta(days=start.weekday())
+            weeks = (low - first_week).days // 7
+            week = first_week + timedelta(weeks=weeks - weeks % self.interval)
+            while week <= high:
+                for weekday in weekdays:
+                    day = week + timedelta(days=weekday)
+                    if low <= day <= high:
+                        yield day
+                week += timedelta(weeks=self.interval)
+        else:
+            monthdays = self.bymonthday or (start.day,)
+            months = (low.year - start.year) * 12 + low.month - start.month
+            index = months - months % self.interval
+            while True:
+                year, month = divmod(start.year * 12 + start.month - 1 + index, 12)
+                month += 1
+                if date(year, month, 1) > high:
+                    return
+                length = calendar.monthrange(year, month)[1]
+                for monthday in monthdays:
+                    # Months too short for the day are skipped, as RRULE does
+                    if monthday <= length and low <= date(year, month, monthday) <= high:
+                        yield date(year, month, monthday)
+                index += self.interval
+
+    # The last occurrence, date.max for rules that never end, or None when there are none at all
+    def last(self, start):
+        if self.count is None:
+            return self.until or date.max
+        seen = None
+        for number, day in enumerate(self.expand(start, start, self.until or date.max), start=1):
+            seen = day
+            if number == self.count:
+                break
+        return seen
+
+class Rule:
+    __slots__ = ("id", "kind", "title", "skill", "goal", "recurrence", "rrule", "start", "end")
+
+    def __init__(self, kind, title, rrule, start, skill=None, goal=None, id=None):
+        self.id = id
+        self.kind = kind
+        self.title = title
+        self.skill = skill
+        self.goal = goal
+        self.recurrence = Recurrence.parse(rrule) if isinstance(rrule, str) else rrule
+        self.rrule = str(self.recurrence)
+        self.start = date.fromisoformat(start) if isinstance(start, str) else start
+        self.end = self.recurrence.last(self.start)  # Resolved once, so COUNT rules get a fixed span
+
+    @classmethod
+    def from_row(cls, row):
+        id, kind, title, skill, goal, rrule, start = row
+        return cls(kind, title, rrule, start, skill, goal, id)
+
+    # Occurrences in [low, high] as unsaved activities (id None), generated on demand
+    def occurrences(self, low, high):
+        if self.end is None:
+            return
+        for day in self.recurrence.expand(self.start, low, min(high, self.end)):
+            yield Activity(self.kind, self.title, day.isoformat(), skill=self.skill, goal=self.goal, notes=self.rrule)
+
+class IntervalTree:
+    # Centered interval tree over inclusive (low, high, item) intervals; queries cost O(log n + matches)
+    __slots__ = ("center", "by_low", "by_high", "left", "right")
+
+    def __init__(self, intervals):
+        ends = sorted(end for low, high, _ in intervals for end in (low, high))
+        self.center = ends[len(ends) // 2] if ends else None
+        here, left, right = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        # The median end belongs to an interval kept here, so both sides are strictly smaller
+        self.by_low = sorted(here, key=lambda interval: interval[0])
+        self.by_high = sorted(here, key=lambda interval: interval[1], reverse=True)
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    # Items whose interval overlaps [low, high]
+    def query(self, low, high):
+        found = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node is None or node.center is None:
+                continue
+            if high < node.center:
+                for interval in node.by_low:
+                    if interval[0] > high:
+                        break
+                    found.append(interval[2])
+                stack.append(node.left)
+            elif low > node.center:
+                for interval in node.by_high:
+                    if interval[1] < low:
+                        break
+                    found.append(interval[2])
+                stack.append(node.right)
+            else:
+                found.extend(interval[2] for interval in node.by_low)
+                stack += (node.left, node.right)
+        return found
+
+class Schedule:
+    # Rules live in the activity store; the tree finds the ones spanning a range and only those are expanded
+    def __init__(self, store, cache_size=cogs.RECURRENCE_CACHE):
+        self.store = store
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self.rules = {rule.id: rule for rule in map(Rule.from_row, store.rules())}
+        self.tree = None  # Rebuilt on the first query after a rule changes
+        self._cache = OrderedDict()  # (low, high) -> occurrences, least recently viewed first
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, kind, title, rrule, start, skill=None, goal=None):
+        rule = Rule(kind, title, rrule, start, skill, goal)
+        rule.id = self.store.add_rule(rule)
+        with self.lock:
+            self.rules[rule.id] = rule
+            self._changed()
+        return rule.id
+
+    def delete(self, rule_id):
+        deleted = self.store.delete_rule(rule_id)
+        with self.lock:
+            if self.rules.pop(rule_id, None) is not None:
+                self._changed()
+        return deleted
+
+    def _changed(self):
+        self.tree = None
+        self._cache.clear()
+
+    # Occurrences with low <= day <= high, ordered by day then title
+    def between(self, low, high):
+        key = (low, high)
+        with self.lock:
+            occurrences = self._cache.get(key)
+            if occurrences is not None:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return occurrences
+            self.misses += 1
+            if self.tree is None:
+                self.tree = IntervalTree([(rule.start, rule.end, rule) for rule in self.rules.values() if rule.end is not None])
+            occurrences = tuple(sorted(
+                (activity for rule in self.tree.query(low, high) for activity in rule.occurrences(low, high)),
+                key=lambda activity: (activity.day, activity.title),
+            ))
+            self._cache[key] = occurrences
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return occurrences
+
+    def stats(self):
+        return {"rules": len(self.rules), "cached": len(self._cache), "hits": self.hits, "misses": self.misses}
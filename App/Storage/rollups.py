@@ -0,0 +1,140 @@
+# Imports
+import threading
+from datetime import date
+import numpy as np
+from Engine.settings import Config as cogs
+from Engine.updates import Bindings
+from Storage.skills import SKILLS
+
+EPOCH = date(1970, 1, 1).toordinal()  # Bucket keys count from here, like numpy's datetime64
+
+# Granularity -> (datetime64 unit, buckets shown in a chart)
+GRANULARITIES = {
+    "day": ("D", cogs.ROLLUP_BUCKETS["day"]),
+    "week": ("W", cogs.ROLLUP_BUCKETS["week"]),
+    "month": ("M", cogs.ROLLUP_BUCKETS["month"]),
+    "year": ("Y", cogs.ROLLUP_BUCKETS["year"]),
+}
+
+# Bucket keys for days since 1970-01-01 (a scalar or an array); weeks start on Monday
+def bucket(unit, days):
+    if unit == "D":
+        return days
+    if unit == "W":
+        return (days + 3) // 7  # 1970-01-01 was a Thursday
+    return np.asarray(days).astype("datetime64[D]").astype(f"datetime64[{unit}]").astype(np.int64)
+
+# First day of a bucket
+def bucket_start(unit, key):
+    if unit == "D":
+        return date.fromordinal(EPOCH + key)
+    if unit == "W":
+        return date.fromordinal(EPOCH + key * 7 - 3)
+    if unit == "M":
+        return date(1970 + key // 12, key % 12 + 1, 1)
+    return date(1970 + key, 1, 1)
+
+class Rollup:
+    # One granularity: completed counts in a skills x buckets array, column 0 holding bucket `origin`
+    def __init__(self, unit, skills):
+        self.unit = unit
+        self.origin = None
+        self.counts = np.zeros((skills, 0), dtype=np.int64)
+
+    # Make room for keys low..high; spare columns on the side that ran out keep growth amortized
+    def _reserve(self, low, high):
+        width = self.counts.shape[1]
+        if self.origin is None:
+            self.origin = low
+        elif low >= self.origin and high < self.origin + width:
+            return
+        spare = max(width, 16)
+        origin = min(low, self.origin) - (spare if low < self.origin else 0)
+        end = max(high + 1, self.origin + width) + (spare if high >= self.origin + width else 0)
+        counts = np.zeros((self.counts.shape[0], end - origin), dtype=np.int64)
+        counts[:, self.origin - origin:self.origin - origin + width] = self.counts
+        self.origin, self.counts = origin, counts
+
+    # Add amounts at (skill index, day) pairs, all given as arrays
+    def add(self, skills, days, amounts):
+        if not len(days):
+            return
+        keys = bucket(self.unit, days)
+        self._reserve(int(keys.min()), int(keys.max()))
+        np.add.at(self.counts, (skills, keys - self.origin), amounts)
+
+    # Counts for the n buckets ending at `end`, for one skill index or summed over all (None)
+    def window(self, skill, end, n):
+        out = np.zeros(n, dtype=np.int64)
+        if self.origin is None:
+            return out
+        low, high = max(end - n + 1, self.origin), min(end + 1, self.origin + self.counts.shape[1])
+        if low < high:
+            columns = self.counts[:, low - self.origin:high - self.origin]
+            out[low - end + n - 1:high - end + n - 1] = columns.sum(axis=0) if skill is None else columns[skill]
+        return out
+
+class RollupStore:
+    # Completions per skill at every granularity, kept current from store events so charts never scan activities
+    def __init__(self, skills=SKILLS):
+        self.skills = [name for name, _ in skills]
+        self.skill_index = {name: i for i, name in enumerate(self.skills)}
+        self.lock = threading.Lock()
+        self.rollups = self._empty()
+        self.ready = False
+        self.bindings = Bindings()
+
+    def _empty(self):
+        return {name: Rollup(unit, len(self.skills)) for name, (unit, _) in GRANULARITIES.items()}
+
+    # Seed every granularity from one GROUP BY over (skill, day)
+    def load(self, store):
+        with self.lock:
+            rows = [row for row in store.done_days() if row[0] in self.skill_index]
+            skills = np.array([self.skill_index[skill] for skill, _, _ in rows], dtype=np.int64)
+            days = np.array([day for _, day, _ in rows], dtype="datetime64[D]").astype(np.int64)
+            counts = np.array([count for _, _, count in rows], dtype=np.int64)
+            rollups = self._empty()
+            for rollup in rollups.values():
+                rollup.add(skills, days, counts)
+            self.rollups = rollups
+            self.ready = True
+        self._publish()
+
+    # On the given executor (e.g. the app loader's pool), like Recommender.load_async
+    def load_async(self, store, executor):
+        return executor.submit(self.load, store)
+
+    def _count(self, activity, sign):
+        skill = self.skill_index.get(activity.skill)
+        if activity.status != "done" or skill is None:
+            return False
+        days = np.array([date.fromisoformat(activity.day).toordinal() - EPOCH])
+        for rollup in self.rollups.values():
+            rollup.add(np.array([skill]), days, sign)
+        return True
+
+    # ActivityStore listener: the old row out and the new row in, one bucket per granularity
+    def apply(self, event, old, new):
+        with self.lock:
+            changed = old is not None and self._count(old, -1)
+            changed = (new is not None and self._count(new, 1)) or changed
+        if changed:
+            self._publish()
+
+    # (first day of each bucket, counts) for the last n buckets up to `today`; skill None sums every skill
+    def series(self, granularity, skill=None, n=None, today=None):
+        unit, default = GRANULARITIES[granularity]
+        n = n or default
+        end = int(bucket(unit, (today or date.today()).toordinal() - EPOCH))
+        with self.lock:
+            counts = self.rollups[granularity].window(self.skill_index[skill] if skill else None, end, n)
+        return [bucket_start(unit, key) for key in range(end - n + 1, end + 1)], counts
+
+    # render(control, rollups) runs now and after every change to the counts
+    def bind(self, control, render):
+        render(control, self)
+        return self.bindings.add(control, render)
+
+    def _publish(self):
+        self.bindings.render(self)
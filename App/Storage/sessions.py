@@ -0,0 +1,180 @@
+# Imports
+import bisect
+import mmap
+import os
+import struct
+import threading
+from datetime import date, datetime, timedelta
+import numpy as np
+from Engine.settings import Config as cogs
+from Storage.skills import SKILLS
+
+COMPLETED, ABANDONED = 1, 2
+NO_SKILL = 0xFFFF
+
+# 16-byte header, then fixed-width little-endian records: start (epoch s), focused seconds, skill id, outcome
+HEADER = struct.Struct("<4sHH8x")
+MAGIC = b"MFSL"
+VERSION = 1
+RECORD = struct.Struct("<dIHBx")
+RECORD_DTYPE = np.dtype([("start", "<f8"), ("duration", "<u4"), ("skill", "<u2"), ("outcome", "u1"), ("pad", "u1")])
+
+SKILL_IDS = {name: i for i, (name, _) in enumerate(SKILLS)}
+EPOCH = date(1970, 1, 1).toordinal()
+
+# Local day (ordinal) of each start, with the UTC offset in force at that start, looked up once per distinct hour,
+# so sessions before a DST change keep their day
+def local_days(starts):
+    hours, where = np.unique(starts // 3600, return_inverse=True)
+    offsets = np.array([datetime.fromtimestamp(hour * 3600).astimezone().utcoffset().total_seconds() for hour in hours])
+    return ((starts + offsets[where]) // 86400).astype(np.int64) + EPOCH
+
+class SessionLog:
+    _default = None
+
+    # Appends go through a buffered file and are fsync'd every `sync_every` records;
+    # reads are numpy views over an mmap of the same file, so nothing is parsed into Python objects
+    def __init__(self, path, sync_every=cogs.SESSION_SYNC_BATCH, stride=cogs.SESSION_INDEX_STRIDE):
+        self.path = path
+        self.sync_every = sync_every
+        self.stride = stride
+        self.lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = open(path, "ab+")
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        self._check_header()
+        # A torn final record from a crash mid-append is cut off
+        self.count = (self.file.tell() - HEADER.size) // RECORD.size
+        self.file.seek(HEADER.size + self.count * RECORD.size)
+        self.file.truncate()
+        self.unsynced = 0
+        self.syncs = 0
+        self._map = None
+        self._records = None  # Structured array over the mapped records
+        self._index = []  # start of every `stride`-th record, for bisecting to a block
+
+    @classmethod
+    def default(cls):
+        if cls._default is None:
+            cls._default = cls(os.path.join(cogs.DATA_DIR, "focus_sessions.log"))
+        return cls._default
+
+    def _check_header(self):
+        self.file.seek(0)
+        magic, version, size = HEADER.unpack(self.file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION or size != RECORD.size:
+            raise ValueError(f"{self.path} is not a version {VERSION} session log")
+        self.file.seek(0, os.SEEK_END)
+
+    # Sessions are appended as they end, so starts are in order and the index can bisect
+    def append(self, start, duration, skill=None, outcome=COMPLETED):
+        with self.lock:
+            self.file.write(RECORD.pack(start, int(duration), SKILL_IDS.get(skill, NO_SKILL), outcome))
+            self.file.flush()  # Readers map the file, so the record has to reach the OS now
+            if self.count % self.stride == 0 and len(self._index) == self.count // self.stride:
+                self._index.append(start)
+            self.count += 1
+            self.unsynced += 1
+            if self.unsynced >= self.sync_every:
+                self._sync()
+
+    def sync(self):
+        with self.lock:
+            self._sync()
+
+    def _sync(self):
+        if self.unsynced:
+            os.fsync(self.file.fileno())
+            self.unsynced = 0
+            self.syncs += 1
+
+    def close(self):
+        self.sync()
+        self.file.close()
+
+    # Zero-copy view of every record; remapped only when appends have grown the file
+    def records(self):
+        with self.lock:
+            if self._records is None or len(self._records) != self.count:
+                if self.count == 0:
+                    return np.empty(0, RECORD_DTYPE)
+                self._map = mmap.mmap(self.file.fileno(), HEADER.size + self.count * RECORD.size, access=mmap.ACCESS_READ)
+                self._records = np.frombuffer(self._map, RECORD_DTYPE, self.count, HEADER.size)
+                if len(self._index) != -(-self.count // self.stride):
+                    self._index = self._records["start"][::self.stride].tolist()
+            return self._records
+
+    # Records with since <= start < until (epoch seconds); the sparse index narrows each bound to one block
+    def between(self, since=None, until=None):
+        records = self.records()
+        low = 0 if since is None else self._position(records, since)
+        high = len(records) if until is None else self._position(records, until)
+        return records[low:high]
+
+    # First record starting at or after `when`: everything before block b-1 starts earlier and block b on starts later
+    def _position(self, records, when):
+        block = bisect.bisect_left(self._index, when)
+        if block == 0:
+            return 0
+        low = (block - 1) * self.stride
+        high = min(len(records), block * self.stride)
+        return low + int(np.searchsorted(records["start"][low:high], when))
+
+    # Counts and totals for a time range, computed over the mapped columns
+    def summary(self, since=None, until=None):
+        records = self.between(since, until)
+        done = records["outcome"] == COMPLETED
+        by_skill = np.bincount(records["skill"][done], records["duration"][done], minlength=len(SKILLS) + 1)
+        return {
+            "sessions": len(records),
+            "completed": int(done.sum()),
+            "focus_seconds": int(records["duration"][done].sum()),
+            "by_skill": {name: int(by_skill[i]) for i, (name, _) in enumerate(SKILLS) if by_skill[i]},
+        }
+
+    # Focused seconds per local day for the `days` days up to and including `today`
+    def daily(self, days=7, today=None):
+        today = today or date.today()
+        first = today - timedelta(days=days - 1)
+        since = datetime.combine(first, datetime.min.time()).timestamp()
+        records = self.between(since, since + days * 86400 + 3600)  # An hour over in case DST shortens the span
+        done = records[records["outcome"] == COMPLETED]
+        day = local_days(done["start"]) - first.toordinal()
+        keep = (day >= 0) & (day < days)
+        return np.bincount(day[keep], done["duration"][keep], minlength=days)[:days]
+
+    # Consecutive days, ending today or yesterday, with at least one completed session.
+    # Read back one index block at a time from the newest, stopping at the first missing day
+    def streak(self, today=None):
+        today = today or date.today()
+        records = self.records()
+        latest = first = None
+        high = len(records)
+        while high > 0:
+            low = max(0, high - self.stride)
+            block = records[low:high]
+            high = low
+            starts = block["start"][block["outcome"] == COMPLETED]
+            if not len(starts):
+                continue
+            days = np.unique(local_days(starts))[::-1]
+            if latest is None:
+                if days[0] < today.toordinal() - 1:
+                    return 0
+                latest = first = days[0]
+            elif days[0] < first - 1:
+                break
+            # Newest first, a run steps down by exactly one day per position
+            gaps = np.nonzero(days != days[0] - np.arange(len(days)))[0]
+            if len(gaps):
+                first = days[gaps[0] - 1]
+                break
+            first = days[-1]
+        return 0 if latest is None else int(latest - first + 1)
+
+    def stats(self):
+        return {"records": self.count, "unsynced": self.unsynced, "syncs": self.syncs, "bytes": HEADER.size + self.count * RECORD.size}
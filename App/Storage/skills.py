@@ -0,0 +1,24 @@
+# Skill catalogue shared by the pages and the search index
+SKILLS = [
+    ("Wellness", "Focus on maintaining physical and mental well-being."),
+    ("Mental Health", "Strategies to improve emotional and psychological resilience."),
+    ("Career", "Tips and tools for professional growth and success."),
+    ("Fitness", "Activities and routines to stay physically active and healthy."),
+    ("Habits", "Focused on Home and domestic chores"),
+]
+
+# Candidate tasks for the home page recommendations: (title, skill, kind, best hour of day)
+TASKS = [
+    ("Complete 5 tasks today", "Habits", "task", 9),
+    ("Do a 30-minute workout", "Fitness", "workout", 7),
+    ("Read 10 pages of a book", "Career", "task", 21),
+    ("Meditate for 10 minutes", "Mental Health", "task", 8),
+    ("Go for a 20-minute walk", "Wellness", "workout", 12),
+    ("Plan tomorrow's priorities", "Career", "task", 18),
+    ("Stretch for 5 minutes", "Fitness", "workout", 15),
+    ("Drink a glass of water", "Wellness", "task", 10),
+    ("Journal three good things", "Mental Health", "task", 22),
+    ("Tidy one room", "Habits", "task", 17),
+    ("Update your resume", "Career", "task", 14),
+    ("Cook a healthy meal", "Wellness", "task", 19),
+]
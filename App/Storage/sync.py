@@ -0,0 +1,308 @@
+# Imports
+import http.client
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from Engine.settings import Config as cogs
+from Engine.http import HttpClient, HttpError
+from Storage.activities import Activity, COLUMNS
+
+logger = logging.getLogger("momentum.sync")
+
+NETWORK_ERRORS = (OSError, HttpError, http.client.HTTPException, ValueError, zlib.error)  # Expected while offline or on a bad reply
+FIELDS = COLUMNS[1:]  # Everything but the local id, which never leaves the device
+EDITABLE = COLUMNS[1:-1]  # What ActivityStore.update accepts
+
+SQL_LOG = "INSERT INTO changes (activity_id, op, fields, created) VALUES (?, ?, ?, ?)"
+SQL_VERSION = "SELECT uid, clock FROM versions WHERE activity_id = ?"
+SQL_VERSION_UID = "SELECT activity_id, clock FROM versions WHERE uid = ?"
+SQL_SAVE_VERSION = "INSERT OR REPLACE INTO versions (activity_id, uid, clock) VALUES (?, ?, ?)"
+SQL_PENDING = "SELECT seq, activity_id, op, fields FROM changes ORDER BY seq"
+SQL_BATCH = (
+    "SELECT seq, activity_id, op, fields FROM changes WHERE activity_id IN "
+    "(SELECT activity_id FROM changes GROUP BY activity_id ORDER BY MIN(seq) LIMIT ?) ORDER BY seq"
+)
+SQL_ACK = "DELETE FROM changes WHERE activity_id = ? AND seq <= ?"
+
+# Version vectors are {replica: counter}; a change supersedes another only if it has seen all of it
+def compare(a, b):
+    replicas = a.keys() | b.keys()
+    ahead = any(a.get(r, 0) > b.get(r, 0) for r in replicas)
+    behind = any(a.get(r, 0) < b.get(r, 0) for r in replicas)
+    if ahead and behind:
+        return "concurrent"
+    return "after" if ahead else "before" if behind else "equal"
+
+def merge(a, b):
+    return {r: max(a.get(r, 0), b.get(r, 0)) for r in a.keys() | b.keys()}
+
+# Concurrent edits: the later write wins the whole record; ties go to the writer with the higher replica id so every side agrees
+def wins(updated, replica, other_updated, other_replica):
+    return (updated or 0, replica or "") > (other_updated or 0, other_replica or "")
+
+# One activity's log entries as a single delta: add+update -> add, update+delete -> delete, add+delete -> nothing
+def fold(entries):
+    op, fields = None, {}
+    for entry_op, entry_fields in entries:
+        if entry_op == "delete":
+            return None if op == "add" else ("delete", entry_fields)
+        op = op or entry_op
+        fields.update(entry_fields)
+    return op, fields
+
+class ChangeLog:
+    # Every local edit is appended to the `changes` table inside the edit's own transaction
+    def __init__(self, store):
+        self.store = store
+        self.conn = store.conn
+        self.local = threading.local()
+        self.loop = None  # Listeners for applied remote changes run on this loop; inline when it is not running
+        self.replica = self.state("replica")
+        if self.replica is None:
+            self.replica = uuid.uuid4().hex[:12]
+            self.set_state("replica", self.replica)
+        store.journal = self.record
+
+    def state(self, key, default=None):
+        with self.store.lock:
+            row = self.conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_state(self, key, value):
+        with self.store.lock:
+            self.conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def attach(self, loop):
+        self.loop = loop
+
+    # Store listeners for remote changes (page invalidation, search, badges) belong on the event loop
+    def deliver(self, fan_out, events):
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(fan_out, events)
+        else:
+            fan_out(events)
+
+    # Writes made while applying remote changes are not logged again
+    @contextmanager
+    def applying(self):
+        self.local.applying = True
+        try:
+            yield
+        finally:
+            self.local.applying = False
+
+    # ActivityStore journal; the log row and the edit commit or roll back together
+    def record(self, event, old, new):
+        if getattr(self.local, "applying", False):
+            return
+        if event == "add":
+            activity = new
+            fields = {name: getattr(new, name) for name in FIELDS}
+        elif event == "update":
+            activity = new
+            fields = {name: getattr(new, name) for name in FIELDS if getattr(new, name) != getattr(old, name)}
+        else:
+            activity = old
+            fields = {"updated": time.time()}
+        self.conn.execute(SQL_LOG, (activity.id, event, json.dumps(fields), time.time()))
+        uid, clock = self.version(activity.id)
+        clock[self.replica] = clock.get(self.replica, 0) + 1
+        self.conn.execute(SQL_SAVE_VERSION, (activity.id, uid, json.dumps(clock)))
+
+    # (uid, clock) for a local activity; rows logged before sync existed get theirs on first use
+    def version(self, activity_id):
+        row = self.conn.execute(SQL_VERSION, (activity_id,)).fetchone()
+        if row is not None:
+            return row[0], json.loads(row[1])
+        uid, clock = uuid.uuid4().hex, {self.replica: 1}
+        self.conn.execute(SQL_SAVE_VERSION, (activity_id, uid, json.dumps(clock)))
+        return uid, clock
+
+    def pending(self):
+        with self.store.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM changes").fetchone()[0]
+
+    # Deltas for the `limit` oldest pending activities, all of each one's entries folded together.
+    # Returns [(delta or None, activity_id, last seq)]; pass it to acknowledge() once the server has it.
+    def batch(self, limit=cogs.SYNC_BATCH):
+        with self.store.batch():
+            grouped = {}
+            for seq, activity_id, op, fields in self.conn.execute(SQL_BATCH, (limit,)).fetchall():
+                entries, _ = grouped.get(activity_id, ([], 0))
+                entries.append((op, json.loads(fields)))
+                grouped[activity_id] = (entries, seq)
+            batch = []
+            for activity_id, (entries, last) in grouped.items():
+                folded = fold(entries)
+                delta = None
+                if folded is not None:
+                    op, fields = folded
+                    uid, clock = self.version(activity_id)
+                    delta = {"uid": uid, "op": op, "fields": fields, "clock": clock, "updated": fields.get("updated"), "replica": self.replica}
+                batch.append((delta, activity_id, last))
+        return batch
+
+    # Drop what the server now has; entries logged after the batch was read stay
+    def acknowledge(self, batch):
+        with self.store.batch():
+            self.conn.executemany(SQL_ACK, [(activity_id, last) for _, activity_id, last in batch])
+
+    # Fold the whole log to one entry per activity, e.g. after a long time offline
+    def compact(self):
+        with self.store.batch():
+            grouped = {}
+            rows = self.conn.execute(SQL_PENDING).fetchall()
+            for seq, activity_id, op, fields in rows:
+                grouped.setdefault(activity_id, []).append((op, json.loads(fields)))
+            self.conn.execute("DELETE FROM changes")
+            kept = 0
+            for activity_id, entries in grouped.items():
+                folded = fold(entries)
+                if folded is not None:
+                    kept += 1
+                    self.conn.execute(SQL_LOG, (activity_id, folded[0], json.dumps(folded[1]), time.time()))
+        return len(rows) - kept
+
+    # Merge a server document ({uid, fields, clock, deleted, updated, replica}) into the local store;
+    # replica is whoever wrote the document's current fields
+    def apply(self, doc):
+        remote = doc["clock"]
+        with self.store.batch(self.deliver), self.applying():
+            row = self.conn.execute(SQL_VERSION_UID, (doc["uid"],)).fetchone()
+            if row is None:
+                if doc["deleted"]:
+                    return "stale"
+                activity_id = self.store.add(Activity(**{name: doc["fields"][name] for name in FIELDS if name in doc["fields"]}))
+                self.conn.execute(SQL_SAVE_VERSION, (activity_id, doc["uid"], json.dumps(remote)))
+                return "added"
+            activity_id, clock = row[0], json.loads(row[1])
+            relation = compare(remote, clock)
+            if relation in ("before", "equal"):
+                return "stale"
+            local = self.store.get(activity_id)
+            if relation == "concurrent":
+                if not wins(doc.get("updated"), doc.get("replica"), local.updated if local else time.time(), self.replica):
+                    # Ours stands; a clock past both makes the server take it, so log the full record again
+                    clock = merge(clock, remote)
+                    clock[self.replica] = clock.get(self.replica, 0) + 1
+                    self.conn.execute(SQL_SAVE_VERSION, (activity_id, doc["uid"], json.dumps(clock)))
+                    if local is not None:
+                        fields = {name: getattr(local, name) for name in FIELDS}
+                        self.conn.execute(SQL_LOG, (activity_id, "update", json.dumps(fields), time.time()))
+                    return "kept"
+                self.conn.execute("DELETE FROM changes WHERE activity_id = ?", (activity_id,))
+            if doc["deleted"]:
+                self.store.delete(activity_id)
+            elif local is not None:
+                self.store.update(activity_id, **{name: doc["fields"][name] for name in EDITABLE if name in doc["fields"]})
+            else:
+                # Deleted here but edited remotely, and the edit won: bring it back under a new local id
+                self.conn.execute("DELETE FROM versions WHERE activity_id = ?", (activity_id,))
+                activity_id = self.store.add(Activity(**{name: doc["fields"][name] for name in FIELDS if name in doc["fields"]}))
+            self.conn.execute(SQL_SAVE_VERSION, (activity_id, doc["uid"], json.dumps(merge(clock, remote))))
+        return "applied"
+
+class SyncWorker:
+    # Pushes the change log and pulls remote edits on its own thread; the UI only ever writes to SQLite
+    def __init__(self, log, client=None, delay=cogs.SYNC_DELAY, interval=cogs.SYNC_INTERVAL, backoff_max=cogs.SYNC_BACKOFF_MAX):
+        self.log = log
+        self.client = client  # None: offline-only, the log is still kept and compacted
+        self.delay = delay
+        self.interval = interval
+        self.backoff_max = backoff_max
+        self.thread = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.failures = 0
+        self.pushed = 0
+        self.pulled = 0
+        self.conflicts = 0
+        self.last_error = None
+
+    @classmethod
+    def for_store(cls, store):
+        client = HttpClient(cogs.SYNC_URL, cogs.HTTP_POOL_SIZE) if cogs.SYNC_URL else None
+        return cls(ChangeLog(store), client)
+
+    # Hand store listeners for pulled changes to the page loop
+    def attach(self, loop):
+        self.log.attach(loop)
+
+    def start(self):
+        if self.thread is None:
+            self.log.store.subscribe(self.on_change)
+            self.thread = threading.Thread(target=self.run, name="sync", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def on_change(self, event, old, new):
+        self._wake.set()
+
+    # Exponential with jitter so many offline clients do not retry in lockstep
+    def backoff(self):
+        return min(self.backoff_max, self.delay * 2 ** self.failures) * random.uniform(0.5, 1.0)
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                self.sync()
+            except Exception as error:
+                # Anything else (a bad document, a store error) is a bug worth a traceback, but must not end the thread
+                self.failures += 1
+                self.last_error = error
+                wait = self.backoff()
+                logger.warning("Sync failed (%s), retrying in %.0fs", error, wait, exc_info=not isinstance(error, NETWORK_ERRORS))
+                self._stop.wait(wait)
+                continue
+            self.failures = 0
+            self._wake.wait(self.interval)
+            self._stop.wait(self.delay)  # Let a burst of edits land in one batch
+            self._wake.clear()
+
+    def sync(self):
+        if self.log.pending() > cogs.SYNC_COMPACT:
+            self.log.compact()
+        if self.client is None:
+            return
+        self.push()
+        self.pull()
+
+    def push(self):
+        while True:
+            batch = self.log.batch(cogs.SYNC_BATCH)
+            if not batch:
+                return
+            deltas = [delta for delta, _, _ in batch if delta is not None]
+            if deltas:
+                reply = self.client.request("POST", "/push", {"replica": self.log.replica, "changes": deltas}, compress=True)
+                for result in reply["results"]:
+                    if result["status"] != "ok":
+                        self.conflicts += result["status"] == "conflict"
+                        self.log.apply(result["doc"])
+                self.pushed += len(deltas)
+            self.log.acknowledge(batch)
+
+    def pull(self):
+        since = int(self.log.state("cursor", 0))
+        reply = self.client.request("GET", f"/pull?since={since}")
+        for doc in reply["changes"]:
+            if self.log.apply(doc) != "stale":
+                self.pulled += 1
+        self.log.set_state("cursor", reply["seq"])
+
+    def stats(self):
+        return {
+            "pending": self.log.pending(),
+            "pushed": self.pushed,
+            "pulled": self.pulled,
+            "conflicts": self.conflicts,
+            "failures": self.failures,
+        }
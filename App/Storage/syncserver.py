@@ -0,0 +1,110 @@
+# Imports
+import json
+import random
+import threading
+import urllib.parse
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from Engine.settings import Config as cogs
+from Storage.sync import compare, merge, wins
+
+# Local stand-in for the sync service: python -m Storage.syncserver [fail rate] from App/, then MOMENTUM_SYNC_URL=http://127.0.0.1:8766
+class SyncState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.docs = {}  # uid -> {uid, fields, clock, deleted, updated, replica, seq}
+        self.seq = 0
+
+    # "ok": taken as is; "merged": won a concurrent edit, doc has the combined result; "conflict": lost, doc is the winner
+    def push(self, change):
+        with self.lock:
+            doc = self.docs.get(change["uid"])
+            if doc is None:
+                doc = {"uid": change["uid"], "fields": {}, "clock": {}, "deleted": False, "updated": 0, "replica": "", "seq": 0}
+            relation = compare(change["clock"], doc["clock"])
+            if relation == "equal":
+                return {"uid": doc["uid"], "status": "ok", "doc": None}  # A retried push
+            won = relation == "after" or relation == "concurrent" and wins(change["updated"], change.get("replica"), doc["updated"], doc["replica"])
+            if won:
+                if change["op"] == "delete":
+                    doc["deleted"] = True
+                else:
+                    doc["fields"].update(change["fields"])
+                    doc["deleted"] = False
+                doc["updated"] = change["updated"] or doc["updated"]
+                doc["replica"] = change.get("replica", "")
+            doc["clock"] = merge(doc["clock"], change["clock"])
+            self.seq += 1
+            doc["seq"] = self.seq
+            self.docs[doc["uid"]] = doc
+            status = "ok" if relation == "after" else "merged" if won else "conflict"
+            return {"uid": doc["uid"], "status": status, "doc": None if status == "ok" else doc}
+
+    def pull(self, since):
+        with self.lock:
+            return [doc for doc in self.docs.values() if doc["seq"] > since], self.seq
+
+class DevSyncHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = SyncState()
+    fail_rate = 0.0  # Share of requests answered 503, to exercise retry and backoff
+
+    def send_json(self, status, data):
+        body = json.dumps(data, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if "deflate" in self.headers.get("Accept-Encoding", ""):
+            body = zlib.compress(body)
+            self.send_header("Content-Encoding", "deflate")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.headers.get("Content-Encoding") == "deflate":
+            body = zlib.decompress(body)
+        return json.loads(body) if body else {}
+
+    def flaky(self):
+        if random.random() < self.fail_rate:
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            self.send_json(503, {"error": "try again"})
+            return True
+        return False
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path != "/pull":
+            return self.send_json(404, {"error": "not found"})
+        if self.flaky():
+            return
+        since = int(urllib.parse.parse_qs(url.query).get("since", ["0"])[0])
+        changes, seq = self.state.pull(since)
+        self.send_json(200, {"changes": changes, "seq": seq})
+
+    def do_POST(self):
+        if self.path != "/push":
+            return self.send_json(404, {"error": "not found"})
+        if self.flaky():
+            return
+        body = self.read_json()
+        self.send_json(200, {"results": [self.state.push(change) for change in body["changes"]]})
+
+    def log_message(self, format, *args):
+        pass
+
+# Serve on a background thread; port 0 picks a free port (server.server_port).
+# Each server gets its own state, and server.RequestHandlerClass.fail_rate can be changed while it runs
+def start_sync_server(port=0, host="127.0.0.1", fail_rate=0.0):
+    handler = type("DevSyncHandler", (DevSyncHandler,), {"state": SyncState(), "fail_rate": fail_rate})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="dev-sync", daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    import sys
+    DevSyncHandler.fail_rate = float(sys.argv[1]) if len(sys.argv) > 1 else 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", cogs.SYNC_DEV_PORT), DevSyncHandler)
+    print(f"Dev sync server on http://127.0.0.1:{cogs.SYNC_DEV_PORT} (fail rate {DevSyncHandler.fail_rate:.0%})")
+    server.serve_forever()
@@ -0,0 +1,72 @@
+# Imports
+import json
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from Engine.settings import Config as cogs
+
+# Local stand-in for the auth service: python -m User.devserver from App/, then MOMENTUM_AUTH_URL=http://127.0.0.1:8765
+USERS = {
+    "demo": {"password": "demo", "profile": {"id": 1, "name": "Blabber Fatmouth", "role": "Novice"}},
+}
+
+class DevAuthHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so the app's pooled connections get reused
+    tokens = {}  # token -> username
+    lock = threading.Lock()
+
+    def send_json(self, status, data=None):
+        body = json.dumps(data).encode() if data is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def user(self):
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        with self.lock:
+            return self.tokens.get(token), token
+
+    def do_GET(self):
+        if self.path != "/profile":
+            return self.send_json(404, {"error": "not found"})
+        username, _ = self.user()
+        if username is None:
+            return self.send_json(401, {"error": "not logged in"})
+        self.send_json(200, USERS[username]["profile"])
+
+    def do_POST(self):
+        body = self.read_json()
+        if self.path == "/login":
+            user = USERS.get(body.get("username"))
+            if user is None or user["password"] != body.get("password"):
+                return self.send_json(401, {"error": "bad credentials"})
+            token = secrets.token_urlsafe(16)
+            with self.lock:
+                self.tokens[token] = body["username"]
+            return self.send_json(200, {"token": token})
+        if self.path == "/logout":
+            _, token = self.user()
+            with self.lock:
+                self.tokens.pop(token, None)
+            return self.send_json(204)
+        self.send_json(404, {"error": "not found"})
+
+    def log_message(self, format, *args):
+        pass
+
+# Serve on a background thread; port 0 picks a free port (server.server_port)
+def start_dev_server(port=0, host="127.0.0.1"):
+    server = ThreadingHTTPServer((host, port), DevAuthHandler)
+    threading.Thread(target=server.serve_forever, name="dev-auth", daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", cogs.AUTH_DEV_PORT), DevAuthHandler)
+    print(f"Dev auth server on http://127.0.0.1:{cogs.AUTH_DEV_PORT} (user demo / demo)")
+    server.serve_forever()
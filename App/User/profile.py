@@ -1,20 +1,25 @@
 import flet as ft
-from Engine.themes import ThemeFactory
+from Engine.themes import ThemeFactory, ThemeBinder
+from User.session import Session
 
 class ProfilePage:
-    def __init__(self, current_theme):
-        self.current_theme = ThemeFactory.dark_theme() if current_theme == "dark" else ThemeFactory.light_theme()
+    def __init__(self, current_theme, binder=None, session=None):
+        self.current_theme = ThemeFactory.resolve(current_theme)
+        self.binder = binder or ThemeBinder(self.current_theme)
+        self.session = session or Session.default()
 
     def build(self):
+        name = self.session.bind(ft.Text(size=18), lambda text, profile: setattr(text, "value", f"Name: {profile.name}"))
+        role = self.session.bind(ft.Text(size=18), lambda text, profile: setattr(text, "value", f"Role: {profile.role}"))
         return ft.Container(
             content=ft.Column(
                 [
-                    ft.Text("User Profile", size=24, weight=ft.FontWeight.BOLD, color=self.current_theme.text_color),
-                    ft.Text("Name: Blabber Fatmouth", size=18, color=self.current_theme.text_color),
-                    ft.Text("Role: Novice", size=18, color=self.current_theme.text_color)
+                    self.binder.bind(ft.Text("User Profile", size=24, weight=ft.FontWeight.BOLD), color="text_color"),
+                    self.binder.bind(name, color="text_color"),
+                    self.binder.bind(role, color="text_color"),
                 ],
                 alignment=ft.MainAxisAlignment.CENTER,
                 spacing=20,
             ),
             expand=True,
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,181 @@
+# Imports
+import logging
+import threading
+import time
+from Engine.settings import Config as cogs
+from Engine.loader import Loader
+from Engine.http import HttpClient, HttpError
+from Engine.updates import Bindings
+
+logger = logging.getLogger("momentum.session")
+
+STORAGE_KEY = "momentum.session"
+
+class Profile:
+    FIELDS = ("id", "name", "role", "avatar_url")
+    __slots__ = FIELDS + ("fetched_at",)
+
+    def __init__(self, id=None, name="Guest", role="Novice", avatar_url=None, fetched_at=0.0):
+        self.id = id
+        self.name = name
+        self.role = role
+        self.avatar_url = avatar_url
+        self.fetched_at = fetched_at  # Wall-clock time, so the TTL holds across restarts
+
+    @classmethod
+    def from_dict(cls, data, fetched_at=None):
+        values = {field: data[field] for field in cls.FIELDS if data.get(field) is not None}
+        return cls(**values, fetched_at=data.get("fetched_at", 0.0) if fetched_at is None else fetched_at)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def age(self, now=None):
+        return (now or time.time()) - self.fetched_at
+
+    def same(self, other):
+        return other is not None and all(getattr(self, field) == getattr(other, field) for field in self.FIELDS)
+
+GUEST = Profile()
+
+class LocalBackend:
+    # In-process stand-in used when no auth server is configured
+    def __init__(self, profile=None):
+        self.profile = profile or {"id": 1, "name": "Blabber Fatmouth", "role": "Novice"}
+
+    def login(self, username, password):
+        return "local"
+
+    def fetch_profile(self, token):
+        return dict(self.profile)
+
+    def logout(self, token):
+        pass
+
+class HttpBackend:
+    def __init__(self, base_url, client=None):
+        self.client = client or HttpClient(base_url, cogs.HTTP_POOL_SIZE)
+
+    def login(self, username, password):
+        return self.client.request("POST", "/login", {"username": username, "password": password})["token"]
+
+    def fetch_profile(self, token):
+        return self.client.request("GET", "/profile", token=token)
+
+    def logout(self, token):
+        self.client.request("POST", "/logout", token=token)
+
+class Session:
+    _default = None
+
+    # storage is flet's client_storage (or anything with get/set/remove); its calls block, so they run on the loader
+    def __init__(self, backend, storage=None, loader=None, ttl=cogs.PROFILE_TTL):
+        self.backend = backend
+        self.storage = storage
+        self.loader = loader or Loader.default()
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.token = None
+        self.profile = GUEST
+        self.logged_out = False  # After logout or a rejected token; revalidation stays off until login()
+        self._revalidating = False
+        self.bindings = Bindings()
+
+    @classmethod
+    def for_page(cls, page, loader=None):
+        backend = HttpBackend(cogs.AUTH_URL) if cogs.AUTH_URL else LocalBackend()
+        return cls(backend, page.client_storage, loader)
+
+    @classmethod
+    def default(cls):
+        if cls._default is None:
+            cls._default = cls(LocalBackend())
+        return cls._default
+
+    # render(control, profile) runs now with the cached profile and again whenever it changes
+    def bind(self, control, render):
+        render(control, self.profile)
+        self.revalidate()
+        return self.bindings.add(control, render)
+
+    def _publish(self, profile):
+        previous, self.profile = self.profile, profile
+        if profile.same(previous):
+            return
+        self.bindings.render(profile)
+
+    # Show what client storage had from the last run, then revalidate if it is older than the TTL
+    def restore(self):
+        if self.storage is None:
+            self.revalidate()
+            return
+        self.loader.submit(lambda: self.storage.get(STORAGE_KEY), self._restored, self._restore_failed)
+
+    def _restored(self, data):
+        if data and data.get("logged_out"):
+            self.logged_out = True
+            self.bindings.render(self.profile)  # The profile is still Guest, but the Login/Logout item changes
+        elif data:
+            self.token = data.get("token")
+            profile = Profile.from_dict(data.get("profile") or {})
+            if profile.fetched_at > self.profile.fetched_at:
+                self._publish(profile)
+        self.revalidate()
+
+    def _restore_failed(self, error):
+        logger.warning("Could not read the cached session: %s", error)
+        self.revalidate()
+
+    # Stale-while-revalidate: the cached profile stays on screen while a fresh one loads
+    def revalidate(self, force=False):
+        with self.lock:
+            if self._revalidating or self.logged_out or (not force and self.profile.age() < self.ttl):
+                return
+            self._revalidating = True
+        self.loader.submit(self._fetch, self._fetched, self._fetch_failed)
+
+    def _fetch(self):
+        if self.token is None and cogs.AUTH_USER:
+            self.token = self.backend.login(cogs.AUTH_USER, cogs.AUTH_PASSWORD)
+        return self.backend.fetch_profile(self.token)
+
+    def _fetched(self, data):
+        with self.lock:
+            self._revalidating = False
+        if self.logged_out:
+            return  # Logged out while the fetch was in flight
+        profile = Profile.from_dict(data, fetched_at=time.time())
+        self._publish(profile)
+        self.profile = profile  # Keep the new timestamp even when nothing visible changed
+        self._persist()
+
+    def _fetch_failed(self, error):
+        with self.lock:
+            self._revalidating = False
+        if isinstance(error, HttpError) and error.status == 401:
+            self._sign_out()
+            return
+        logger.warning("Profile revalidation failed, keeping the cached profile: %s", error)
+
+    def _persist(self):
+        if self.storage is not None:
+            data = {"token": self.token, "profile": self.profile.to_dict()}
+            self.loader.submit(lambda: self.storage.set(STORAGE_KEY, data), on_error=lambda error: logger.warning("Could not cache the session: %s", error))
+
+    def logout(self):
+        token = self.token
+        if token is not None:
+            self.loader.submit(lambda: self.backend.logout(token), on_error=lambda error: logger.warning("Logout failed: %s", error))
+        self._sign_out()
+
+    # Guest until login(); the flag is cached too, so a restart does not sign back in either
+    def _sign_out(self):
+        self.token = None
+        self.logged_out = True
+        self._publish(GUEST)
+        if self.storage is not None:
+            self.loader.submit(lambda: self.storage.set(STORAGE_KEY, {"logged_out": True}), on_error=lambda error: logger.warning("Could not cache the session: %s", error))
+
+    def login(self):
+        self.logged_out = False
+        self.revalidate(force=True)
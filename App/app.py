@@ -1,47 +1,164 @@
 # Imports
 import flet as ft
-from Engine.themes import ThemeFactory
+from Engine.themes import ThemeFactory, ThemeBinder
 from Components.header import Header
 from Components.nav import NavigationBar
 from Engine.page import Page
+from Engine.cache import ViewCache, ViewFrame
+from Engine.routes import registry
+from Engine.settings import Config as cogs
+from Storage.activities import ActivityStore
+from Engine.search import SearchIndex
+from Engine.timer import TimerScheduler
+from Storage.progress import ProgressAggregates
+from Engine.images import ImageCache
+from Engine.metrics import metrics
+from Engine.memory import memory
+from Engine.updates import UpdateScheduler
+from Engine.loader import Loader
+from User.session import Session
+from Engine.notifications import NotificationCenter
+from Storage.sync import SyncWorker
+from Engine.recommend import Recommender
+from Storage.sessions import SessionLog
+from Storage.rollups import RollupStore
+from Storage.recurrence import Schedule
+from Engine.reminders import Reminders
+from Engine.focus import FocusState
 
 class MomentumApp(Page):
     def __init__(self, page):
         self.page = page
         self.build(self.page)
+        # Shared pool for blocking work; results come back on the flet event loop
+        self.loader = Loader.default()
+        self.current_route = None
+        # Handlers request updates here; each action reaches the client as one diff
+        self.updates = UpdateScheduler.of(self.page)
+        # Profile shared by the header, home and profile pages; cached in memory and client storage
+        self.session = Session.for_page(self.page, self.loader)
+        # Behind the header bell; bursts of posts coalesce into one badge redraw
+        self.notifications = NotificationCenter.default()
         self.current_theme = ThemeFactory.dark_theme()
-        self.header = Header(self, self.current_theme)
-        self.navigation_bar = NavigationBar(self, self.current_theme)
-        # This will hold the dynamic page content
-        self.content_container = ft.Container(expand=True)
+        # Tracks every theme-coloured control so a theme switch can patch them in place
+        self.themes = ThemeBinder(self.current_theme)
+        self.navigation_bar = NavigationBar(self, self.current_theme, self.themes)
+        # Cached views stay mounted here, each in a ViewFrame, and only the current one is visible,
+        # so switching back to a tab sends two visibility flags rather than its whole tree
+        self.mounted = ft.Column(expand=True, spacing=0)
+        self.content_container = ft.Container(self.mounted, expand=True)
+        self.frames = {}  # id(view) -> ViewFrame
+        self.current_view = None
+        # Built page contents, reused when switching back to a tab; bounded by count and by controls held
+        self.view_cache = ViewCache(cogs.VIEW_CACHE_SIZE, cogs.VIEW_CACHE_CONTROLS, on_drop=self.unmount)
+        self.search = SearchIndex()
+        self.progress = ProgressAggregates()
+        # Scores are cached; store events adjust the counters and rescore in one vectorized pass
+        self.recommender = Recommender()
+        # Completions per skill by day, week, month and year for the skills charts
+        self.rollups = RollupStore()
+        # One scheduler task drives every focus timer
+        self.timers = TimerScheduler()
+        # Filled in by open(), which touches the disk and so runs on the loader while a skeleton is on screen
+        self.images = None
+        self.header = None
+        self.store = None
+        self.schedule = None
+        self.reminders = None
+        self.sync = None
+        self.sessions = None
+        self.focus = None
+
+    # The SQLite store and its migrations, the thumbnail cache scan, the sync state and the session log.
+    # run() calls this on the loader pool; nothing reads these attributes until it returns
+    def open(self):
+        self.images = ImageCache.default()
+        self.header = Header(self, self.current_theme, self.themes)
+        self.store = ActivityStore.default()
+        self.store.subscribe(lambda event, old, new: self.invalidate_route("/activities"))
+        self.store.subscribe(self.search.on_store_change)
+        self.store.subscribe(self.progress.apply)
+        self.store.subscribe(self.recommender.apply)
+        self.store.subscribe(self.rollups.apply)
+        # Recurring activities are stored as rules and expanded per viewed week
+        self.schedule = Schedule(self.store)
+        # Due-date reminders share one timer wheel and one task, feeding the header badge
+        self.reminders = Reminders(self.store, self.notifications, self.loader)
+        self.store.subscribe(self.reminders.apply)
+        # Every edit lands in the change log with it; the worker pushes batches when there is a network
+        self.sync = SyncWorker.for_store(self.store)
+        # Finished focus sessions, appended as fixed-width records and read back through mmap
+        self.sessions = SessionLog.default()
+        # The focus timer lives here, not in the cached FocusPage, so rebuilding the page never leaves one running unseen
+        self.focus = FocusState(self.timers, self.notifications, self.sessions, self.loader)
+        return self
 
     def route_change(self, route):
-        # Get the content control for the current route
-        context = self.get_content_for_route(self.page.route)
-        self.content_container.content = context
-        self.page.update()
+        with metrics.timer("route", path=self.page.route), self.updates.batch():
+            previous, self.current_route = self.current_route, self.page.route
+            if previous != self.current_route and self.loader.cancel(previous):
+                # The page we left was still loading; rebuild it on the next visit
+                self.view_cache.invalidate(previous)
+            self.show_view(self.get_content_for_route(self.page.route))
+            # Keep the selected tab in sync for routes reached without the nav bar
+            index = registry.index_for_path(self.page.route)
+            if index is not None and self.navigation_bar.navigation_bar:
+                self.navigation_bar.navigation_bar.selected_index = index
+            self.updates.request()
+
+    # Runs on the event loop; anything slow in a page goes through the loader
+    async def on_route_change(self, e):
+        self.route_change(e.route)
+
+    # page.go() without its separate update: the route and the new content go out together
+    def navigate(self, path):
+        self.page.route = path
+        self.route_change(path)
+
+    def show_view(self, view):
+        previous, self.current_view = self.current_view, view
+        if previous is not None and not self.view_cache.holds(previous):
+            self.unmount(previous)
+        frame = self.frames.get(id(view))
+        if frame is None:
+            frame = self.frames[id(view)] = ViewFrame(view)
+            self.mounted.controls.append(frame)
+        for control in self.mounted.controls:
+            control.visible = control is frame
+
+    # Views dropped from the cache leave the column; the one on screen stays until another replaces it
+    def unmount(self, view):
+        if view is not self.current_view and id(view) in self.frames:
+            self.mounted.controls.remove(self.frames.pop(id(view)))
 
     def get_content_for_route(self, route):
-        if route == "/activities":
-            from Pages.activities import ActivitiesPage
-            return ActivitiesPage(self.page).build()
-        elif route == "/focus":
-            from Pages.focus import FocusPage
-            return FocusPage(self.page).build()
-        elif route == "/skills":
-            from Pages.skills import SkillsPage
-            return SkillsPage(self.page).build()
-        elif route == "/profile":
-            from User.profile import ProfilePage
-            return ProfilePage(self.page).build()
+        return self.view_cache.get(route, self.current_theme, lambda: self.build_content_for_route(route))
+
+    # Call when a page's data changes so its next visit rebuilds
+    def invalidate_route(self, route=None):
+        if route is None:
+            self.view_cache.invalidate_all()
         else:
-            from Pages.home import HomePage
-            return HomePage(self.page, self.navigation_bar.navigation_bar, self.current_theme).build()
+            self.view_cache.invalidate(route)
 
-    def run(self):
-        self.page.on_route_change = self.route_change
-        # Build the persistent layout
-        self.page.add(
+    def toggle_theme(self):
+        with metrics.timer("theme"):
+            previous = self.current_theme
+            self.current_theme = ThemeFactory.toggled(previous)
+            patched = self.themes.switch(self.current_theme)
+            self.view_cache.retheme(previous, self.current_theme)
+            self.page.bgcolor = self.current_theme.bgcolor
+            # The page diff stops at the view frames, so the patched views inside them go out too
+            self.updates.request()
+            self.updates.request(*self.mounted.controls)
+        metrics.record("controls theme", len(patched))
+
+    def build_content_for_route(self, route):
+        return registry.build(route, self)
+
+    # The persistent layout around the routed content
+    def layout(self):
+        return self.layout_engine.bind(
             ft.Column(
                 [
                     self.header.create_header(),
@@ -49,14 +166,53 @@ class MomentumApp(Page):
                     self.navigation_bar.get_navigation_bar_container(),
                 ],
                 expand=True,
-            )
+            ),
+            lambda column, layout: setattr(column, "width", layout.max_width),
         )
+
+    # Shown from the first frame until open() is done
+    def skeleton(self):
+        return ft.Container(ft.ProgressRing(), alignment=ft.Alignment(0, 0), expand=True)
+
+    def run(self):
+        if metrics.enabled:
+            metrics.instrument_page(self.page)
+            metrics.start_logging(cogs.METRICS_LOG_INTERVAL)
+        if memory.enabled:
+            # Views dropped from the cache but still reachable are logged with what holds them
+            memory.start(cogs.MEMORY_CHECK_INTERVAL)
+        self.loader.attach(self.page.loop)
+        self.notifications.attach(self.page.loop)
+        self.page.bgcolor = self.current_theme.bgcolor
+        self.page.add(self.skeleton())
+        self.loader.submit(self.open, self.opened)
+
+    # Back on the loop once open() has returned: swap the skeleton for the app and start its services
+    def opened(self, _):
+        self.page.on_route_change = self.on_route_change
+        self.timers.start(self.page)
+        self.reminders.start(self.page)
+        # Last run's profile first, then a refetch once it is older than PROFILE_TTL
+        self.session.restore()
+        self.sync.attach(self.page.loop)
+        self.sync.start()
+        self.page.controls[:] = [self.layout()]
         # Set initial content
         self.route_change(self.page.route)
         self.page.go('/')
+        # Index after the first paint; queries see partial results until it finishes
+        self.search.rebuild_async(self.store, self.loader.pool)
+        self.progress.load_async(self.store, self.loader.pool)
+        self.recommender.load_async(self.store, self.loader.pool)
+        self.rollups.load_async(self.store, self.loader.pool)
+        # Reminders missed while the app was closed fire as one batch on the first pass after this
+        self.reminders.load_async(self.loader.pool)
+
+async def start(page):
+    MomentumApp(page).run()
 
 def main():
-    ft.app(target=lambda page: MomentumApp(page).run())
+    ft.app(target=start, assets_dir="assets")
 
 if __name__ == "__main__":
     main()
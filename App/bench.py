@@ -0,0 +1,311 @@
+# Headless benchmarks: python bench.py [--save] [--repeat N]
+# Only --save when numbers move on purpose, so the baseline keeps catching drift between changes
+
+# Imports
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+# Keep the benchmark's database and thumbnails out of the user's data dir
+os.environ.setdefault("FLET_APP_STORAGE_DATA", tempfile.mkdtemp(prefix="momentum-bench-"))
+
+import flet as ft
+from flet.core.connection import Connection
+from flet.core.protocol import CommandEncoder, PageCommandResponsePayload, PageCommandsBatchResponsePayload
+from Engine.images import ImageCache
+from Engine.metrics import count_controls
+from Engine.memory import memory
+from Engine.routes import registry
+from Engine.builder import PageBuilder
+from Components.factory import Styles
+from Engine.updates import UpdateScheduler
+from Storage.activities import Activity
+from Storage.skills import SKILLS
+from app import MomentumApp
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+PREFACTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_prefactory.json")  # Recorded before Components/factory.py; never re-saved
+METRICS = ("time", "allocated", "controls", "payload")
+MIN_TIME_DELTA = 0.001  # Seconds; smaller slowdowns are timer noise
+KINDS = ("task", "event", "workout", "goal")
+
+def encode(commands):
+    return json.dumps(commands, cls=CommandEncoder, separators=(",", ":"))
+
+# Stand-in for the flet client: answers like it would and counts the bytes every update puts on the wire
+class BenchConnection(Connection):
+    def __init__(self):
+        super().__init__()
+        self.page_url = "http://localhost"
+        self.ids = itertools.count(1)
+        self.bytes = 0
+
+    def send_commands(self, session_id, commands):
+        self.bytes += len(encode(commands))
+        results = [" ".join(f"_{next(self.ids)}" for _ in command.commands) for command in commands if command.name == "add"]
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    def send_command(self, session_id, command):
+        self.bytes += len(encode(command))
+        return PageCommandResponsePayload(result="", error="")
+
+class OfflineImages(ImageCache):
+    # Thumbnails stay on the placeholder so runs never touch the network
+    def _download(self, key, url, width, height):
+        return None
+
+class Bench:
+    def __init__(self, repeat=20, activities=500):
+        self.repeat = repeat
+        self.results = {}
+        ImageCache._default = OfflineImages(os.path.join(os.environ["FLET_APP_STORAGE_DATA"], "assets"))
+        self.connection = BenchConnection()
+        # A live loop like flet's, so background loads and coalesced updates land the way they do in the app
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name="bench-loop", daemon=True).start()
+        self.page = ft.Page(self.connection, "bench", self.loop)
+        self.page.route = "/"
+        self.app = MomentumApp(self.page).open()  # run() opens it on the loader behind a skeleton
+        self.app.session.storage = None  # No client to answer client_storage calls; the profile stays in memory
+        self.app.loader.attach(self.loop)
+        self.app.progress.load(self.app.store)  # run() loads it in the background; store events keep it current from here
+        self.seed(activities)
+        self.page.on_route_change = self.app.route_change
+        self.page.add(self.app.layout())
+        self.builder = PageBuilder(self.app, self.page)
+
+    def seed(self, count):
+        store = self.app.store
+        if store.count("0000-01-01", "9999-12-31") < count:
+            monday = date.today() - timedelta(days=date.today().weekday())
+            store.add_many(
+                Activity(
+                    KINDS[i % len(KINDS)],
+                    f"Activity {i}",
+                    (monday + timedelta(days=i % 7)).isoformat(),
+                    skill=SKILLS[i % len(SKILLS)][0],
+                    goal=f"Goal {i % 10}" if i % 3 == 0 else None,
+                    status="done" if i % 4 == 0 else "open",
+                )
+                for i in range(count)
+            )
+        self.app.search.rebuild(store)
+        self.first_activity = next(store.iter_all(1)).id
+
+    # Wait for background loads and the updates they flush
+    def settle(self):
+        while self.app.loader.pending() or self.app.updates.pending():
+            while self.app.loader.pending():
+                time.sleep(0.0005)
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0), self.loop).result()
+
+    # Timed `repeat` times, then three more runs under tracemalloc for the size metrics.
+    # Time is the UI path only; allocations, controls and payload include the background fill.
+    # Payload is what went over the wire, or for pure builds what adding the result would send.
+    def measure(self, name, action, setup=None):
+        times = []
+        for _ in range(self.repeat):
+            if setup:
+                setup()
+                self.settle()
+            start = time.perf_counter()
+            action()
+            times.append(time.perf_counter() - start)
+            self.settle()
+        allocated = []
+        for _ in range(3):
+            if setup:
+                setup()
+                self.settle()
+            sent = self.connection.bytes
+            gc.collect()
+            tracemalloc.start()
+            result = action()
+            self.settle()
+            allocated.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            payload = self.connection.bytes - sent
+        if not payload and result is not None:
+            payload = len(encode(result._build_add_commands()))
+        self.results[name] = {
+            "time": min(times),
+            "median": statistics.median(times),
+            "allocated": min(allocated),
+            "controls": count_controls(result) if result is not None else 0,
+            "payload": payload,
+        }
+
+    def targets(self):
+        for route in registry.routes():
+            params = {name: str(self.first_activity) for name in route.params}
+            yield route, params, route.url(params)
+
+    def bench_builds(self):
+        ctx = self.builder.routes
+        for route, params, url in self.targets():
+            self.measure(f"build {url}", lambda: route.create(ctx, params).build())
+
+    def bench_handle_route(self):
+        routes = self.builder.routes
+        for route, params, url in self.targets():
+            self.measure(f"handle_route {url} cold", lambda: routes.handle_route(url), routes.view_cache.invalidate_all)
+            self.measure(f"handle_route {url} warm", lambda: routes.handle_route(url))
+
+    def bench_toggle_theme(self):
+        self.measure("PageBuilder.toggle_theme", lambda: self.builder.toggle_theme() or self.page.views[-1])
+        self.measure("MomentumApp.toggle_theme", lambda: self.app.toggle_theme() or self.page.views[0])
+
+    # Tab changes the way the nav bar drives them: from the previous tab, cold and from the view cache
+    def bench_route_change(self):
+        paths = [route.path for route in sorted(registry.routes(), key=lambda r: r.nav_index or 0) if route.nav_index is not None]
+        for previous, path in zip(paths[-1:] + paths[:-1], paths):
+            def navigate(path=path):
+                self.page.route = path
+                self.app.route_change(None)
+                return self.app.current_view
+
+            def arrive(previous=previous, path=path, cold=False):
+                navigate(previous)
+                if cold:
+                    self.app.invalidate_route(path)
+                self.page.route = path
+
+            self.measure(f"route_change {path} cold", navigate, lambda: arrive(cold=True))
+            self.measure(f"route_change {path} warm", navigate, arrive)
+
+    # Memory still held after `rounds` passes over every route with a cache flush and a theme switch each.
+    # A bounded app retains about the same after 10 rounds as after 100.
+    def soak(self, rounds):
+        memory.enable()
+        memory.grace = 0
+        urls = [url for _, _, url in self.targets()]
+
+        def cycle(count):
+            for _ in range(count):
+                for url in urls:
+                    self.page.route = url
+                    self.app.route_change(None)
+                    self.settle()
+                self.app.invalidate_route()
+                self.app.toggle_theme()
+                self.settle()
+
+        cycle(3)
+        gc.collect()
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        cycle(rounds)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - start
+        tracemalloc.stop()
+        return retained, memory.leaks(), memory.stats()
+
+    def run(self):
+        self.bench_builds()
+        self.bench_handle_route()
+        self.bench_toggle_theme()
+        self.bench_route_change()
+        return self.results
+
+def compare(results, baseline, time_threshold, size_threshold):
+    failures = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in METRICS:
+            old, new = previous.get(metric), current[metric]
+            if old is None:
+                continue
+            threshold = time_threshold if metric == "time" else size_threshold
+            if new > old * (1 + threshold) and (metric != "time" or new - old > MIN_TIME_DELTA):
+                failures.append(f"{name}: {metric} {old:g} -> {new:g} (+{(new / old - 1) * 100 if old else float('inf'):.0f}%)")
+    return failures
+
+def report(results, baseline):
+    lines = [f"{'benchmark':<40}{'time':>10}{'median':>10}{'alloc KB':>10}{'controls':>10}{'payload B':>11}{'vs base':>9}"]
+    for name, result in results.items():
+        previous = baseline.get(name, {}).get("time")
+        change = f"{(result['time'] / previous - 1) * 100:+.0f}%" if previous else "new"
+        lines.append(
+            f"{name:<40}{result['time'] * 1000:>8.2f}ms{result['median'] * 1000:>8.2f}ms"
+            f"{result['allocated'] / 1024:>10.1f}{result['controls']:>10}{result['payload']:>11}{change:>9}"
+        )
+    return "\n".join(lines)
+
+# Controls and bytes each case no longer builds or sends compared with the un-factored build
+def savings(results, baseline):
+    lines = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        controls = previous["controls"] - result["controls"]
+        payload = previous["payload"] - result["payload"]
+        if controls > 0 or payload > 0:
+            lines.append(f"{name:<40}{-controls:>+6} controls{-payload:>+8} bytes ({-payload / previous['payload'] * 100 if previous['payload'] else 0:+.0f}%)")
+    return "\n".join(["Saved vs the un-factored build:"] + lines) if lines else ""
+
+def main():
+    # A fixed hash seed keeps dict and set layouts, and so the allocation counts, repeatable
+    if os.environ.get("PYTHONHASHSEED") != "0":
+        os.execve(sys.executable, [sys.executable, *sys.argv], {**os.environ, "PYTHONHASHSEED": "0"})
+    parser = argparse.ArgumentParser(description="Benchmark page builds, navigation and theme switching without a display.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--activities", type=int, default=500, help="rows seeded into the activity store")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--savings-baseline", default=PREFACTORY, help="results to report savings against")
+    parser.add_argument("--soak", type=int, default=0, metavar="ROUNDS", help="navigate every route ROUNDS times and report retained memory instead")
+    parser.add_argument("--time-threshold", type=float, default=0.5, help="allowed fractional slowdown")
+    parser.add_argument("--size-threshold", type=float, default=0.10, help="allowed fractional growth of allocations, controls and payload")
+    args = parser.parse_args()
+
+    bench = Bench(args.repeat, args.activities)
+    if args.soak:
+        retained, leaks, stats = bench.soak(args.soak)
+        print(f"Retained after {args.soak} rounds: {retained / 1024:.1f} KB")
+        print(f"Tracked: {stats}")
+        for route, age in leaks:
+            print(f"LEAK view for {route} alive {age:.1f}s after release", file=sys.stderr)
+        return 1 if leaks else 0
+    results = bench.run()
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+    if baseline.get("activities", args.activities) != args.activities:
+        print(f"Baseline was recorded with {baseline['activities']} activities; sizes are not comparable", file=sys.stderr)
+    print(report(results, baseline.get("results", {})))
+    prefactory = {}
+    if os.path.exists(args.savings_baseline):
+        with open(args.savings_baseline) as handle:
+            prefactory = json.load(handle)
+    saved = savings(results, prefactory.get("results", {}))
+    if saved:
+        print(saved)
+    print(f"Interned styles: {Styles.stats()}")
+    print(f"Updates: {UpdateScheduler.of(bench.page).stats()}")
+
+    if args.save:
+        with open(args.baseline, "w") as handle:
+            json.dump({"flet": ft.version.version, "activities": args.activities, "results": results}, handle, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    failures = compare(results, baseline.get("results", {}), args.time_threshold, args.size_threshold)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
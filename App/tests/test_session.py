@@ -0,0 +1,65 @@
+# Imports
+from User.session import Session, LocalBackend, GUEST, STORAGE_KEY
+
+class InlineLoader:
+    # Runs work and its callback straight away, as the loader does when no event loop is running
+    def submit(self, work, on_done=None, on_error=None, scope=None):
+        try:
+            result = work()
+        except Exception as error:
+            if on_error is not None:
+                on_error(error)
+            return
+        if on_done is not None:
+            on_done(result)
+
+class MemoryStorage:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+def session(storage):
+    return Session(LocalBackend(), storage, InlineLoader())
+
+def test_logout_then_login_round_trip():
+    storage = MemoryStorage()
+    first = session(storage)
+    first.restore()
+    assert first.profile.name == "Blabber Fatmouth"
+
+    first.logout()
+    assert first.logged_out and first.profile is GUEST
+    assert storage.data[STORAGE_KEY] == {"logged_out": True}
+
+    # A restart stays logged out and does not fetch the profile again
+    second = session(storage)
+    second.restore()
+    assert second.logged_out and second.profile is GUEST
+
+    second.login()
+    assert not second.logged_out
+    assert second.profile.name == "Blabber Fatmouth"
+    assert storage.data[STORAGE_KEY]["profile"]["name"] == "Blabber Fatmouth"
+
+    # ...and the next restart is signed in
+    third = session(storage)
+    third.restore()
+    assert not third.logged_out and third.profile.name == "Blabber Fatmouth"
+
+def test_bound_controls_see_logout_and_login():
+    class Item:
+        page = None
+    seen = []
+    current = session(MemoryStorage())
+    item = Item()
+    current.bind(item, lambda item, profile: seen.append((current.logged_out, profile.name)))
+    seen.clear()
+    current.logout()
+    assert seen[-1] == (True, "Guest")
+    current.login()
+    assert seen[-1] == (False, "Blabber Fatmouth")
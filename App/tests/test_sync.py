@@ -0,0 +1,135 @@
+# Imports
+import time
+import pytest
+from Engine.http import HttpClient, HttpError
+from Storage.activities import ActivityStore, Activity
+from Storage.sync import ChangeLog, SyncWorker
+from Storage.syncserver import start_sync_server
+
+@pytest.fixture
+def server():
+    server = start_sync_server(0)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def replica(server):
+    url = f"http://127.0.0.1:{server.server_port}"
+    return SyncWorker(ChangeLog(ActivityStore(":memory:")), HttpClient(url), delay=0.01, interval=0.05, backoff_max=0.05)
+
+def titles(worker):
+    return sorted((activity.title, activity.status) for activity in worker.log.store.iter_all())
+
+def find(worker, title):
+    return next(activity for activity in worker.log.store.iter_all() if activity.title == title)
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.02)
+
+def test_push_and_pull(server):
+    a, b = replica(server), replica(server)
+    ids = [a.log.store.add(Activity("task", f"T{i}", "2026-10-18")) for i in range(5)]
+    a.log.store.update(ids[0], title="edited")
+    a.log.store.delete(ids[-1])
+    a.sync()
+    assert a.log.pending() == 0
+    b.sync()
+    assert titles(b) == titles(a) == [("T1", "open"), ("T2", "open"), ("T3", "open"), ("edited", "open")]
+    assert b.log.pending() == 0
+
+    # And back the other way
+    b.log.store.update(find(b, "T1").id, status="done")
+    b.sync()
+    a.sync()
+    assert titles(a) == titles(b)
+    assert a.log.store.get(ids[1]).status == "done"
+
+def test_concurrent_edits_take_the_later_write_on_both_sides(server):
+    a, b = replica(server), replica(server)
+    activity_id = a.log.store.add(Activity("task", "Shared", "2026-10-18"))
+    a.sync()
+    b.sync()
+    a.log.store.update(activity_id, title="from A")
+    time.sleep(0.01)
+    b.log.store.update(find(b, "Shared").id, title="from B", status="done")
+    a.sync()
+    b.sync()
+    a.sync()
+    assert titles(a) == titles(b) == [("from B", "done")]
+    assert b.conflicts == 0 and a.log.pending() == b.log.pending() == 0
+
+def test_concurrent_edits_where_the_earlier_pusher_wins(server):
+    a, b = replica(server), replica(server)
+    activity_id = a.log.store.add(Activity("task", "Shared", "2026-10-18"))
+    a.sync()
+    b.sync()
+    b.log.store.update(find(b, "Shared").id, title="from B")
+    time.sleep(0.01)
+    a.log.store.update(activity_id, title="from A")
+    b.sync()
+    a.sync()
+    b.sync()
+    assert titles(a) == titles(b) == [("from A", "open")]
+
+def test_edit_after_delete_brings_the_activity_back(server):
+    a, b = replica(server), replica(server)
+    activity_id = a.log.store.add(Activity("task", "Contested", "2026-10-18"))
+    a.sync()
+    b.sync()
+    a.log.store.delete(activity_id)
+    time.sleep(0.01)
+    b.log.store.update(find(b, "Contested").id, title="Kept")
+    a.sync()
+    b.sync()
+    a.sync()
+    assert titles(a) == titles(b) == [("Kept", "open")]
+
+def test_delete_after_edit_removes_it_everywhere(server):
+    a, b = replica(server), replica(server)
+    activity_id = a.log.store.add(Activity("task", "Contested", "2026-10-18"))
+    a.sync()
+    b.sync()
+    b.log.store.update(find(b, "Contested").id, title="Edited")
+    time.sleep(0.01)
+    a.log.store.delete(activity_id)
+    b.sync()
+    a.sync()
+    b.sync()
+    assert titles(a) == titles(b) == []
+
+def test_compaction_folds_the_log_and_still_syncs(server):
+    a, b = replica(server), replica(server)
+    kept = a.log.store.add(Activity("task", "Kept", "2026-10-18"))
+    dropped = a.log.store.add(Activity("task", "Dropped", "2026-10-18"))
+    for i in range(5):
+        a.log.store.update(kept, title=f"Kept {i}")
+    a.log.store.delete(dropped)
+    assert a.log.pending() == 8
+    assert a.log.compact() == 7  # One add remains; the add+delete pair cancels out
+    assert a.log.pending() == 1
+    a.sync()
+    b.sync()
+    assert titles(b) == [("Kept 4", "open")]
+
+def test_unavailable_server_is_retried(server):
+    a, b = replica(server), replica(server)
+    a.log.store.add(Activity("task", "Offline", "2026-10-18"))
+    server.RequestHandlerClass.fail_rate = 1.0
+    with pytest.raises(HttpError) as error:
+        a.sync()
+    assert error.value.status == 503
+    assert a.log.pending() == 1  # Nothing acknowledged
+
+    # The worker thread backs off and keeps trying until the server answers again
+    a.start()
+    try:
+        wait_for(lambda: a.failures >= 2)
+        server.RequestHandlerClass.fail_rate = 0.0
+        wait_for(lambda: a.log.pending() == 0 and a.failures == 0)
+    finally:
+        a.stop()
+    b.sync()
+    assert titles(b) == [("Offline", "open")]